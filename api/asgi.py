@@ -0,0 +1,31 @@
+from a2wsgi import WSGIMiddleware  # type: ignore
+from lib.SQLServerConnection import pool_options
+from main import create_app
+import os
+
+"""
+    Aplicação ASGI para o modo de produção.
+
+    As rotas continuam sendo as do Flask; cada requisição roda em um pool de
+    threads limitado, do mesmo tamanho do pool de conexões (pool_size +
+    max_overflow), então o event loop nunca bloqueia em I/O do banco e não há
+    mais requisições simultâneas do que conexões disponíveis.
+
+    O a2wsgi entrega o corpo da requisição ao Flask em stream (o import não
+    carrega o arquivo inteiro na memória) e a fila de envio da resposta é
+    limitada (SERVER_SEND_QUEUE blocos): com um cliente lento, o gerador dos
+    streams (stream=1, /query, export) espera em vez de acumular blocos.
+    """
+
+
+def thread_count():
+    options = pool_options()
+    default = options["pool_size"] + options["max_overflow"]
+    return max(1, int(os.getenv("SERVER_THREADS", default)))
+
+
+app = WSGIMiddleware(
+    create_app(),
+    workers=thread_count(),
+    send_queue_size=int(os.getenv("SERVER_SEND_QUEUE", "10")),
+)
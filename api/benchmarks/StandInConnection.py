@@ -0,0 +1,357 @@
+from sqlalchemy import create_engine  # type: ignore
+from lib.EngineRegistry import EngineRegistry
+from lib.PoolMetrics import pool_metrics
+from lib.SQLServerConnection import SQLServerConnection, pool_options
+from collections import deque
+from decimal import Decimal
+import datetime
+import random
+import re
+import time
+
+# Tipos usados nas colunas geradas, em ordem (a primeira coluna é sempre Id int)
+COLUMN_TYPES = ("varchar", "int", "decimal", "datetime", "bit", "nvarchar", "float")
+TEXT_LENGTH = 20
+# Colunas da consulta de índices (controllers/indexes.py)
+INDEX_COLUMNS = [
+    "index_id",
+    "name",
+    "type_desc",
+    "is_primary_key",
+    "is_unique",
+    "is_unique_constraint",
+    "has_filter",
+    "filter_definition",
+    "column_name",
+    "key_ordinal",
+    "is_included_column",
+    "is_descending_key",
+    "user_seeks",
+    "user_scans",
+    "user_lookups",
+    "user_updates",
+    "used_kb",
+]
+# Consultas que o SQLAlchemy faz ao abrir a conexão e no pre-ping
+SESSION_QUERIES = (
+    ("@@version", "Microsoft SQL Server 2022 (RTM) - 16.0.1000.6 (X64) StandIn"),
+    ("schema_name()", "dbo"),
+    ("sys.system_views", "dm_exec_sessions"),
+    ("transaction_isolation_level", "READ COMMITTED"),
+    ("nvarchar(max)", "test max support"),
+    ("fn_listextendedproperty", 1),
+)
+
+TABLE_NAME = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+QUOTED_TABLE = re.compile(r"TABLE_NAME\s*=\s*'(\w+)'", re.IGNORECASE)
+ROW_ID = re.compile(r"\bId\s*=\s*'?(\d+)'?")
+
+
+class StandInTable:
+    """
+    Tabela gerada em memória com rows registros e width colunas.
+
+    Os valores são determinísticos (seed), então duas execuções do benchmark
+    trabalham com os mesmos dados.
+    """
+
+    def __init__(self, name, rows, width, seed=42):
+        self.name = name
+        self.columns = [{"COLUMN_NAME": "Id", "DATA_TYPE": "int"}]
+        for i in range(1, max(width, 1)):
+            data_type = COLUMN_TYPES[(i - 1) % len(COLUMN_TYPES)]
+            self.columns.append({"COLUMN_NAME": f"Col{i}", "DATA_TYPE": data_type})
+        self.names = [column["COLUMN_NAME"] for column in self.columns]
+
+        generator = random.Random(seed)
+        start = datetime.datetime(2024, 1, 1)
+        values = {
+            "varchar": lambda: "".join(
+                generator.choices("abcdefghijklmnopqrstuvwxyz", k=TEXT_LENGTH)
+            ),
+            "nvarchar": lambda: "".join(
+                generator.choices("àéíõúçabcxyz", k=TEXT_LENGTH)
+            ),
+            "int": lambda: generator.randint(0, 1000000),
+            "decimal": lambda: Decimal(generator.randint(0, 10000000)) / 100,
+            "datetime": lambda: start
+            + datetime.timedelta(seconds=generator.randint(0, 10**8)),
+            "bit": lambda: generator.random() < 0.5,
+            "float": lambda: generator.random() * 1000,
+        }
+        makers = [values[column["DATA_TYPE"]] for column in self.columns[1:]]
+        self.rows = [
+            (i,) + tuple(make() for make in makers) for i in range(1, rows + 1)
+        ]
+
+    def struct(self):
+        return [
+            {
+                "name": column["COLUMN_NAME"],
+                "type": column["DATA_TYPE"],
+                "default_value": None,
+                "size": TEXT_LENGTH if "char" in column["DATA_TYPE"] else "",
+                "precision": "",
+                "is_null": "NO" if column["COLUMN_NAME"] == "Id" else "YES",
+                "is_unique": "NO",
+                "is_primary": "YES" if column["COLUMN_NAME"] == "Id" else "NO",
+                "is_identity": column["COLUMN_NAME"] == "Id",
+            }
+            for column in self.columns
+        ]
+
+
+class StandInError(Exception):
+    pass
+
+
+class StandInDriver:
+    """
+    Módulo DBAPI (como o pymssql) que responde às consultas sem rede nem banco.
+
+    Usado com create_engine(module=...), então tudo acima do driver é o código
+    real: pool do SQLAlchemy, SQLServerConnection (track(), SlowQueryLog,
+    use() e EngineRegistry) e os controladores. Responde reconhecendo o padrão
+    do texto (catálogo, COUNT, página, registro por Id); cada execute espera
+    latency_ms para simular a ida ao banco e comandos de escrita só informam
+    as linhas afetadas.
+    """
+
+    __version__ = "2.3.0"
+    apilevel = "2.0"
+    threadsafety = 1
+    paramstyle = "pyformat"
+    Warning = Warning
+    Error = StandInError
+    InterfaceError = DatabaseError = InternalError = OperationalError = StandInError
+    ProgrammingError = IntegrityError = DataError = NotSupportedError = StandInError
+
+    def __init__(self, tables, latency_ms=0.0, data_base="bench"):
+        self.tables = {table.name: table for table in tables}
+        self.latency = latency_ms / 1000
+        self.data_base = data_base
+        # Últimos comandos recebidos (query, params), usados pelos testes
+        self.executed = deque(maxlen=1000)
+
+    def connect(self, *args, **kwargs):
+        return StandInSession(self)
+
+    def roundTrip(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def tableFor(self, query, params):
+        for pattern in (QUOTED_TABLE, TABLE_NAME):
+            for name in pattern.findall(query):
+                if name in self.tables:
+                    return self.tables[name]
+        name = (params or {}).get("table_name") if isinstance(params, dict) else None
+        return self.tables.get(name) or next(iter(self.tables.values()))
+
+    def resultSets(self, query, params=None):
+        """
+        Resultados (colunas, linhas) que o SQL Server retornaria para o lote.
+        """
+        params = params if isinstance(params, dict) else {}
+        table = self.tableFor(query, params)
+
+        if query.strip().lower() == "select 1":
+            return [([""], [(1,)])]
+        for marker, value in SESSION_QUERIES:
+            if marker in query.lower():
+                return [([""], [(value,)])]
+        if "sys.databases" in query:
+            if "create_date" in query:
+                return [(["created", "total", "last_id"], [("2024-01-01", 1, 5)])]
+            return [(["database_id", "name"], [(5, self.data_base)])]
+        if "modify_date" in query:
+            return [(["modified", "total"], [("2024-01-01 00:00:00.000", 1)])]
+        if "reserved_kb" in query:
+            return [
+                (
+                    ["schema_name", "TABLE_NAME", "row_count", "reserved_kb"]
+                    + ["used_kb", "index_count", "last_user_update"],
+                    [
+                        ("dbo", item.name, len(item.rows), 72, 64, 1, None)
+                        for item in self.tables.values()
+                    ],
+                )
+            ]
+        if "dm_db_missing_index_details" in query:
+            return [
+                (["equality_columns", "inequality_columns", "improvement"], []),
+                (["name", "type_desc", "user_seeks", "user_updates"], []),
+            ]
+        if "user_lookups" in query and "sys.index_columns" in query:
+            return [
+                (
+                    INDEX_COLUMNS,
+                    [
+                        (1, f"PK_{table.name}", "CLUSTERED", True, True)
+                        + (False, False, None, "Id", 1, False, False, 0, 0, 0, 0, 64)
+                    ],
+                )
+            ]
+        if "FROM sys.tables" in query:
+            return self.catalogSets()
+        if "INFORMATION_SCHEMA.TABLES" in query:
+            return [(["TABLE_NAME"], [(name,) for name in self.tables])]
+        if "INFORMATION_SCHEMA.COLUMNS AS c" in query:
+            struct = table.struct()
+            return [(list(struct[0]), [tuple(item.values()) for item in struct])]
+        if "INFORMATION_SCHEMA.COLUMNS" in query:
+            return [
+                (
+                    ["COLUMN_NAME", "DATA_TYPE"],
+                    [(c["COLUMN_NAME"], c["DATA_TYPE"]) for c in table.columns],
+                )
+            ]
+        if "PRIMARY KEY" in query:
+            return [(["COLUMN_NAME"], [("Id",)])]
+        if "sys.identity_columns" in query:
+            return [(["name"], [("Id",)])]
+        if not query.lstrip().upper().startswith(("SELECT", "EXEC", "WITH")):
+            return []
+
+        sets = []
+        if "COUNT(*)" in query or "dm_db_partition_stats" in query:
+            sets.append((["Total"], [(len(table.rows),)]))
+        if "SELECT COUNT(*)" in query and query.count("SELECT") == 1:
+            return sets
+
+        rows = table.rows
+        match = ROW_ID.search(query)
+        if match or "id" in params:
+            index = int(match.group(1) if match else params["id"]) - 1
+            rows = rows[index : index + 1] if 0 <= index < len(rows) else []
+        elif "limit" in params:
+            offset = int(params.get("offset") or 0)
+            rows = rows[offset : offset + int(params["limit"])]
+        sets.append((table.names, rows))
+        return sets
+
+    def catalogSets(self):
+        """
+        Tabelas, colunas, índices e chaves estrangeiras como nas views sys.*.
+        """
+        tables, columns, indexes = [], [], []
+        for object_id, table in enumerate(self.tables.values(), start=1):
+            tables.append((object_id, "dbo", table.name))
+            for column_id, item in enumerate(table.struct(), start=1):
+                size = item["size"] or 0
+                columns.append(
+                    (object_id, column_id, item["name"], item["type"], size)
+                    + (0, 0, item["is_null"] == "YES", item["is_identity"], False)
+                    + (None,)
+                )
+            indexes.append(
+                (object_id, 1, f"PK_{table.name}", "CLUSTERED", True, True, False)
+                + (None, "Id", 1, False, False)
+            )
+        return [
+            (["object_id", "schema_name", "name"], tables),
+            (
+                ["object_id", "column_id", "name", "type", "max_length"]
+                + ["precision", "scale", "is_nullable", "is_identity"]
+                + ["is_computed", "default_value"],
+                columns,
+            ),
+            (
+                ["object_id", "index_id", "name", "type_desc", "is_primary_key"]
+                + ["is_unique", "is_unique_constraint", "filter_definition"]
+                + ["column_name", "key_ordinal", "is_included_column"]
+                + ["is_descending_key"],
+                indexes,
+            ),
+            (["object_id", "name", "column_name"], []),
+        ]
+
+
+class StandInSession:
+    """Conexão DBAPI do StandInDriver"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def cursor(self):
+        return StandInCursor(self.driver)
+
+    def autocommit(self, value):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class StandInCursor:
+    """Cursor DBAPI do StandInDriver, com vários resultados por lote"""
+
+    arraysize = 1
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.sets = []
+        self.rows = []
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def execute(self, query, params=None):
+        self.driver.roundTrip()
+        self.driver.executed.append((query, params))
+        self.sets = self.driver.resultSets(query, params)
+        self.rowcount = 0 if self.sets else 1
+        self.nextset()
+
+    def executemany(self, query, seq_of_params):
+        self.driver.roundTrip()
+        self.driver.executed.append((query, seq_of_params))
+        self.sets = []
+        self.rowcount = len(seq_of_params)
+        self.nextset()
+
+    def nextset(self):
+        if not self.sets:
+            self.description, self.rows = None, []
+            return None
+        columns, rows = self.sets.pop(0)
+        self.description = [(name, None) + (None,) * 5 for name in columns]
+        self.rows = list(rows)
+        return True
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        self.sets, self.rows = [], []
+
+
+class StandInConnection(SQLServerConnection):
+    """
+    SQLServerConnection com o StandInDriver no lugar do pymssql.
+
+    Só a execução no driver é simulada: pool, medição das consultas e o
+    pool por banco de use() são os mesmos da conexão real.
+    """
+
+    def __init__(self, tables, latency_ms=0.0, data_base="bench"):
+        self.driver = StandInDriver(tables, latency_ms, data_base)
+        options = dict(pool_options(), module=self.driver)
+        engine = create_engine("mssql+pymssql://bench@standin", **options)
+        pool_metrics.attach(engine)
+        super().__init__(engine, EngineRegistry(engine.url, options))
@@ -0,0 +1,417 @@
+from benchmarks.StandInConnection import TEXT_LENGTH, StandInConnection, StandInTable
+from concurrent.futures import ThreadPoolExecutor
+from lib.CatalogVersion import version_cache
+from lib.MetadataCache import metadata_cache
+from lib.ResponseCache import response_cache
+from main import create_app
+import argparse
+import csv
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import threading
+import time
+
+"""
+    Benchmark das rotas da API contra um driver simulado (StandInConnection).
+
+    Cada cenário (rota) roda com clientes concorrentes (Flask test client) em
+    várias combinações de quantidade de registros e de colunas, e o resultado
+    (vazão e latências p50/p95/p99) é gravado em JSON para comparar versões.
+
+    Uso, dentro de api/:
+        python3 -m benchmarks.run
+        python3 -m benchmarks.run --sizes 1000,100000 --widths 5,50 --concurrency 1,16
+        python3 -m benchmarks.run --compare benchmarks/results/anterior.json
+    """
+
+DATA_BASE = "bench"
+TABLE = "bench_table"
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def record(table, i):
+    """Registro no formato da tabela, usado nos cenários de escrita"""
+    values = {"varchar": "abc", "nvarchar": "ção", "int": i, "decimal": "10.50"}
+    values.update({"datetime": "2024-01-01 10:00:00", "bit": True, "float": 1.5})
+    return {
+        column["COLUMN_NAME"]: values[column["DATA_TYPE"]]
+        for column in table.columns[1:]
+    }
+
+
+def csvRecords(table, start, count):
+    """Arquivo CSV com count registros, usado no cenário de importação"""
+    file = io.StringIO()
+    writer = csv.writer(file)
+    writer.writerow([column["COLUMN_NAME"] for column in table.columns[1:]])
+    for i in range(start, start + count):
+        writer.writerow(record(table, i).values())
+    return file.getvalue().encode()
+
+
+def tableColumns(table):
+    """Colunas no formato de tables/create, usadas no cenário de criação"""
+    return [
+        {
+            "name": item["name"],
+            "type": item["type"],
+            "size": item["size"],
+            "is_null": item["is_null"] == "YES",
+            "is_primary": item["is_primary"] == "YES",
+            "increment": item["is_identity"],
+        }
+        for item in table.struct()
+    ]
+
+
+def scenarios(table, size):
+    """
+    Cenários do benchmark: (nome, método, função i -> (caminho, corpo)).
+    """
+    path = f"/{DATA_BASE}"
+    row = lambda i: i % size + 1
+    # Primeira coluna depois de Id, usada nos cenários de coluna e índice
+    column = table.struct()[1] if len(table.columns) > 1 else table.struct()[0]
+    return [
+        ("databases", "GET", lambda i: ("/databases", None)),
+        ("tables", "GET", lambda i: (f"{path}/tables", None)),
+        ("tables_struct", "GET", lambda i: (f"{path}/tables/struct/{TABLE}", None)),
+        ("list_data", "GET", lambda i: (f"{path}/data/{TABLE}", None)),
+        (
+            "list_data_page",
+            "GET",
+            lambda i: (f"{path}/data/{TABLE}?limit=25&offset={row(i) - 1}", None),
+        ),
+        (
+            "list_data_filter",
+            "GET",
+            lambda i: (f"{path}/data/{TABLE}?Id__ge={row(i)}&limit=25", None),
+        ),
+        ("get_data", "GET", lambda i: (f"{path}/data/{TABLE}/{row(i)}", None)),
+        ("create_data", "POST", lambda i: (f"{path}/data/{TABLE}", record(table, i))),
+        (
+            "update_data",
+            "POST",
+            lambda i: (f"{path}/data/{TABLE}/{row(i)}", record(table, i)),
+        ),
+        (
+            "delete_data",
+            "POST",
+            lambda i: (f"{path}/data/delete/{TABLE}/{row(i)}", None),
+        ),
+        (
+            "bulk_data",
+            "POST",
+            lambda i: (
+                f"{path}/data/bulk/{TABLE}",
+                [record(table, i + j) for j in range(100)],
+            ),
+        ),
+        (
+            "columns_create",
+            "POST",
+            lambda i: (
+                f"{path}/columns/{TABLE}",
+                {"data": {"name": f"Bench{i}", "type": "int", "is_null": True}},
+            ),
+        ),
+        (
+            "batch_data",
+            "POST",
+            lambda i: (
+                f"{path}/batch",
+                {
+                    "operations": [
+                        {"op": "insert", "table": TABLE, "values": record(table, i)},
+                        {"op": "insert", "table": TABLE, "values": record(table, i)},
+                        {
+                            "op": "update",
+                            "table": TABLE,
+                            "id": row(i),
+                            "values": record(table, i),
+                        },
+                        {"op": "delete", "table": TABLE, "id": row(i)},
+                    ]
+                },
+            ),
+        ),
+        (
+            "bulk_update",
+            "POST",
+            lambda i: (
+                f"{path}/data/bulk-update/{TABLE}",
+                {
+                    "values": record(table, i),
+                    "keys": [row(i + j) for j in range(100)],
+                },
+            ),
+        ),
+        (
+            "bulk_delete",
+            "POST",
+            lambda i: (
+                f"{path}/data/bulk-delete/{TABLE}",
+                {"keys": [row(i + j) for j in range(100)]},
+            ),
+        ),
+        (
+            "import_data",
+            "POST",
+            lambda i: (
+                f"{path}/data/import/{TABLE}?batch_size=50",
+                csvRecords(table, i, 100),
+            ),
+        ),
+        ("clear_data", "POST", lambda i: (f"{path}/data/delete/{TABLE}", None)),
+        (
+            "columns_alter",
+            "POST",
+            lambda i: (
+                f"{path}/columns/{TABLE}/{column['name']}",
+                {"data": dict(column, size=TEXT_LENGTH + 10), "field": column},
+            ),
+        ),
+        (
+            "columns_delete",
+            "POST",
+            lambda i: (f"{path}/columns/delete/{TABLE}/{column['name']}", None),
+        ),
+        (
+            "tables_create",
+            "POST",
+            lambda i: (f"{path}/tables/create/Bench{i}", tableColumns(table)),
+        ),
+        ("tables_delete", "POST", lambda i: (f"{path}/tables/delete/Bench{i}", None)),
+        ("tables_stats", "GET", lambda i: (f"{path}/tables/stats", None)),
+        ("indexes", "GET", lambda i: (f"{path}/indexes/{TABLE}", None)),
+        (
+            "indexes_create",
+            "POST",
+            lambda i: (
+                f"{path}/indexes/{TABLE}",
+                {"name": f"IX_Bench{i}", "columns": [column["name"]]},
+            ),
+        ),
+        (
+            "indexes_delete",
+            "POST",
+            lambda i: (f"{path}/indexes/delete/{TABLE}/IX_Bench{i}", None),
+        ),
+        ("indexes_advisor", "GET", lambda i: (f"{path}/indexes/advisor/{TABLE}", None)),
+        ("schema", "GET", lambda i: (f"{path}/schema", None)),
+    ]
+
+
+def percentile(values, p):
+    """Percentil pelo método nearest-rank (values já ordenado)"""
+    if not values:
+        return None
+    index = max(0, min(len(values) - 1, int(round(p / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def send(test_client, method, path, body):
+    if method == "GET":
+        return test_client.get(path)
+    if isinstance(body, bytes):
+        return test_client.post(path, data=body, content_type="text/csv")
+    return test_client.post(path, json=body)
+
+
+def runScenario(app, method, build, requests, concurrency):
+    """
+    Executa requests chamadas divididas entre concurrency clientes.
+
+    Returns:
+        Dicionário com vazão, latências (ms) e quantidade de erros
+    """
+    counter = iter(range(requests))
+    lock = threading.Lock()
+    latencies = []
+    errors = []
+
+    def client():
+        test_client = app.test_client()
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            path, body = build(i)
+            started = time.perf_counter()
+            response = send(test_client, method, path, body)
+            data = response.get_data()
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed * 1000)
+                if response.status_code >= 400 or data.startswith(b'{"error"'):
+                    errors.append(data[:200].decode(errors="replace"))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(client) for _ in range(concurrency)]:
+            future.result()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "throughput_rps": round(requests / wall, 1) if wall else None,
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+def gitRevision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path):
+    """Mostra a variação de vazão e p95 em relação a um resultado anterior"""
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = json.load(file)
+    key = lambda item: (
+        item["scenario"],
+        item["rows"],
+        item["columns"],
+        item["concurrency"],
+    )
+    previous = {key(item): item for item in baseline["results"]}
+    print(f"\nComparação com {baseline_path} ({baseline['meta'].get('revision')}):")
+    for item in results:
+        old = previous.get(key(item))
+        if old is None or not old["throughput_rps"]:
+            continue
+        throughput = (item["throughput_rps"] / old["throughput_rps"] - 1) * 100
+        p95 = (item["p95_ms"] / old["p95_ms"] - 1) * 100 if old["p95_ms"] else 0
+        print(
+            f"{item['scenario']:<18} rows={item['rows']:<7} cols={item['columns']:<4} "
+            f"c={item['concurrency']:<3} vazão {throughput:+7.1f}%  p95 {p95:+7.1f}%"
+        )
+
+
+def parseList(value):
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das rotas da API")
+    parser.add_argument("--sizes", default="100,10000", help="registros da tabela")
+    parser.add_argument("--widths", default="5,20", help="colunas da tabela")
+    parser.add_argument("--concurrency", default="1,8", help="clientes simultâneos")
+    parser.add_argument(
+        "--requests", type=int, default=200, help="chamadas por cenário"
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="latência simulada por ida ao banco",
+    )
+    parser.add_argument(
+        "--scenarios", default="", help="cenários separados por vírgula (padrão todos)"
+    )
+    parser.add_argument(
+        "--response-cache",
+        choices=("on", "off"),
+        default="off",
+        help="usa o cache de respostas GET (off mede o trabalho completo)",
+    )
+    parser.add_argument("--output", help="arquivo JSON de saída")
+    parser.add_argument("--compare", help="JSON de uma execução anterior")
+    args = parser.parse_args()
+
+    if args.response_cache == "off":
+        response_cache.max_entry_bytes = 0
+        version_cache.ttl = 0
+    selected = [name for name in args.scenarios.split(",") if name]
+
+    results = []
+    covered = set()
+    for size in parseList(args.sizes):
+        for width in parseList(args.widths):
+            table = StandInTable(TABLE, size, width)
+            # A tabela muda de colunas a cada combinação
+            metadata_cache.clear()
+            db = StandInConnection([table], args.latency_ms, DATA_BASE)
+            app = create_app(db)
+            for name, method, build in scenarios(table, size):
+                if selected and name not in selected:
+                    continue
+                for concurrency in parseList(args.concurrency):
+                    response_cache.clear()
+                    send(app.test_client(), method, *build(0))  # aquecimento
+                    result = runScenario(app, method, build, args.requests, concurrency)
+                    rule, _ = app.url_map.bind("localhost").match(
+                        build(0)[0].split("?")[0], method, return_rule=True
+                    )
+                    covered.add((rule.rule, method))
+                    result = {
+                        "scenario": name,
+                        "method": method,
+                        "rows": size,
+                        "columns": width,
+                        "concurrency": concurrency,
+                        **result,
+                    }
+                    results.append(result)
+                    print(
+                        f"{name:<18} rows={size:<7} cols={width:<4} c={concurrency:<3} "
+                        f"{result['throughput_rps']:>9} req/s  p50 {result['p50_ms']:>8} ms  "
+                        f"p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  "
+                        f"erros {result['errors']}"
+                    )
+
+    registered = {
+        (rule.rule, method)
+        for rule in app.url_map.iter_rules()
+        if rule.endpoint != "static"
+        for method in rule.methods - {"HEAD", "OPTIONS"}
+    }
+    missing = sorted(registered - covered)
+    if missing:
+        print(f"\nRotas sem cenário ({len(missing)}):")
+        for rule, method in missing:
+            print(f"  {method:<5} {rule}")
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    document = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "revision": gitRevision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+        "uncovered_routes": [f"{method} {rule}" for rule, method in missing],
+    }
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2, ensure_ascii=False)
+    print(f"\nResultados gravados em {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
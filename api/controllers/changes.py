@@ -0,0 +1,194 @@
+from lib.JsonCustomEncoder import JsonCustomEncoder
+from lib.SQLServerConnection import SQLServerConnection
+from flask import Response, request  # type: ignore
+
+"""
+    Controlador para gerenciar rotas de alterações incrementais (Change Tracking).
+
+    Esta classe é responsável por registrar e manipular as rotas da aplicação Flask
+    que habilitam o Change Tracking e retornam apenas os registros alterados.
+    """
+
+
+class ChangesController:
+
+    def __init__(self, app, db=None, data=None):
+        """
+        Inicializa o controlador com a aplicação Flask e estabelece conexão com o banco.
+
+        Args:
+            app: Instância da aplicação Flask
+            db: Conexão compartilhada (SQLServerConnection); criada se omitida
+            data: DataController usado para metadados e projeção das colunas
+        """
+        self.app = app
+        self.db = db or SQLServerConnection()
+        self.data = data
+
+    def register_routes(self):
+        """
+        Registra todas as rotas de Change Tracking na aplicação Flask.
+
+        Esta função define os endpoints da API que permitem:
+        1. Habilitar o Change Tracking em um banco de dados
+        2. Habilitar o Change Tracking em uma tabela
+        3. Desabilitar o Change Tracking em uma tabela
+        4. Buscar as alterações de uma tabela desde uma versão
+        """
+
+        @self.app.route("/<data_base>/changes/enable", methods=["POST"])
+        def changes_enable_database(data_base):
+            """
+            Endpoint para habilitar o Change Tracking no banco de dados.
+
+            O corpo (opcional) pode conter retention_days (padrão 2) e
+            auto_cleanup (padrão true).
+
+            Returns:
+                JSON com data = {} ou mensagem de erro em caso de falha
+            """
+            body = request.get_json(silent=True) or {}
+            try:
+                retention = int(body.get("retention_days") or 2)
+            except ValueError:
+                return {"error": "❌ retention_days deve ser um número inteiro."}
+            auto_cleanup = "OFF" if body.get("auto_cleanup") is False else "ON"
+
+            query = f"""
+                ALTER DATABASE {data_base} SET CHANGE_TRACKING = ON
+                (CHANGE_RETENTION = {max(retention, 1)} DAYS, AUTO_CLEANUP = {auto_cleanup})
+                """
+            success, error = self.db.execute_query(query, autocommit=True)
+            if not success:
+                print(error)
+                return {"error": error}
+
+            return {"data": {}}
+
+        @self.app.route("/<data_base>/changes/enable/<table_name>", methods=["POST"])
+        def changes_enable_table(data_base, table_name):
+            """
+            Endpoint para habilitar o Change Tracking em uma tabela.
+
+            A tabela precisa ter chave primária e o banco precisa estar com o
+            Change Tracking habilitado.
+
+            Args:
+                table_name (str): Nome da tabela
+
+            Returns:
+                JSON com data = {} ou mensagem de erro em caso de falha
+            """
+            query = f"ALTER TABLE {table_name} ENABLE CHANGE_TRACKING"
+            success, error = self.db.use(data_base).execute_query(query)
+            if not success:
+                print(error)
+                return {"error": error}
+
+            return {"data": {}}
+
+        @self.app.route("/<data_base>/changes/disable/<table_name>", methods=["POST"])
+        def changes_disable_table(data_base, table_name):
+            """
+            Endpoint para desabilitar o Change Tracking em uma tabela.
+
+            Args:
+                table_name (str): Nome da tabela
+
+            Returns:
+                JSON com data = {} ou mensagem de erro em caso de falha
+            """
+            query = f"ALTER TABLE {table_name} DISABLE CHANGE_TRACKING"
+            success, error = self.db.use(data_base).execute_query(query)
+            if not success:
+                print(error)
+                return {"error": error}
+
+            return {"data": {}}
+
+        @self.app.route("/<data_base>/changes/<table_name>")
+        def changes(data_base, table_name):
+            """
+            Endpoint para buscar as alterações de uma tabela desde uma versão.
+
+            Sem o parâmetro since, retorna só a versão atual, que o cliente deve
+            guardar depois de carregar a tabela inteira. Com since, retorna as
+            chaves inseridas, atualizadas e excluídas (com os valores atuais dos
+            registros) e a nova versão para a próxima chamada. Se since for mais
+            antiga que a retenção, retorna reload = true e a tabela deve ser
+            carregada de novo.
+
+            Args:
+                table_name (str): Nome da tabela
+
+            Returns:
+                JSON com version, inserted, updated e deleted ou mensagem de erro
+            """
+            since = request.args.get("since")
+            params = {"table_name": table_name}
+            query = """
+                SELECT CHANGE_TRACKING_CURRENT_VERSION() AS version,
+                    CHANGE_TRACKING_MIN_VALID_VERSION(OBJECT_ID(:table_name)) AS min_version;
+                """
+
+            key = None
+            columns = []
+            if since not in (None, ""):
+                try:
+                    params["since"] = int(since)
+                except ValueError:
+                    return {"error": "❌ since deve ser um número inteiro."}
+
+                columns = self.data.getColumns(data_base, table_name)
+                cols = [{"name": column["COLUMN_NAME"]} for column in columns]
+                key = self.data.getPrimaryKey(data_base, table_name, cols)
+                if key is None:
+                    return {"error": "❌ Change Tracking exige chave primária."}
+                fields = self.data.getFields(data_base, table_name, columns, "t")
+                query += f"""
+                    SELECT ct.{key} AS __key, ct.SYS_CHANGE_OPERATION AS __operation,
+                        {', '.join(fields)}
+                    FROM CHANGETABLE(CHANGES {table_name}, :since) AS ct
+                    LEFT JOIN {table_name} AS t ON t.{key} = ct.{key}
+                    ORDER BY ct.SYS_CHANGE_VERSION
+                    """
+
+            success, sets = self.db.use(data_base).fetch_sets(query, params)
+            if not success:
+                print(sets)
+                return {"error": sets}
+
+            version, min_version = sets[0][1][0]
+            if version is None or min_version is None:
+                return {
+                    "error": f"❌ Change Tracking não está habilitado na tabela {table_name}."
+                }
+            if key is None:
+                return {"data": {"version": version}}
+            if params["since"] < min_version:
+                return {"data": {"version": version, "reload": True}}
+
+            names, rows = sets[1]
+            serializer = JsonCustomEncoder.serializer(names[2:], columns)
+            inserted = []
+            updated = []
+            deleted = []
+            for row in rows:
+                if row[1] == "D":
+                    deleted.append(row[0])
+                elif row[1] == "I":
+                    inserted.append(row[2:])
+                else:
+                    updated.append(row[2:])
+
+            changes = JsonCustomEncoder.encode(
+                {"version": version, "reload": False, "deleted": deleted},
+                {
+                    "inserted": serializer.rows(inserted),
+                    "updated": serializer.rows(updated),
+                },
+            )
+            return Response(
+                JsonCustomEncoder.encode({}, {"data": changes}),
+                mimetype="application/json",
+            )
@@ -1,4 +1,5 @@
 from lib.JsonCustomEncoder import JsonCustomEncoder
+from lib.MetadataCache import metadata_cache
 from lib.SQLServerConnection import SQLServerConnection
 from flask import request  # type: ignore
 
@@ -12,15 +13,16 @@ que fornecem informações sobre as colunas do banco de dados.
 
 class ColumnsController:
 
-    def __init__(self, app):
+    def __init__(self, app, db=None):
         """
         Inicializa o controlador com a aplicação Flask e estabelece conexão com o banco.
 
         Args:
             app: Instância da aplicação Flask
+            db: Conexão compartilhada (SQLServerConnection); criada se omitida
         """
         self.app = app
-        self.db = SQLServerConnection()
+        self.db = db or SQLServerConnection()
 
     def register_routes(self):
         """
@@ -43,7 +45,7 @@ class ColumnsController:
                 JSON com data = {} ou mensagem de erro em caso de falha
             """
 
-            query = f"USE {data_base}; ALTER TABLE {table_name}"
+            query = f"ALTER TABLE {table_name}"
             data = request.json.get("data")
             field = f"{data.get('name')} {data.get('type')}"
             if data.get("size"):
@@ -57,7 +59,8 @@ class ColumnsController:
 
             query += f" ADD {field}"
 
-            success, error = self.db.execute_query(query)
+            success, error = self.db.use(data_base).execute_query(query)
+            metadata_cache.invalidate(data_base, table_name)
             if not success:
                 print(error)
                 return {"error": error}
@@ -78,10 +81,11 @@ class ColumnsController:
                 JSON com data = {} ou mensagem de erro em caso de falha
             """
 
-            query = f"USE {data_base}; ALTER TABLE {table_name}"
+            query = f"ALTER TABLE {table_name}"
             query += f" DROP COLUMN {column_name}"
 
-            success, error = self.db.execute_query(query)
+            success, error = self.db.use(data_base).execute_query(query)
+            metadata_cache.invalidate(data_base, table_name)
             if not success:
                 print(error)
                 return {"error": error}
@@ -106,21 +110,25 @@ class ColumnsController:
             data = request.json.get("data")
             field = request.json.get("field")
             if data.get("name") == field.get("name"):
-                return self.alterColumnSameName(
+                result = self.alterColumnSameName(
                     data_base, table_name, column_name, field, data
                 )
             else:
                 result = self.alterColumnNewName(data_base, table_name, field, data)
                 print(result)
                 if result == True:
-                    return self.alterColumnSameName(
+                    result = self.alterColumnSameName(
                         data_base, table_name, data.get("name"), field, data
                     )
                 else:
-                    return {"error": "Erro ao alterar coluna com novo nome"}
+                    result = {"error": "Erro ao alterar coluna com novo nome"}
+
+            # A alteração pode falhar no meio, então o cache é sempre descartado
+            metadata_cache.invalidate(data_base, table_name)
+            return result
 
     def alterColumnSameName(self, data_base, table_name, column_name, field, data):
-        query = f"USE {data_base}; ALTER TABLE {table_name}"
+        query = f"ALTER TABLE {table_name}"
         field_query = f"{data.get('name')} {data.get('type')}"
         if data.get("size"):
             field_query += f"({data.get('size')})"
@@ -131,7 +139,7 @@ class ColumnsController:
 
         query += f" ALTER COLUMN {field_query}"
 
-        success, error = self.db.execute_query(query)
+        success, error = self.db.use(data_base).execute_query(query)
         if not success:
             print(error)
             return {"error": error}
@@ -141,8 +149,8 @@ class ColumnsController:
                 data_base, table_name, column_name
             )
             if default_constraint != None:
-                query = f"USE {data_base}; ALTER TABLE {table_name} DROP CONSTRAINT {default_constraint};"
-                success, error = self.db.execute_query(query)
+                query = f"ALTER TABLE {table_name} DROP CONSTRAINT {default_constraint};"
+                success, error = self.db.use(data_base).execute_query(query)
                 if not success:
                     print(error)
                     return {"error": error}
@@ -150,12 +158,11 @@ class ColumnsController:
                 if default_constraint == None:
                     default_constraint = f"DF__{table_name}__{column_name}"
                 query = f"""
-                    USE {data_base}; 
                     ALTER TABLE {table_name}
                     ADD CONSTRAINT {default_constraint} 
                     DEFAULT '{data.get("default_value")}' FOR {column_name};
                 """
-                success, error = self.db.execute_query(query)
+                success, error = self.db.use(data_base).execute_query(query)
                 if not success:
                     print(error)
                     return {"error": error}
@@ -168,7 +175,7 @@ class ColumnsController:
                 query = (
                     f"ALTER TABLE {table_name} DROP CONSTRAINT {default_constraint};"
                 )
-                success, error = self.db.execute_query(query)
+                success, error = self.db.use(data_base).execute_query(query)
                 if not success:
                     print(error)
                     return {"error": error}
@@ -176,12 +183,11 @@ class ColumnsController:
                 if default_constraint == None:
                     default_constraint = f"UQ__{table_name}__{column_name}"
                 query = f"""
-                    USE {data_base}; 
                     ALTER TABLE {table_name}
                     ADD CONSTRAINT {default_constraint} 
                     UNIQUE ({column_name});
                 """
-                success, error = self.db.execute_query(query)
+                success, error = self.db.use(data_base).execute_query(query)
                 if not success:
                     print(error)
                     return {"error": error}
@@ -194,7 +200,7 @@ class ColumnsController:
                 query = (
                     f"ALTER TABLE {table_name} DROP CONSTRAINT {default_constraint};"
                 )
-                success, error = self.db.execute_query(query)
+                success, error = self.db.use(data_base).execute_query(query)
                 if not success:
                     print(error)
                     return {"error": error}
@@ -202,13 +208,12 @@ class ColumnsController:
                 if default_constraint == None:
                     default_constraint = f"PK__{table_name}__{column_name}"
                 query = f"""
-                    USE {data_base}; 
                     ALTER TABLE {table_name}
                     ADD CONSTRAINT {default_constraint} 
                     PRIMARY KEY ({column_name})
                 """
             
-                success, error = self.db.execute_query(query)
+                success, error = self.db.use(data_base).execute_query(query)
                 if not success:
                     print(error)
                     return {"error": error}
@@ -216,8 +221,8 @@ class ColumnsController:
         return {"data": {}}
 
     def alterColumnNewName(self, data_base, table_name, field, data):
-        query = f"USE {data_base};  EXEC sp_rename '{table_name}.{field.get('name')}', '{data.get('name')}', 'COLUMN';"
-        success, error = self.db.execute_query(query)
+        query = f"EXEC sp_rename '{table_name}.{field.get('name')}', '{data.get('name')}', 'COLUMN';"
+        success, error = self.db.use(data_base).execute_query(query)
         if not success:
             print(error)
             return False
@@ -226,7 +231,6 @@ class ColumnsController:
 
     def getDefaultConstraint(self, data_base, table_name, column_name):
         query = f"""
-            USE {data_base}; 
             SELECT
                 dc.name AS ConstraintName
             FROM
@@ -237,12 +241,11 @@ class ColumnsController:
                 sys.columns AS c ON dc.parent_object_id = c.object_id AND dc.parent_column_id = c.column_id
             WHERE OBJECT_NAME(t.object_id) = '{table_name}' AND c.name = '{column_name}'
             """
-        success, data = self.db.get_data(query)
+        success, data = self.db.use(data_base).fetch_rows(query)
         if not success:
             print(f"❌ Erro ao buscar ConstraintName na tabela {table_name}.")
             return None
 
-        data = data.to_dict(orient="records")
         data = JsonCustomEncoder.toStr(data)
         default_constraint = None
         if data and data[0] and data[0]["ConstraintName"]:
@@ -251,7 +254,6 @@ class ColumnsController:
 
     def getUniqueConstraint(self, data_base, table_name, column_name):
         query = f"""
-            USE {data_base}; 
             SELECT tc1.CONSTRAINT_NAME as ConstraintName  FROM 
             INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu1,
             INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc1
@@ -260,12 +262,11 @@ class ColumnsController:
             AND tc1.TABLE_NAME = '{table_name}'
             AND kcu1.COLUMN_NAME = '{column_name}'
         """
-        success, data = self.db.get_data(query)
+        success, data = self.db.use(data_base).fetch_rows(query)
         if not success:
             print(f"❌ Erro ao buscar ConstraintName na tabela {table_name}.")
             return None
 
-        data = data.to_dict(orient="records")
         data = JsonCustomEncoder.toStr(data)
         default_constraint = None
         if data and data[0] and data[0]["ConstraintName"]:
@@ -274,7 +275,6 @@ class ColumnsController:
 
     def getPrimaryConstraint(self, data_base, table_name, column_name):
         query = f"""
-            USE {data_base}; 
             SELECT tc1.CONSTRAINT_NAME as ConstraintName  FROM 
             INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu1,
             INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc1
@@ -283,12 +283,11 @@ class ColumnsController:
             AND tc1.TABLE_NAME = '{table_name}'
             AND kcu1.COLUMN_NAME = '{column_name}'
         """
-        success, data = self.db.get_data(query)
+        success, data = self.db.use(data_base).fetch_rows(query)
         if not success:
             print(f"❌ Erro ao buscar ConstraintName na tabela {table_name}.")
             return None
 
-        data = data.to_dict(orient="records")
         data = JsonCustomEncoder.toStr(data)
         default_constraint = None
         if data and data[0] and data[0]["ConstraintName"]:
@@ -1,6 +1,53 @@
 from lib.JsonCustomEncoder import JsonCustomEncoder
-from lib.SQLServerConnection import SQLServerConnection
-from flask import request  # type: ignore
+from lib.MetadataCache import metadata_cache
+from lib.QueryPlan import QueryPlan
+from lib.CatalogVersion import CatalogVersion
+from lib.ResponseCache import response_cache
+from lib.SQLServerConnection import SQLServerConnection, prepared
+from lib.ValueParser import ValueParser
+from flask import Response, make_response, request, stream_with_context  # type: ignore
+import base64
+import csv
+import datetime
+import io
+import json
+import time
+
+# Parâmetros de paginação aceitos por list_data (não são tratados como filtro)
+PAGINATION_ARGS = ("limit", "offset", "sort", "cursor")
+# Opções de list_data que também não são filtros
+OPTION_ARGS = ("stream", "chunk_size", "approx_total", "explain", "search", "all")
+DEFAULT_STREAM_CHUNK = 1000
+DEFAULT_PAGE_LIMIT = 25
+MAX_PAGE_LIMIT = 1000
+DEFAULT_BATCH_SIZE = 1000
+# O SQL Server aceita até 2100 parâmetros por comando e 1000 linhas por VALUES
+MAX_STATEMENT_PARAMS = 2000
+MAX_VALUES_ROWS = 1000
+# Quantidade máxima de linhas rejeitadas detalhadas na resposta do import
+MAX_REJECTED_REPORT = 1000
+# Operadores de filtro de list_data (coluna__operador=valor)
+COMPARISON_OPERATORS = {
+    "eq": "=",
+    "ne": "<>",
+    "lt": "<",
+    "le": "<=",
+    "gt": ">",
+    "ge": ">=",
+}
+FILTER_OPERATORS = tuple(COMPARISON_OPERATORS) + ("in", "like", "null")
+TEXT_TYPES = ("char", "varchar", "text", "nchar", "nvarchar", "ntext")
+DATE_TYPES = ("date", "datetime", "datetime2", "smalldatetime", "datetimeoffset")
+BINARY_TYPES = ("binary", "varbinary", "timestamp", "rowversion")
+# Tipos que não podem ser comparados em um WHERE
+UNFILTERABLE_TYPES = (
+    "geometry",
+    "geography",
+    "xml",
+    "image",
+    "hierarchyid",
+    "sql_variant",
+)
 
 """
     Controlador para gerenciar rotas relacionadas aos dados do banco de dados.
@@ -12,15 +59,17 @@ from flask import request  # type: ignore
 
 class DataController:
 
-    def __init__(self, app):
+    def __init__(self, app, db=None):
         """
         Inicializa o controlador com a aplicação Flask e estabelece conexão com o banco.
 
         Args:
             app: Instância da aplicação Flask
+            db: Conexão compartilhada (SQLServerConnection); criada se omitida
         """
         self.app = app
-        self.db = SQLServerConnection()
+        self.db = db or SQLServerConnection()
+        self.versions = CatalogVersion(self.db)
 
     def register_routes(self):
         """
@@ -30,15 +79,52 @@ class DataController:
         1. Visualizar os primeiros registros de uma tabela específica
         2. Busca o registro por Id de uma tabela específica
         3. Criar um registro em uma tabela específica
-        4. Atualizar um registro em uma tabela específica
-        5. Excluir um registro em uma tabela específica
-        6. Excluir todos os registros em uma tabela específica
+        4. Inserir ou atualizar (upsert) vários registros em lotes
+        5. Importar um arquivo CSV ou NDJSON em lotes
+        6. Atualizar um registro em uma tabela específica
+        7. Atualizar vários registros por lista de chaves ou filtro
+        8. Excluir um registro em uma tabela específica
+        9. Excluir vários registros por lista de chaves ou filtro
+        10. Excluir todos os registros em uma tabela específica
+        11. Gravar várias operações, em tabelas diferentes, em uma única transação
         """
 
         @self.app.route("/<data_base>/data/<table_name>")
+        @response_cache.cached(self.versions.table_data)
         def list_data(data_base, table_name):
             """
-            Endpoint para visualizar os primeiros 25 registros de uma tabela específica.
+            Endpoint para visualizar os registros de uma tabela específica.
+
+            Os demais parâmetros da query string são filtros, no formato
+            coluna=valor (igualdade) ou coluna__operador=valor, com os operadores:
+                eq, ne, lt, le, gt, ge: comparação (ex.: Preco__ge=10)
+                in: lista separada por vírgula (ex.: Status__in=1,2,3)
+                like: começa com o valor (ex.: Nome__like=Jo)
+                null: 1 para IS NULL, 0 para IS NOT NULL
+            Os valores são convertidos para o tipo da coluna e enviados como
+            parâmetros tipados via sp_executesql, então o plano é reaproveitado.
+            O parâmetro search procura o texto (contém) em todas as colunas,
+            combinadas com OR, junto com os demais filtros.
+
+            A listagem é sempre paginada (25 registros quando limit não é
+            informado); a tabela inteira só vem com stream=1 ou all=1. A
+            paginação é controlada pelos parâmetros da query string:
+                limit: quantidade de registros por página (padrão 25, máximo 1000)
+                offset: quantidade de registros a pular (OFFSET ... FETCH)
+                sort: colunas de ordenação separadas por vírgula, "-" para DESC;
+                    a chave primária (ou Id) entra no fim como desempate
+                cursor: ativa a paginação por chave (keyset) sobre a chave primária
+                    ou coluna Id; envie vazio na primeira página e depois o
+                    valor de next_cursor retornado
+                stream: quando 1, devolve NDJSON em blocos (application/x-ndjson),
+                    sem total; a primeira linha traz as colunas
+                chunk_size: tamanho do bloco lido do servidor no modo stream
+                approx_total: quando 1 e sem filtros, o total vem das estatísticas
+                    de partição (sys.dm_db_partition_stats) em vez de COUNT(*)
+                explain: quando 1, executa o mesmo comando com o plano real e
+                    retorna CPU, tempo, leituras lógicas por tabela e os planos
+                    XML no lugar dos registros
+                all: quando 1, retorna todos os registros sem paginação
 
             Args:
                 table_name (str): Nome da tabela a ser consultada
@@ -51,65 +137,161 @@ class DataController:
                 where = []
                 if request.args:
                     params = request.args.to_dict()
-                if params:
-                    for key in params:
-                        where.append(f"{key} = '{params[key]}'")
-
-                query = f"""
-                    USE {data_base};
-                    SELECT COLUMN_NAME, DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS 
-                    WHERE TABLE_NAME = '{table_name}'
-                    ORDER BY ORDINAL_POSITION
-                    """
+                page = {}
+                for key in PAGINATION_ARGS:
+                    if key in params:
+                        page[key] = params.pop(key)
+                options = {}
+                for key in OPTION_ARGS:
+                    if key in params:
+                        options[key] = params.pop(key)
 
-                success, columns = self.db.get_data(query)
+                columns = self.getColumns(data_base, table_name)
                 cols = []
-                for column in columns.to_dict(orient="records"):
+                for column in columns:
                     cols.append(
                         {"name": column["COLUMN_NAME"], "type": column["DATA_TYPE"]}
                     )
 
-                query = f"USE {data_base}; SELECT COUNT(*) as Total FROM {table_name}"
-                if len(where) > 0:
-                    query += " WHERE " + " AND ".join(where)
+                query_params = {}
+                types = {}
+                success, error = self.buildFilters(
+                    params, columns, where, query_params, types
+                )
+                if not success:
+                    return {"error": error}
+                if (options.get("search") or "").strip():
+                    success, error = self.buildSearch(
+                        options["search"].strip(), columns, where, query_params, types
+                    )
+                    if not success:
+                        return {"error": error}
+
+                count_where = list(where)
+                fields = self.getFields(data_base, table_name, columns)
+                query = f"SELECT {', '.join(fields)} FROM {table_name}"
 
-                success, totals = self.db.get_data(query)
-                total = totals.to_dict(orient="records")[0]["Total"]
+                full = self.isTrue(options.get("stream")) or self.isTrue(
+                    options.get("all")
+                )
+                if not page and not full:
+                    page = {"limit": DEFAULT_PAGE_LIMIT}
 
-                fields = self.getFields(data_base, table_name)
-                query = f"USE {data_base}; SELECT {', '.join(fields)} FROM {table_name}"
-                if len(where) > 0:
+                primary_key = None
+                if page:
+                    primary_key = self.getPrimaryKey(data_base, table_name, cols)
+                    success, paging = self.buildPage(
+                        page, cols, primary_key, where, query_params
+                    )
+                    if not success:
+                        return {"error": paging}
+                    types["limit"] = "int"
+                    if "offset" in query_params:
+                        types["offset"] = "int"
+                    if "cursor" in query_params:
+                        key_type = next(
+                            c["type"] for c in cols if c["name"] == primary_key
+                        )
+                        types["cursor"] = self.paramType(key_type)
+                    if len(where) > 0:
+                        query += " WHERE " + " AND ".join(where)
+                    query += paging
+                elif len(where) > 0:
                     query += " WHERE " + " AND ".join(where)
 
-                success, records = self.db.get_data(query)
+                explain = self.isTrue(options.get("explain"))
+                if self.isTrue(options.get("stream")):
+                    try:
+                        chunk_size = int(
+                            options.get("chunk_size") or DEFAULT_STREAM_CHUNK
+                        )
+                    except ValueError:
+                        return {"error": "❌ chunk_size deve ser um número inteiro."}
+                    stream_query = prepared(query, types)
+                    if explain:
+                        return self.explainQuery(data_base, stream_query, query_params)
+                    return self.streamRows(
+                        data_base,
+                        table_name,
+                        stream_query,
+                        query_params,
+                        columns,
+                        max(chunk_size, 1),
+                    )
+
+                approx_total = self.isTrue(options.get("approx_total"))
+                if approx_total and len(count_where) == 0:
+                    # Contagem aproximada pelos metadados, sem ler a tabela
+                    query_count = """
+                        SELECT SUM(row_count) AS Total FROM sys.dm_db_partition_stats
+                        WHERE object_id = OBJECT_ID(:table_name) AND index_id IN (0, 1)
+                        """
+                    query_params["table_name"] = table_name
+                    types["table_name"] = "nvarchar(776)"
+                else:
+                    approx_total = False
+                    query_count = f"SELECT COUNT(*) as Total FROM {table_name}"
+                    if len(count_where) > 0:
+                        query_count += " WHERE " + " AND ".join(count_where)
+
+                # Total e página em um único lote (uma ida ao banco)
+                batch = prepared(f"{query_count}; {query}", types)
+                if explain:
+                    return self.explainQuery(data_base, batch, query_params)
+                success, sets = self.db.use(data_base).fetch_sets(batch, query_params)
 
                 if not success:
                     error = f"❌ Erro ao buscar dados na tabela {table_name}."
                     print(error)
-                    return {"error": query}
+                    print(sets)
+                    # Outro processo pode ter alterado a estrutura da tabela
+                    metadata_cache.invalidate(data_base, table_name)
+                    return {"error": error}
 
-                if records.size == 0:
+                total = sets[0][1][0][0] or 0
+                names, rows = sets[1]
+                if len(rows) == 0:
                     print(f"❌ Nenhum dado encontrado na tabela {table_name}.")
-                    data = []
-                else:
-                    data = records.to_dict(orient="records")
 
-                data = JsonCustomEncoder.toStr(data)
+                next_cursor = None
+                if "cursor" in page and primary_key and len(rows) > 0:
+                    next_cursor = self.encodeCursor(rows[-1][names.index(primary_key)])
 
-                return {
-                    "data": data,
+                result = {
                     "columns": cols,
                     "total": total,
                 }
+                if approx_total:
+                    result["total_approximate"] = True
+                if page:
+                    result["limit"] = query_params.get("limit")
+                    if "cursor" in page:
+                        result["next_cursor"] = next_cursor
+                    else:
+                        result["offset"] = query_params.get("offset")
+
+                serializer = JsonCustomEncoder.serializer(names, columns)
+                return Response(
+                    JsonCustomEncoder.encode(result, {"data": serializer.rows(rows)}),
+                    mimetype="application/json",
+                )
 
             except Exception as e:
                 return {"error": f"Erro: {e}"}
 
         @self.app.route("/<data_base>/data/<table_name>/<id>")
+        @response_cache.cached(
+            lambda data_base, table_name, id: self.versions.table_data(
+                data_base, table_name
+            )
+        )
         def get_data(data_base, table_name, id):
             """
             Endpoint para buscar um registro por Id de uma tabela específica.
 
+            Com explain=1 retorna o plano real do comando no lugar do registro,
+            como em list_data.
+
             Args:
                 table_name (str): Nome da tabela a ser consultada
                 id (int): Id do registro a ser consultado
@@ -118,25 +300,46 @@ class DataController:
                 JSON com o registro da tabela ou mensagem de erro em caso de falha
             """
             try:
-                fields = self.getFields(data_base, table_name)
-                query = f"USE {data_base}; SELECT {', '.join(fields)} FROM {table_name} WHERE Id = '{id}'"
+                columns = self.getColumns(data_base, table_name)
+                id_type = next(
+                    (c["DATA_TYPE"] for c in columns if c["COLUMN_NAME"] == "Id"), None
+                )
+                if id_type is None:
+                    return {"error": f"❌ A tabela {table_name} não tem coluna Id."}
+                try:
+                    params = {"id": ValueParser.parser(id_type)(id)}
+                except (ValueError, TypeError):
+                    return {"error": f"❌ Id inválido: {id}."}
 
-                success, records = self.db.get_data(query)
+                fields = self.getFields(data_base, table_name, columns)
+                query = prepared(
+                    f"SELECT {', '.join(fields)} FROM {table_name} WHERE Id = :id",
+                    {"id": self.paramType(id_type)},
+                )
+                if self.isTrue(request.args.get("explain")):
+                    return self.explainQuery(data_base, query, params)
+
+                success, records = self.db.use(data_base).fetch_rows(
+                    query, params, as_dict=False
+                )
 
                 if not success:
                     error = f"❌ Erro ao buscar dados na tabela {table_name}."
                     print(error)
+                    metadata_cache.invalidate(data_base, table_name)
                     return {"error": error}
 
-                if records.size == 0:
+                names, rows = records
+                if len(rows) == 0:
                     error = f"❌ Dado não encontrado na tabela {table_name}."
                     print(error)
                     return {"error": error}
-                else:
-                    data = records.to_dict(orient="records")
-                    data = JsonCustomEncoder.toStr(data)
 
-                return {"data": data}
+                serializer = JsonCustomEncoder.serializer(names, columns)
+                return Response(
+                    JsonCustomEncoder.encode({}, {"data": serializer.rows(rows)}),
+                    mimetype="application/json",
+                )
 
             except Exception as e:
                 return {"error": f"Erro: {e}"}
@@ -156,15 +359,204 @@ class DataController:
             fields = []
             for key in request.json:
                 fields.append(key)
-            query = f"USE {data_base}; INSERT INTO {table_name} ({','.join(fields)}) values (:{',:'.join(fields)})"
+            query = f"INSERT INTO {table_name} ({','.join(fields)}) values (:{',:'.join(fields)})"
 
-            success, error = self.db.execute_query(query, request.json)
+            success, error = self.db.use(data_base).execute_query(query, request.json)
             if not success:
                 print(error)
                 return {"error": error}
 
             return {"data": {}}
 
+        @self.app.route("/<data_base>/data/bulk/<table_name>", methods=["POST"])
+        def bulk_data(data_base, table_name):
+            """
+            Endpoint para inserir vários registros em uma tabela específica.
+
+            O corpo pode ser uma lista de registros ou um objeto com:
+                records: lista de registros
+                batch_size: registros por transação (padrão 1000)
+                upsert: quando true, usa MERGE pela chave primária (ou Id)
+
+            Cada lote é gravado em uma transação; os registros de um lote são
+            enviados em comandos INSERT/MERGE com várias linhas em VALUES. No
+            upsert, registros com a mesma chave no mesmo lote são reduzidos ao
+            último (o MERGE não aceita alterar a mesma linha duas vezes).
+
+            Args:
+                table_name (str): Nome da tabela
+
+            Returns:
+                JSON com as linhas afetadas (written) e o resultado de cada lote
+                ou mensagem de erro
+            """
+            body = request.json
+            if isinstance(body, list):
+                body = {"records": body}
+            records = body.get("records") or []
+            upsert = bool(body.get("upsert"))
+            try:
+                batch_size = int(body.get("batch_size") or DEFAULT_BATCH_SIZE)
+            except ValueError:
+                return {"error": "❌ batch_size deve ser um número inteiro."}
+            batch_size = max(batch_size, 1)
+
+            columns = self.getColumns(data_base, table_name)
+            names = [column["COLUMN_NAME"] for column in columns]
+            for record in records:
+                invalid = [key for key in record if key not in names]
+                if invalid:
+                    return {"error": f"❌ Colunas inválidas: {', '.join(invalid)}."}
+
+            key = None
+            identity = []
+            if upsert:
+                cols = [{"name": name} for name in names]
+                key = self.getPrimaryKey(data_base, table_name, cols)
+                if key is None:
+                    return {"error": "❌ Upsert exige chave primária ou coluna Id."}
+                if any(key not in record for record in records):
+                    return {"error": f"❌ Todos os registros precisam de {key}."}
+                identity = self.getIdentityColumns(data_base, table_name)
+
+            batches = []
+            for start in range(0, len(records), batch_size):
+                batch = records[start : start + batch_size]
+                size = len(batch)
+                if upsert:
+                    batch = self.lastByKey(batch, key)
+                statements = []
+                for fields, rows in self.groupByShape(batch):
+                    if upsert:
+                        statements += self.mergeStatements(
+                            table_name, fields, rows, key, identity
+                        )
+                    else:
+                        statements += self.insertStatements(table_name, fields, rows)
+                batches.append((start, size, statements))
+
+            results = self.db.use(data_base).execute_batches(
+                statements for _, _, statements in batches
+            )
+
+            written = 0
+            report = []
+            for (start, size, _), (success, result) in zip(batches, results):
+                item = {"start": start, "rows": size, "success": success}
+                if success:
+                    item["affected"] = result
+                    written += result
+                else:
+                    print(result)
+                    item["error"] = result
+                report.append(item)
+
+            return {"data": {"written": written, "batches": report}}
+
+        @self.app.route("/<data_base>/data/import/<table_name>", methods=["POST"])
+        def import_data(data_base, table_name):
+            """
+            Endpoint para importar um arquivo CSV ou NDJSON em uma tabela específica.
+
+            O corpo da requisição é lido em stream, linha a linha, e gravado em
+            transações de batch_size registros, então a memória não depende do
+            tamanho do arquivo. Parâmetros da query string:
+                format: csv (padrão, com cabeçalho) ou ndjson
+                batch_size: registros por transação (padrão 1000)
+                delimiter: separador do CSV (padrão ",")
+
+            Args:
+                table_name (str): Nome da tabela
+
+            Returns:
+                JSON com registros gravados, registros/segundo e linhas rejeitadas
+            """
+            data_format = request.args.get("format", "csv").lower()
+            if data_format not in ("csv", "ndjson"):
+                return {"error": "❌ format deve ser csv ou ndjson."}
+            try:
+                batch_size = int(request.args.get("batch_size") or DEFAULT_BATCH_SIZE)
+            except ValueError:
+                return {"error": "❌ batch_size deve ser um número inteiro."}
+            batch_size = max(batch_size, 1)
+
+            columns = self.getColumns(data_base, table_name)
+            if not columns:
+                return {"error": f"❌ Tabela {table_name} não encontrada."}
+            parsers = ValueParser.parsers(columns)
+
+            stream = io.TextIOWrapper(request.stream, encoding="utf-8-sig", newline="")
+            if data_format == "csv":
+                reader = csv.DictReader(
+                    stream, delimiter=request.args.get("delimiter") or ","
+                )
+                invalid = [key for key in reader.fieldnames or [] if key not in parsers]
+                if invalid:
+                    return {"error": f"❌ Colunas inválidas: {', '.join(invalid)}."}
+                lines = ((reader.line_num, row) for row in reader)
+            else:
+                lines = self.readNdjson(stream)
+
+            report = {
+                "written": 0,
+                "rejected_count": 0,
+                "rejected": [],
+                "failed_batches": [],
+            }
+
+            def reject(line, error):
+                report["rejected_count"] += 1
+                if len(report["rejected"]) < MAX_REJECTED_REPORT:
+                    report["rejected"].append({"line": line, "error": error})
+
+            def flush(batch):
+                statements = []
+                for fields, rows in self.groupByShape([row for _, row in batch]):
+                    statements += self.insertStatements(table_name, fields, rows)
+                [(success, result)] = self.db.use(data_base).execute_batches(
+                    [statements]
+                )
+                if success:
+                    report["written"] += len(batch)
+                else:
+                    print(result)
+                    report["failed_batches"].append(
+                        {
+                            "first_line": batch[0][0],
+                            "last_line": batch[-1][0],
+                            "error": result,
+                        }
+                    )
+
+            started = time.perf_counter()
+            batch = []
+            for line, record in lines:
+                if isinstance(record, Exception):
+                    reject(line, str(record))
+                    continue
+                try:
+                    row = {}
+                    for key, value in record.items():
+                        if key not in parsers:
+                            raise ValueError(f"coluna inválida: {key}")
+                        row[key] = parsers[key](value)
+                except (ValueError, TypeError) as e:
+                    reject(line, str(e))
+                    continue
+                batch.append((line, row))
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+
+            elapsed = time.perf_counter() - started
+            report["elapsed"] = round(elapsed, 3)
+            report["rows_per_second"] = (
+                round(report["written"] / elapsed, 1) if elapsed else 0
+            )
+            return {"data": report}
+
         @self.app.route("/<data_base>/data/<table_name>/<id>", methods=["POST"])
         def update_data(data_base, table_name, id):
             """
@@ -178,20 +570,101 @@ class DataController:
                 JSON com data = {} ou mensagem de erro em caso de falha
             """
 
+            # Só as colunas enviadas no corpo são alteradas
             columns = self.getColumns(data_base, table_name)
+            params = dict(request.json)
+            params.setdefault("Id", id)
             fields = []
-            for column in columns.to_dict(orient="records"):
-                if column["COLUMN_NAME"] != "Id":
+            for column in columns:
+                if column["COLUMN_NAME"] != "Id" and column["COLUMN_NAME"] in params:
                     fields.append(f"{column['COLUMN_NAME']} = :{column['COLUMN_NAME']}")
-            query = f"USE {data_base}; UPDATE {table_name} SET {','.join(fields)} where Id = :Id"
+            if not fields:
+                return {"error": "❌ Nenhuma coluna para atualizar."}
+            query = f"UPDATE {table_name} SET {','.join(fields)} where Id = :Id"
 
-            success, error = self.db.execute_query(query, request.json)
+            success, error = self.db.use(data_base).execute_query(query, params)
             if not success:
                 print(error)
+                metadata_cache.invalidate(data_base, table_name)
                 return {"error": error}
 
             return {"data": {}}
 
+        @self.app.route("/<data_base>/data/bulk-update/<table_name>", methods=["POST"])
+        def bulk_update_data(data_base, table_name):
+            """
+            Endpoint para atualizar vários registros com um único UPDATE.
+
+            O corpo deve conter:
+                values: colunas a alterar e seus novos valores
+                keys: lista de valores da chave primária (ou Id), ou
+                where: filtro {coluna: valor}; lista de valores vira IN
+
+            Args:
+                table_name (str): Nome da tabela
+
+            Returns:
+                JSON com a quantidade de registros alterados ou mensagem de erro
+            """
+            body = request.get_json(silent=True) or {}
+            if not isinstance(body, dict):
+                return {"error": "❌ O corpo deve ser um objeto."}
+            values = body.get("values") or {}
+            if not isinstance(values, dict):
+                return {"error": "❌ values deve ser um objeto."}
+            columns = self.getColumns(data_base, table_name)
+            names = [column["COLUMN_NAME"] for column in columns]
+
+            invalid = [key for key in values if key not in names]
+            if invalid:
+                return {"error": f"❌ Colunas inválidas: {', '.join(invalid)}."}
+            if not values:
+                return {"error": "❌ Nenhuma coluna para atualizar."}
+
+            params = {}
+            sets = []
+            for i, key in enumerate(values):
+                sets.append(f"{key} = :v{i}")
+                params[f"v{i}"] = values[key]
+
+            success, where = self.buildTarget(
+                data_base, table_name, columns, body, params
+            )
+            if not success:
+                return {"error": where}
+
+            query = f"UPDATE {table_name} SET {', '.join(sets)} WHERE {where}"
+            return self.executeSetBased(data_base, query, params)
+
+        @self.app.route("/<data_base>/data/bulk-delete/<table_name>", methods=["POST"])
+        def bulk_delete_data(data_base, table_name):
+            """
+            Endpoint para excluir vários registros com um único DELETE.
+
+            O corpo deve conter keys (lista de valores da chave primária ou Id)
+            ou where (filtro {coluna: valor}; lista de valores vira IN).
+
+            Args:
+                table_name (str): Nome da tabela
+
+            Returns:
+                JSON com a quantidade de registros excluídos ou mensagem de erro
+            """
+            body = request.get_json(silent=True) or {}
+            if not isinstance(body, dict):
+                return {"error": "❌ O corpo deve ser um objeto."}
+            columns = self.getColumns(data_base, table_name)
+            params = {}
+
+            success, where = self.buildTarget(
+                data_base, table_name, columns, body, params
+            )
+            if not success:
+                return {"error": where}
+
+            query = f"DELETE FROM {table_name} WHERE {where}"
+            return self.executeSetBased(data_base, query, params)
+
         @self.app.route("/<data_base>/data/delete/<table_name>/<id>", methods=["POST"])
         def delete_data(data_base, table_name, id):
             """
@@ -207,9 +680,9 @@ class DataController:
 
             fields = []
 
-            query = f"USE {data_base}; DELETE FROM {table_name} where Id = :Id"
+            query = f"DELETE FROM {table_name} where Id = :Id"
 
-            success, error = self.db.execute_query(query, {"Id": id})
+            success, error = self.db.use(data_base).execute_query(query, {"Id": id})
             if not success:
                 print(error)
                 return {"error": error}
@@ -230,38 +703,681 @@ class DataController:
 
             fields = []
 
-            query = f"USE {data_base}; DELETE FROM {table_name}"
+            query = f"DELETE FROM {table_name}"
 
-            success, error = self.db.execute_query(query)
+            success, error = self.db.use(data_base).execute_query(query)
             if not success:
                 print(error)
                 return {"error": error}
 
             return {"data": {}}
 
-    def getColumns(self, data_base, table_name):
-        query = f"""
-            USE {data_base}; 
-            SELECT COLUMN_NAME, DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_NAME = '{table_name}'
-            ORDER BY ORDINAL_POSITION
+        @self.app.route("/<data_base>/batch", methods=["POST"])
+        def batch_data(data_base):
             """
+            Endpoint para gravar várias operações, em tabelas diferentes, de uma vez.
 
-        success, columns = self.db.get_data(query)
-        return columns
+            As operações rodam na ordem enviada, em uma única transação e
+            conexão: ou todas são gravadas ou nenhuma. Operações seguidas com o
+            mesmo comando (mesma tabela, tipo e colunas) vão em um único
+            executemany. O corpo deve conter operations, uma lista de:
+                op: insert, update ou delete
+                table: nome da tabela
+                values: colunas e valores (insert e update)
+                id: valor da chave primária, ou Id (update e delete)
+
+            Returns:
+                JSON com o resultado de cada operação (statement é o comando em
+                que ela foi agrupada e affected as linhas afetadas por ele) ou
+                mensagem de erro com as operações do comando que falhou
+            """
+            body = request.get_json(silent=True)
+            operations = body.get("operations") if isinstance(body, dict) else None
+            if not isinstance(operations, list) or not operations:
+                return {"error": "❌ Informe a lista operations."}
+
+            statements = []
+            for index, operation in enumerate(operations):
+                success, statement = self.buildOperation(data_base, operation)
+                if not success:
+                    return {"error": f"❌ Operação {index}: {statement}"}
+                query, params = statement
+                if statements and statements[-1][0] == query:
+                    statements[-1][1].append(params)
+                    statements[-1][2].append(index)
+                else:
+                    statements.append((query, [params], [index]))
+
+            success, result = self.db.use(data_base).execute_transaction(
+                (query, params if len(params) > 1 else params[0])
+                for query, params, _ in statements
+            )
+            if not success:
+                position, error = result
+                print(error)
+                for index in statements[position][2]:
+                    metadata_cache.invalidate(data_base, operations[index]["table"])
+                return {"error": error, "failed": statements[position][2]}
+
+            results = []
+            for position, (_, _, indexes) in enumerate(statements):
+                for index in indexes:
+                    results.append(
+                        {
+                            "index": index,
+                            "op": operations[index]["op"],
+                            "table": operations[index]["table"],
+                            "statement": position,
+                            "affected": result[position],
+                        }
+                    )
+            return {"data": {"statements": len(statements), "results": results}}
+
+    def buildOperation(self, data_base, operation):
+        """
+        Monta o comando de uma operação do endpoint batch.
+
+        As colunas seguem a ordem da tabela, então operações iguais geram o
+        mesmo texto e podem ser agrupadas.
+
+        Returns:
+            (True, (sql, parâmetros)) ou (False, mensagem de erro)
+        """
+        if not isinstance(operation, dict):
+            return False, "deve ser um objeto."
+        op = operation.get("op")
+        table_name = operation.get("table")
+        values = operation.get("values") or {}
+        if op not in ("insert", "update", "delete"):
+            return False, "op deve ser insert, update ou delete."
+        if not table_name or not isinstance(table_name, str):
+            return False, "informe table."
+        if not isinstance(values, dict):
+            return False, "values deve ser um objeto."
 
-    def getFields(self, data_base, table_name):
         columns = self.getColumns(data_base, table_name)
+        if not columns:
+            return False, f"tabela {table_name} não encontrada."
+        names = [column["COLUMN_NAME"] for column in columns]
+        invalid = [key for key in values if key not in names]
+        if invalid:
+            return False, f"colunas inválidas: {', '.join(invalid)}."
+        fields = [name for name in names if name in values]
+        params = {name: values[name] for name in fields}
+
+        if op == "insert":
+            if not fields:
+                return False, "informe values."
+            query = f"INSERT INTO {table_name} ({', '.join(fields)}) VALUES (:{', :'.join(fields)})"
+            return True, (query, params)
+
+        key = self.getPrimaryKey(data_base, table_name, [{"name": n} for n in names])
+        if key is None:
+            return False, f"{op} exige chave primária ou coluna Id."
+        if operation.get("id") is None:
+            return False, "informe id."
+        if isinstance(operation["id"], bool) or not isinstance(
+            operation["id"], (str, int, float)
+        ):
+            return False, "id deve ser um número ou texto."
+        params["__key"] = operation["id"]
+
+        if op == "update":
+            sets = [f"{name} = :{name}" for name in fields if name != key]
+            if not sets:
+                return False, "nenhuma coluna para atualizar."
+            query = f"UPDATE {table_name} SET {', '.join(sets)} WHERE {key} = :__key"
+            return True, (query, params)
+
+        query = f"DELETE FROM {table_name} WHERE {key} = :__key"
+        return True, (query, {"__key": params["__key"]})
+
+    def readNdjson(self, stream):
+        """
+        Lê NDJSON linha a linha.
+
+        Yields:
+            (número da linha, registro) ou (número da linha, erro) se inválida
+        """
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as e:
+                yield line, e
+                continue
+            if not isinstance(record, dict):
+                yield line, ValueError("a linha não é um objeto JSON")
+                continue
+            yield line, record
+
+    def buildTarget(self, data_base, table_name, columns, body, params):
+        """
+        Monta o WHERE dos comandos em lote a partir de keys ou where.
+
+        A lista de chaves vai como um único parâmetro JSON lido com OPENJSON,
+        então o texto do comando não muda com a quantidade de chaves.
+
+        Returns:
+            (True, sql) ou (False, mensagem de erro)
+        """
+        keys = body.get("keys")
+        filters = body.get("where")
+        types = {column["COLUMN_NAME"]: column["DATA_TYPE"] for column in columns}
+
+        if keys:
+            if not isinstance(keys, list):
+                return False, "❌ keys deve ser uma lista."
+            if len(self.getPrimaryKeyColumns(data_base, table_name)) > 1:
+                return False, "❌ keys não aceita chave primária composta; use where."
+            cols = [{"name": name} for name in types]
+            key = self.getPrimaryKey(data_base, table_name, cols)
+            if key is None:
+                return False, "❌ keys exige chave primária ou coluna Id."
+            params["keys"] = json.dumps(keys, default=str)
+            cast_type = self.castType(types[key])
+            return True, (
+                f"{key} IN (SELECT CAST([value] AS {cast_type}) FROM OPENJSON(:keys))"
+            )
+
+        if filters:
+            if not isinstance(filters, dict):
+                return False, "❌ where deve ser um objeto."
+            conditions = []
+            for i, name in enumerate(filters):
+                if name not in types:
+                    return False, f"❌ Coluna inválida: {name}."
+                value = filters[name]
+                if value is None:
+                    conditions.append(f"{name} IS NULL")
+                elif isinstance(value, list):
+                    names = []
+                    for j, item in enumerate(value):
+                        params[f"w{i}_{j}"] = item
+                        names.append(f":w{i}_{j}")
+                    conditions.append(f"{name} IN ({', '.join(names) or 'NULL'})")
+                else:
+                    params[f"w{i}"] = value
+                    conditions.append(f"{name} = :w{i}")
+            return True, " AND ".join(conditions)
+
+        return False, "❌ Informe keys ou where."
+
+    def buildFilters(self, filters, columns, where, query_params, types):
+        """
+        Monta as condições de list_data a partir dos filtros da query string.
+
+        Cada valor é convertido com o ValueParser da coluna e vai como
+        parâmetro (:f0, :f1_0, ...), com o tipo SQL registrado em types.
+
+        Returns:
+            (True, None) ou (False, mensagem de erro)
+        """
+        column_types = {
+            column["COLUMN_NAME"]: (column["DATA_TYPE"] or "").lower()
+            for column in columns
+        }
+        for i, (key, value) in enumerate(filters.items()):
+            name, operator = key, "eq"
+            if name not in column_types and "__" in key:
+                name, operator = key.rsplit("__", 1)
+            if name not in column_types:
+                return False, f"❌ Coluna inválida: {name}."
+            if operator not in FILTER_OPERATORS:
+                return False, f"❌ Operador inválido: {operator}."
+            data_type = column_types[name]
+            if data_type in UNFILTERABLE_TYPES:
+                return False, f"❌ A coluna {name} não pode ser filtrada."
+
+            if operator == "null":
+                negate = value.strip().lower() in ("0", "false")
+                where.append(f"{name} IS {'NOT ' if negate else ''}NULL")
+                continue
+
+            # Vazio só é um valor válido em texto; nos demais tipos o SQL
+            # Server converteria '' para 0 ou 1900-01-01 (use __null=1)
+            items = value.split(",") if operator == "in" else [value]
+            if data_type not in TEXT_TYPES and any(not v.strip() for v in items):
+                return False, f"❌ Valor vazio para {name}; use {name}__null=1."
+
+            param = f"f{i}"
+            param_type = self.paramType(data_type)
+            parse = ValueParser.parser(data_type)
+            try:
+                if operator == "in":
+                    names = []
+                    for j, item in enumerate(value.split(",")):
+                        query_params[f"{param}_{j}"] = parse(item.strip())
+                        types[f"{param}_{j}"] = param_type
+                        names.append(f":{param}_{j}")
+                    where.append(f"{name} IN ({', '.join(names)})")
+                elif operator == "like":
+                    if data_type not in TEXT_TYPES:
+                        return False, "❌ like só pode ser usado em colunas de texto."
+                    query_params[param] = self.escapeLike(value) + "%"
+                    types[param] = param_type
+                    where.append(f"{name} LIKE :{param} ESCAPE '\\'")
+                else:
+                    query_params[param] = value if value == "" else parse(value)
+                    types[param] = param_type
+                    where.append(f"{name} {COMPARISON_OPERATORS[operator]} :{param}")
+            except (ValueError, TypeError):
+                return False, f"❌ Valor inválido para {name}: {value}."
+        return True, None
+
+    def buildSearch(self, value, columns, where, query_params, types):
+        """
+        Condição da pesquisa de list_data: o texto em qualquer coluna (OR).
+
+        Colunas de texto são comparadas direto; as demais são convertidas
+        para texto. Tipos binários e os que não podem ser filtrados ficam de
+        fora.
+
+        Returns:
+            (True, None) ou (False, mensagem de erro)
+        """
+        conditions = []
+        for column in columns:
+            name = column["COLUMN_NAME"]
+            data_type = (column["DATA_TYPE"] or "").lower()
+            if data_type in UNFILTERABLE_TYPES or data_type in BINARY_TYPES:
+                continue
+            if data_type in DATE_TYPES:
+                # yyyy-mm-dd hh:mi:ss, o formato que a API devolve
+                name = f"CONVERT(nvarchar(4000), {name}, 120)"
+            elif data_type not in TEXT_TYPES:
+                name = f"CONVERT(nvarchar(4000), {name})"
+            conditions.append(f"{name} LIKE :search ESCAPE '\\'")
+        if not conditions:
+            return False, "❌ A tabela não tem colunas que possam ser pesquisadas."
+        query_params["search"] = "%" + self.escapeLike(value) + "%"
+        types["search"] = "nvarchar(4000)"
+        where.append(f"({' OR '.join(conditions)})")
+        return True, None
+
+    def escapeLike(self, value):
+        for char in ("\\", "%", "_", "["):
+            value = value.replace(char, "\\" + char)
+        return value
+
+    def paramType(self, data_type):
+        """
+        Tipo declarado no sp_executesql para um parâmetro comparado à coluna.
+        """
+        data_type = (data_type or "").lower()
+        if data_type in ("char", "varchar", "text"):
+            return "varchar(8000)"
+        if data_type in ("nchar", "nvarchar", "ntext"):
+            return "nvarchar(4000)"
+        if data_type in ("binary", "varbinary"):
+            return "varbinary(8000)"
+        if data_type in ("decimal", "numeric"):
+            return "decimal(38, 10)"
+        if data_type == "timestamp":
+            return "binary(8)"
+        return data_type
+
+    def castType(self, data_type):
+        """
+        Tipo usado para converter os valores do OPENJSON no tipo da chave.
+        """
+        if data_type in ("varchar", "char"):
+            return "varchar(900)"
+        if data_type in ("nvarchar", "nchar"):
+            return "nvarchar(450)"
+        if data_type in ("decimal", "numeric"):
+            return "decimal(38, 10)"
+        if data_type in ("binary", "varbinary"):
+            return "varbinary(8000)"
+        return data_type
+
+    def executeSetBased(self, data_base, query, params):
+        [(success, result)] = self.db.use(data_base).execute_batches(
+            [[(query, params)]]
+        )
+        if not success:
+            print(result)
+            return {"error": result}
+        return {"data": {"affected": result}}
+
+    def getIdentityColumns(self, data_base, table_name):
+        """
+        Busca as colunas IDENTITY da tabela, usando o cache de metadados.
+        """
+
+        def load():
+            query = """
+                SELECT name FROM sys.identity_columns
+                WHERE object_id = OBJECT_ID(:table_name)
+                """
+            success, rows = self.db.use(data_base).fetch_rows(
+                query, {"table_name": table_name}
+            )
+            if not success:
+                return success, rows
+            return True, [row["name"] for row in rows]
+
+        success, identity = metadata_cache.get(data_base, table_name, "identity", load)
+        return identity if success else []
+
+    def groupByShape(self, records):
+        """
+        Agrupa registros pelo conjunto de colunas, mantendo a ordem de chegada.
+
+        Returns:
+            Lista de (colunas, registros)
+        """
+        groups = {}
+        for record in records:
+            groups.setdefault(tuple(record), []).append(record)
+        return [(list(fields), rows) for fields, rows in groups.items()]
+
+    def lastByKey(self, records, key):
+        """
+        Mantém só o último registro de cada chave, na posição do último.
+        """
+        records_by_key = {}
+        for record in records:
+            value = str(record[key])
+            records_by_key.pop(value, None)
+            records_by_key[value] = record
+        return list(records_by_key.values())
+
+    def valuesChunks(self, fields, rows):
+        """
+        Divide os registros em blocos de VALUES com parâmetros nomeados.
+
+        Yields:
+            (sql dos VALUES, parâmetros) respeitando os limites do SQL Server
+        """
+        per_statement = MAX_STATEMENT_PARAMS // max(len(fields), 1)
+        per_statement = max(1, min(MAX_VALUES_ROWS, per_statement))
+        for start in range(0, len(rows), per_statement):
+            values = []
+            params = {}
+            for i, row in enumerate(rows[start : start + per_statement]):
+                names = []
+                for j, field in enumerate(fields):
+                    name = f"p{i}_{j}"
+                    params[name] = row.get(field)
+                    names.append(f":{name}")
+                values.append(f"({', '.join(names)})")
+            yield ", ".join(values), params
+
+    def insertStatements(self, table_name, fields, rows):
+        statements = []
+        for values, params in self.valuesChunks(fields, rows):
+            query = f"INSERT INTO {table_name} ({', '.join(fields)}) VALUES {values}"
+            statements.append((query, params))
+        return statements
+
+    def mergeStatements(self, table_name, fields, rows, key, identity):
+        updates = [
+            f"target.{field} = source.{field}"
+            for field in fields
+            if field != key and field not in identity
+        ]
+        inserts = [field for field in fields if field not in identity]
+        statements = []
+        for values, params in self.valuesChunks(fields, rows):
+            query = f"""
+                MERGE {table_name} WITH (HOLDLOCK) AS target
+                USING (VALUES {values}) AS source ({', '.join(fields)})
+                ON target.{key} = source.{key}
+                """
+            if updates:
+                query += f" WHEN MATCHED THEN UPDATE SET {', '.join(updates)}"
+            if inserts:
+                query += f"""
+                    WHEN NOT MATCHED THEN INSERT ({', '.join(inserts)})
+                    VALUES ({', '.join('source.' + field for field in inserts)});
+                    """
+            else:
+                query += " WHEN NOT MATCHED THEN INSERT DEFAULT VALUES;"
+            statements.append((query, params))
+        return statements
+
+    def getColumns(self, data_base, table_name):
+        """
+        Busca as colunas da tabela (COLUMN_NAME, DATA_TYPE), usando o cache de metadados.
+
+        Returns:
+            Lista de dicionários na ordem das colunas
+        """
+
+        def load():
+            query = f"""
+                SELECT COLUMN_NAME, DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS 
+                WHERE TABLE_NAME = '{table_name}'
+                ORDER BY ORDINAL_POSITION
+                """
+            success, columns = self.db.use(data_base).fetch_rows(query)
+            if success and not columns:
+                # Não guarda: a tabela pode ser criada depois por outro processo
+                return False, f"❌ Tabela {table_name} não encontrada."
+            return success, columns
+
+        success, columns = metadata_cache.get(data_base, table_name, "columns", load)
+        if not success:
+            print(columns)
+            return []
+        return columns
+
+    def getFields(self, data_base, table_name, columns=None, alias=None):
+        if columns is None:
+            columns = self.getColumns(data_base, table_name)
+        prefix = f"{alias}." if alias else ""
         fields = []
-        for column in columns.to_dict(orient="records"):
+        for column in columns:
             if column["DATA_TYPE"] == "geometry":
                 fields.append(
-                    f"{column['COLUMN_NAME']}.ToString() as {column['COLUMN_NAME']}"
+                    f"{prefix}{column['COLUMN_NAME']}.ToString() as {column['COLUMN_NAME']}"
                 )
             elif column["DATA_TYPE"] == "geography":
                 fields.append(
-                    f"{column['COLUMN_NAME']}.ToString() as {column['COLUMN_NAME']}"
+                    f"{prefix}{column['COLUMN_NAME']}.ToString() as {column['COLUMN_NAME']}"
                 )
             else:
-                fields.append(column["COLUMN_NAME"])
+                fields.append(f"{prefix}{column['COLUMN_NAME']}")
         return fields
+
+    def explainQuery(self, data_base, query, params=None):
+        """
+        Executa o comando com SET STATISTICS XML ON e resume os planos reais.
+
+        Returns:
+            JSON com cpu_time_ms, elapsed_time_ms, logical_reads por tabela,
+            o resumo de cada comando, a quantidade de linhas de cada resultado
+            e os planos XML
+        """
+        success, result = self.db.use(data_base).explain(query, params)
+        if not success:
+            print(result)
+            return {"error": result}
+
+        sets, plans = result
+        summary = QueryPlan.summarize(plans)
+        summary["rows"] = [count for _, count in sets]
+        summary["plans"] = plans
+        response = make_response({"data": summary})
+        response.cache_control.no_store = True
+        return response
+
+    def isTrue(self, value):
+        return value not in (None, "", "0", "false")
+
+    def streamRows(self, data_base, table_name, query, params, columns, chunk_size):
+        """
+        Devolve o resultado da consulta como NDJSON, bloco a bloco.
+
+        A memória usada fica limitada ao tamanho do bloco, independente do
+        tamanho da tabela. Erros no meio do envio viram uma linha {"error": ...}
+        e descartam os metadados da tabela em cache.
+        """
+
+        cols = [
+            {"name": column["COLUMN_NAME"], "type": column["DATA_TYPE"]}
+            for column in columns
+        ]
+        names = [column["COLUMN_NAME"] for column in columns]
+        serializer = JsonCustomEncoder.serializer(names, columns)
+
+        def generate():
+            yield json.dumps({"columns": cols}) + "\n"
+            try:
+                for rows in self.db.use(data_base).stream_data(
+                    query, params, chunk_size, as_dict=False
+                ):
+                    yield "".join(serializer.row(row) + "\n" for row in rows)
+            except Exception as e:
+                print(f"❌ Erro no stream: {e}")
+                metadata_cache.invalidate(data_base, table_name)
+                yield json.dumps({"error": f"Erro: {e}"}) + "\n"
+
+        return Response(
+            stream_with_context(generate()), mimetype="application/x-ndjson"
+        )
+
+    def getPrimaryKey(self, data_base, table_name, cols):
+        """
+        Busca a coluna da chave primária da tabela, usando Id como alternativa.
+
+        Returns:
+            Nome da coluna ou None se a tabela não tiver chave utilizável
+        """
+        keys = self.getPrimaryKeyColumns(data_base, table_name)
+        if len(keys) == 1:
+            return keys[0]
+
+        names = [column["name"] for column in cols]
+        if "Id" in names:
+            return "Id"
+        return None
+
+    def getPrimaryKeyColumns(self, data_base, table_name):
+        """
+        Colunas da chave primária da tabela, na ordem da chave.
+
+        Returns:
+            Lista de nomes (vazia se a tabela não tiver chave ou a consulta falhar)
+        """
+
+        def load():
+            query = f"""
+                SELECT kcu.COLUMN_NAME FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
+                INNER JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu
+                    ON tc.CONSTRAINT_NAME = kcu.CONSTRAINT_NAME
+                    AND tc.TABLE_NAME = kcu.TABLE_NAME
+                WHERE tc.CONSTRAINT_TYPE = 'PRIMARY KEY' AND tc.TABLE_NAME = '{table_name}'
+                ORDER BY kcu.ORDINAL_POSITION
+                """
+            success, keys = self.db.use(data_base).fetch_rows(query)
+            if not success:
+                return success, keys
+            return True, [key["COLUMN_NAME"] for key in keys]
+
+        success, keys = metadata_cache.get(data_base, table_name, "primary_key", load)
+        return keys if success else []
+
+    def buildPage(self, page, cols, primary_key, where, query_params):
+        """
+        Monta a cláusula ORDER BY / OFFSET ... FETCH da página pedida.
+
+        No modo keyset (cursor) adiciona em where a condição de busca pela chave,
+        o que permite ao SQL Server fazer seek no índice em vez de pular linhas.
+
+        Returns:
+            (True, sql) ou (False, mensagem de erro)
+        """
+        try:
+            limit = int(page.get("limit") or DEFAULT_PAGE_LIMIT)
+            offset = int(page.get("offset") or 0)
+        except ValueError:
+            return False, "❌ limit e offset devem ser números inteiros."
+        if limit < 1 or offset < 0:
+            return False, "❌ limit deve ser maior que zero e offset não negativo."
+        limit = min(limit, MAX_PAGE_LIMIT)
+
+        names = [column["name"] for column in cols]
+        order = []
+        for item in (page.get("sort") or "").split(","):
+            item = item.strip()
+            if not item:
+                continue
+            direction = "DESC" if item.startswith("-") else "ASC"
+            name = item.lstrip("-+")
+            if name not in names:
+                return False, f"❌ Coluna de ordenação inválida: {name}."
+            order.append((name, direction))
+
+        query_params["limit"] = limit
+        if "cursor" in page:
+            if primary_key is None:
+                return (
+                    False,
+                    "❌ Paginação por cursor exige chave primária ou coluna Id.",
+                )
+            if any(name != primary_key for name, _ in order):
+                return False, f"❌ Paginação por cursor só ordena por {primary_key}."
+            direction = order[0][1] if order else "ASC"
+            if page["cursor"]:
+                try:
+                    query_params["cursor"] = self.decodeCursor(page["cursor"])
+                except ValueError:
+                    return False, "❌ Cursor inválido."
+                operator = "<" if direction == "DESC" else ">"
+                where.append(f"{primary_key} {operator} :cursor")
+            return True, (
+                f" ORDER BY {primary_key} {direction}"
+                " OFFSET 0 ROWS FETCH NEXT :limit ROWS ONLY"
+            )
+
+        query_params["offset"] = offset
+        if primary_key and all(name != primary_key for name, _ in order):
+            # Desempate pela chave: sem ele, linhas com o mesmo valor na
+            # ordenação podem repetir ou sumir entre as páginas
+            order.append((primary_key, "ASC"))
+        if order:
+            order_by = ", ".join(f"{name} {direction}" for name, direction in order)
+        else:
+            order_by = "(SELECT NULL)"
+        return True, (
+            f" ORDER BY {order_by} OFFSET :offset ROWS FETCH NEXT :limit ROWS ONLY"
+        )
+
+    def encodeCursor(self, value):
+        """
+        Token do cursor com o valor da chave e o tipo Python, para que
+        decodeCursor devolva o mesmo valor (bytes e datas não existem em JSON).
+        """
+        if hasattr(value, "item"):
+            value = value.item()
+        if isinstance(value, (bytes, bytearray)):
+            data = {"k": base64.b64encode(value).decode(), "t": "bytes"}
+        elif isinstance(value, datetime.datetime):
+            data = {"k": value.isoformat(), "t": "datetime"}
+        elif isinstance(value, datetime.date):
+            data = {"k": value.isoformat(), "t": "date"}
+        elif isinstance(value, datetime.time):
+            data = {"k": value.isoformat(), "t": "time"}
+        else:
+            data = {"k": value}
+        raw = json.dumps(data, default=str).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decodeCursor(self, token):
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token.encode()))
+            value, kind = data["k"], data.get("t")
+            if kind == "bytes":
+                return base64.b64decode(value)
+            if kind == "datetime":
+                return datetime.datetime.fromisoformat(value)
+            if kind == "date":
+                return datetime.date.fromisoformat(value)
+            if kind == "time":
+                return datetime.time.fromisoformat(value)
+            return value
+        except Exception:
+            raise ValueError(token)
@@ -1,3 +1,6 @@
+from lib.CatalogVersion import CatalogVersion
+from lib.MetadataCache import metadata_cache
+from lib.ResponseCache import response_cache
 from lib.SQLServerConnection import SQLServerConnection
 from flask import request  # type: ignore
 import pyodbc  # type: ignore
@@ -14,15 +17,17 @@ import os
 
 class DataBasesController:
 
-    def __init__(self, app):
+    def __init__(self, app, db=None):
         """
         Inicializa o controlador com a aplicação Flask e estabelece conexão com o banco.
 
         Args:
             app: Instância da aplicação Flask
+            db: Conexão compartilhada (SQLServerConnection); criada se omitida
         """
         self.app = app
-        self.db = SQLServerConnection()
+        self.db = db or SQLServerConnection()
+        self.versions = CatalogVersion(self.db)
 
     def register_routes(self):
         """
@@ -35,6 +40,7 @@ class DataBasesController:
         """
 
         @self.app.route("/databases")
+        @response_cache.cached(self.versions.databases)
         def databases():
             """
             Endpoint para listar todos os bancos de dados.
@@ -44,18 +50,18 @@ class DataBasesController:
             """
 
             query = "SELECT database_id, name FROM sys.databases WHERE name not in ('master', 'tempdb', 'model', 'msdb')"
-            success, tables = self.db.get_data(query)
+            success, tables = self.db.fetch_rows(query)
 
             if not success:
                 error = "❌ Erro ao buscar bancos de dados."
                 print(error)
                 return {"error": error}
 
-            if tables.size == 0:
+            if len(tables) == 0:
                 print("❌ Nenhum banco de dados encontrado.")
                 return {"data": []}
 
-            data = tables.to_dict(orient="records")
+            data = tables
             return {"data": data}
 
         @self.app.route("/<data_base>/database/create", methods=["POST"])
@@ -127,4 +133,7 @@ class DataBasesController:
             cursor.close()
             cnxn.close()
 
+            metadata_cache.invalidate(data_base)
+            self.db.forget(data_base)
+
             return {"data": {}}
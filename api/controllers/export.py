@@ -0,0 +1,150 @@
+from lib.SQLServerConnection import SQLServerConnection, pool_options
+from lib.TableExporter import TableExporter
+from flask import request, send_file  # type: ignore
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+"""
+    Controlador para gerenciar rotas de exportação do banco de dados.
+
+    Esta classe é responsável por registrar e manipular as rotas da aplicação Flask
+    que exportam os dados das tabelas para arquivos.
+    """
+
+
+class ExportController:
+
+    def __init__(self, app, db=None, tables=None, data=None):
+        """
+        Inicializa o controlador com a aplicação Flask e estabelece conexão com o banco.
+
+        Args:
+            app: Instância da aplicação Flask
+            db: Conexão compartilhada (SQLServerConnection); criada se omitida
+            tables: TablesController usado para descobrir as tabelas
+            data: DataController usado para montar a projeção das colunas
+        """
+        self.app = app
+        self.db = db or SQLServerConnection()
+        self.tables = tables
+        self.data = data
+
+    def register_routes(self):
+        """
+        Registra todas as rotas de exportação na aplicação Flask.
+
+        Esta função define os endpoints da API que permitem:
+        1. Exportar uma ou todas as tabelas para CSV ou Parquet em um arquivo zip
+        """
+
+        @self.app.route("/<data_base>/export")
+        def export(data_base):
+            """
+            Endpoint para exportar tabelas do banco de dados.
+
+            As tabelas são exportadas em paralelo (até EXPORT_WORKERS, limitado ao
+            tamanho do pool de conexões), cada uma lida em blocos, e os arquivos
+            são compactados em um único zip com um manifest.json.
+            Parâmetros da query string:
+                tables: tabelas separadas por vírgula (padrão: todas)
+                format: csv (padrão) ou parquet
+
+            Returns:
+                Arquivo zip ou mensagem de erro em caso de falha
+            """
+            data_format = request.args.get("format", "csv").lower()
+            if data_format not in ("csv", "parquet"):
+                return {"error": "❌ format deve ser csv ou parquet."}
+            if data_format == "parquet":
+                try:
+                    import pyarrow  # type: ignore # noqa: F401
+                except ImportError:
+                    return {"error": "❌ Exportação Parquet exige o pacote pyarrow."}
+
+            success, tables = self.tables.getTables(data_base)
+            if not success:
+                print(tables)
+                return {"error": "❌ Erro ao buscar tabelas."}
+            names = [table["TABLE_NAME"] for table in tables]
+
+            selected = [
+                name.strip()
+                for name in request.args.get("tables", "").split(",")
+                if name.strip()
+            ]
+            invalid = [name for name in selected if name not in names]
+            if invalid:
+                return {"error": f"❌ Tabelas não encontradas: {', '.join(invalid)}."}
+            selected = selected or names
+            if not selected:
+                return {"error": "❌ Nenhuma tabela encontrada no banco."}
+
+            directory = tempfile.mkdtemp(prefix="export_")
+            try:
+                archive = self.exportTables(data_base, selected, data_format, directory)
+            except Exception as e:
+                shutil.rmtree(directory, ignore_errors=True)
+                return {"error": f"Erro: {e}"}
+
+            response = send_file(
+                archive,
+                mimetype="application/zip",
+                as_attachment=True,
+                download_name=f"{data_base}.zip",
+            )
+            response.call_on_close(lambda: shutil.rmtree(directory, ignore_errors=True))
+            return response
+
+    def exportTables(self, data_base, tables, data_format, directory):
+        """
+        Exporta as tabelas em paralelo e compacta os arquivos.
+
+        Returns:
+            Caminho do arquivo zip
+        """
+        workers = int(os.getenv("EXPORT_WORKERS", "4"))
+        workers = max(1, min(workers, pool_options()["pool_size"], len(tables)))
+
+        manifest = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (
+                    table,
+                    executor.submit(
+                        self.exportTable, data_base, table, data_format, directory
+                    ),
+                )
+                for table in tables
+            ]
+            for table, future in futures:
+                try:
+                    path, rows = future.result()
+                    manifest.append({"table": table, "file": path, "rows": rows})
+                except Exception as e:
+                    print(f"❌ Erro ao exportar a tabela {table}: {e}")
+                    manifest.append({"table": table, "error": str(e)})
+
+        archive = os.path.join(directory, f"{data_base}.zip")
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as file:
+            for item in manifest:
+                if "file" in item:
+                    path = os.path.join(directory, item["file"])
+                    file.write(path, item["file"])
+                    os.remove(path)
+            file.writestr("manifest.json", json.dumps(manifest, indent=2))
+        return archive
+
+    def exportTable(self, data_base, table_name, data_format, directory):
+        columns = self.data.getColumns(data_base, table_name)
+        fields = self.data.getFields(data_base, table_name, columns)
+        query = f"SELECT {', '.join(fields)} FROM {table_name}"
+
+        path = f"{table_name}.{data_format}"
+        rows = TableExporter(self.db.use(data_base)).export(
+            data_format, query, columns, os.path.join(directory, path)
+        )
+        return path, rows
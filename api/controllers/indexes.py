@@ -0,0 +1,289 @@
+from lib.SQLServerConnection import SQLServerConnection
+from flask import request  # type: ignore
+
+"""
+    Controlador para gerenciar rotas relacionadas aos índices do banco de dados.
+
+    Esta classe é responsável por registrar e manipular as rotas da aplicação Flask
+    que listam, criam e excluem índices e sugerem índices a partir das DMVs.
+    """
+
+INDEXES_QUERY = """
+    SELECT i.index_id, i.name, i.type_desc, i.is_primary_key, i.is_unique,
+        i.is_unique_constraint, i.has_filter, i.filter_definition,
+        c.name AS column_name, ic.key_ordinal, ic.is_included_column,
+        ic.is_descending_key,
+        ISNULL(u.user_seeks, 0) AS user_seeks, ISNULL(u.user_scans, 0) AS user_scans,
+        ISNULL(u.user_lookups, 0) AS user_lookups,
+        ISNULL(u.user_updates, 0) AS user_updates,
+        (SELECT SUM(ps.used_page_count) * 8 FROM sys.dm_db_partition_stats ps
+            WHERE ps.object_id = i.object_id AND ps.index_id = i.index_id) AS used_kb
+    FROM sys.indexes i
+    INNER JOIN sys.index_columns ic
+        ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+    INNER JOIN sys.columns c
+        ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+    LEFT JOIN sys.dm_db_index_usage_stats u
+        ON u.database_id = DB_ID() AND u.object_id = i.object_id
+        AND u.index_id = i.index_id
+    WHERE i.object_id = OBJECT_ID(:table_name) AND i.index_id > 0
+        AND i.is_hypothetical = 0
+    ORDER BY i.index_id, ic.is_included_column, ic.key_ordinal, ic.index_column_id
+    """
+
+ADVISOR_QUERY = """
+    SELECT d.equality_columns, d.inequality_columns, d.included_columns,
+        s.user_seeks, s.user_scans, s.avg_total_user_cost, s.avg_user_impact,
+        CONVERT(varchar(23), s.last_user_seek, 121) AS last_user_seek,
+        s.avg_total_user_cost * (s.avg_user_impact / 100.0)
+            * (s.user_seeks + s.user_scans) AS improvement
+    FROM sys.dm_db_missing_index_details d
+    INNER JOIN sys.dm_db_missing_index_groups g ON g.index_handle = d.index_handle
+    INNER JOIN sys.dm_db_missing_index_group_stats s ON s.group_handle = g.index_group_handle
+    WHERE d.database_id = DB_ID() AND d.object_id = OBJECT_ID(:table_name)
+    ORDER BY improvement DESC;
+
+    SELECT i.name, i.type_desc,
+        ISNULL(u.user_seeks, 0) AS user_seeks, ISNULL(u.user_scans, 0) AS user_scans,
+        ISNULL(u.user_lookups, 0) AS user_lookups,
+        ISNULL(u.user_updates, 0) AS user_updates,
+        CONVERT(varchar(23), u.last_user_update, 121) AS last_user_update
+    FROM sys.indexes i
+    LEFT JOIN sys.dm_db_index_usage_stats u
+        ON u.database_id = DB_ID() AND u.object_id = i.object_id
+        AND u.index_id = i.index_id
+    WHERE i.object_id = OBJECT_ID(:table_name) AND i.index_id > 1
+        AND i.is_primary_key = 0 AND i.is_unique_constraint = 0
+        AND i.is_hypothetical = 0
+        AND ISNULL(u.user_seeks, 0) + ISNULL(u.user_scans, 0)
+            + ISNULL(u.user_lookups, 0) = 0
+    ORDER BY user_updates DESC;
+    """
+
+
+class IndexesController:
+
+    def __init__(self, app, db=None, data=None):
+        """
+        Inicializa o controlador com a aplicação Flask e estabelece conexão com o banco.
+
+        Args:
+            app: Instância da aplicação Flask
+            db: Conexão compartilhada (SQLServerConnection); criada se omitida
+            data: DataController usado para validar as colunas da tabela
+        """
+        self.app = app
+        self.db = db or SQLServerConnection()
+        self.data = data
+
+    def register_routes(self):
+        """
+        Registra todas as rotas relacionadas a índices na aplicação Flask.
+
+        Esta função define os endpoints da API que permitem:
+        1. Listar os índices de uma tabela com colunas, tamanho e uso
+        2. Criar um índice em uma tabela
+        3. Excluir um índice de uma tabela
+        4. Sugerir índices ausentes e apontar índices sem uso
+        """
+
+        @self.app.route("/<data_base>/indexes/<table_name>")
+        def indexes(data_base, table_name):
+            """
+            Endpoint para listar os índices de uma tabela.
+
+            As estatísticas de uso (seeks, scans, lookups, updates) vêm de
+            sys.dm_db_index_usage_stats e valem desde o último restart do
+            SQL Server.
+
+            Args:
+                table_name (str): Nome da tabela
+
+            Returns:
+                JSON com os índices da tabela ou mensagem de erro em caso de falha
+            """
+            success, rows = self.db.use(data_base).fetch_rows(
+                INDEXES_QUERY, {"table_name": table_name}
+            )
+            if not success:
+                print(rows)
+                return {"error": "❌ Erro ao buscar índices."}
+
+            return {"data": self.buildIndexes(rows)}
+
+        @self.app.route("/<data_base>/indexes/<table_name>", methods=["POST"])
+        def indexes_create(data_base, table_name):
+            """
+            Endpoint para criar um índice em uma tabela.
+
+            O corpo deve conter:
+                columns: colunas da chave, "-" na frente para DESC
+                name: nome do índice (padrão IX_<tabela>_<colunas>)
+                include: colunas incluídas (INCLUDE)
+                where: condição do índice filtrado (ex.: "Status = 1")
+                unique: cria um índice UNIQUE
+                clustered: cria um índice CLUSTERED
+                online: cria com ONLINE = ON (edições que suportam)
+
+            Args:
+                table_name (str): Nome da tabela
+
+            Returns:
+                JSON com data = {} ou mensagem de erro em caso de falha
+            """
+            body = request.json or {}
+            success, query = self.buildCreate(data_base, table_name, body)
+            if not success:
+                return {"error": query}
+
+            success, error = self.db.use(data_base).execute_query(query)
+            if not success:
+                print(error)
+                return {"error": error}
+
+            return {"data": {}}
+
+        @self.app.route(
+            "/<data_base>/indexes/delete/<table_name>/<index_name>", methods=["POST"]
+        )
+        def indexes_delete(data_base, table_name, index_name):
+            """
+            Endpoint para excluir um índice de uma tabela.
+
+            Args:
+                table_name (str): Nome da tabela
+                index_name (str): Nome do índice
+
+            Returns:
+                JSON com data = {} ou mensagem de erro em caso de falha
+            """
+            query = f"DROP INDEX {index_name} ON {table_name}"
+            success, error = self.db.use(data_base).execute_query(query)
+            if not success:
+                print(error)
+                return {"error": error}
+
+            return {"data": {}}
+
+        @self.app.route("/<data_base>/indexes/advisor/<table_name>")
+        def indexes_advisor(data_base, table_name):
+            """
+            Endpoint para sugerir índices de uma tabela.
+
+            Retorna os índices ausentes registrados pelo otimizador
+            (sys.dm_db_missing_index_*), ordenados pelo impacto estimado
+            (custo médio x % de melhora x seeks + scans), com o CREATE INDEX
+            sugerido, e os índices que não foram lidos desde o último restart
+            mas continuam sendo mantidos a cada escrita.
+
+            Args:
+                table_name (str): Nome da tabela
+
+            Returns:
+                JSON com missing e unused ou mensagem de erro em caso de falha
+            """
+            success, sets = self.db.use(data_base).fetch_sets(
+                ADVISOR_QUERY, {"table_name": table_name}
+            )
+            if not success:
+                print(sets)
+                return {"error": "❌ Erro ao buscar sugestões de índices."}
+
+            missing, unused = [self.records(item) for item in sets]
+            for item in missing:
+                item["statement"] = self.suggestStatement(table_name, item)
+            return {"data": {"missing": missing, "unused": unused}}
+
+    def records(self, result):
+        columns, rows = result
+        return [dict(zip(columns, row)) for row in rows]
+
+    def buildIndexes(self, rows):
+        """
+        Agrupa as linhas (uma por coluna) por índice.
+        """
+        indexes = {}
+        for row in rows:
+            index = indexes.get(row["index_id"])
+            if index is None:
+                index = {
+                    "name": row["name"],
+                    "type": row["type_desc"],
+                    "is_primary": bool(row["is_primary_key"]),
+                    "is_unique": bool(row["is_unique"]),
+                    "is_unique_constraint": bool(row["is_unique_constraint"]),
+                    "filter": row["filter_definition"] if row["has_filter"] else None,
+                    "columns": [],
+                    "descending": [],
+                    "include": [],
+                    "used_kb": row["used_kb"] or 0,
+                    "user_seeks": row["user_seeks"],
+                    "user_scans": row["user_scans"],
+                    "user_lookups": row["user_lookups"],
+                    "user_updates": row["user_updates"],
+                }
+                indexes[row["index_id"]] = index
+            if row["is_included_column"]:
+                index["include"].append(row["column_name"])
+            elif row["key_ordinal"]:
+                index["columns"].append(row["column_name"])
+                if row["is_descending_key"]:
+                    index["descending"].append(row["column_name"])
+        return list(indexes.values())
+
+    def buildCreate(self, data_base, table_name, body):
+        """
+        Monta o CREATE INDEX a partir do corpo da requisição.
+
+        Returns:
+            (True, sql) ou (False, mensagem de erro)
+        """
+        names = [
+            column["COLUMN_NAME"]
+            for column in self.data.getColumns(data_base, table_name)
+        ]
+        if not names:
+            return False, f"❌ Tabela não encontrada: {table_name}."
+
+        keys = []
+        for item in body.get("columns") or []:
+            name = item.lstrip("-+")
+            if name not in names:
+                return False, f"❌ Coluna inválida: {name}."
+            keys.append(f"{name} {'DESC' if item.startswith('-') else 'ASC'}")
+        if not keys:
+            return False, "❌ Informe as colunas do índice."
+
+        include = body.get("include") or []
+        invalid = [name for name in include if name not in names]
+        if invalid:
+            return False, f"❌ Colunas inválidas: {', '.join(invalid)}."
+
+        index_name = body.get("name") or "IX_{}_{}".format(
+            table_name, "_".join(item.lstrip("-+") for item in body["columns"])
+        )
+        kind = "UNIQUE " if body.get("unique") else ""
+        kind += "CLUSTERED" if body.get("clustered") else "NONCLUSTERED"
+
+        query = f"CREATE {kind} INDEX {index_name} ON {table_name} ({', '.join(keys)})"
+        if include:
+            query += f" INCLUDE ({', '.join(include)})"
+        if body.get("where"):
+            query += f" WHERE {body['where']}"
+        if body.get("online"):
+            query += " WITH (ONLINE = ON)"
+        return True, query
+
+    def suggestStatement(self, table_name, item):
+        keys = ", ".join(
+            columns
+            for columns in (item["equality_columns"], item["inequality_columns"])
+            if columns
+        )
+        name = "_".join(column.strip(" []") for column in keys.split(","))
+        statement = (
+            f"CREATE NONCLUSTERED INDEX IX_{table_name}_{name} ON {table_name} ({keys})"
+        )
+        if item["included_columns"]:
+            statement += f" INCLUDE ({item['included_columns']})"
+        return statement
@@ -0,0 +1,127 @@
+from lib.RequestMetrics import request_metrics
+from lib.SlowQueryLog import slow_query_log
+from lib.SQLServerConnection import SQLServerConnection
+from flask import Response, request  # type: ignore
+
+"""
+    Controlador para gerenciar rotas de métricas da API.
+    
+    Esta classe é responsável por registrar e manipular as rotas da aplicação Flask
+    que fornecem informações sobre o funcionamento da API.
+    """
+
+
+class MetricsController:
+
+    def __init__(self, app, db=None):
+        """
+        Inicializa o controlador com a aplicação Flask e estabelece conexão com o banco.
+
+        Args:
+            app: Instância da aplicação Flask
+            db: Conexão compartilhada (SQLServerConnection); criada se omitida
+        """
+        self.app = app
+        self.db = db or SQLServerConnection()
+
+    def register_routes(self):
+        """
+        Registra todas as rotas de métricas na aplicação Flask.
+
+        Esta função define os endpoints da API que permitem:
+        1. Visualizar o estado do pool de conexões
+        2. Exportar as métricas por rota e do pool no formato do Prometheus
+        3. Visualizar e limpar o registro de consultas lentas
+        """
+
+        @self.app.route("/metrics/pool")
+        def metrics_pool():
+            """
+            Endpoint para visualizar o estado do pool de conexões.
+
+            Returns:
+                JSON com conexões em uso, livres, overflow e tempos de espera,
+                e o pool de cada banco de dados em databases
+            """
+            try:
+                return {"data": self.db.pool_status()}
+            except Exception as e:
+                return {"error": f"Erro: {e}"}
+
+        @self.app.route("/metrics")
+        def metrics():
+            """
+            Endpoint para exportar as métricas no formato texto do Prometheus.
+
+            Inclui o histograma de latência por rota, os contadores de idas ao
+            banco, tempo no banco, registros, tempo de serialização e bytes
+            enviados por rota, e o estado do pool de conexões (geral e de cada
+            banco de dados).
+
+            Returns:
+                Texto no formato de exposição do Prometheus
+            """
+            lines = [request_metrics.render()]
+            try:
+                pool = self.db.pool_status()
+            except Exception as e:
+                print(f"❌ Erro ao ler o pool: {e}")
+                pool = {}
+            for key in ("checked_out", "idle", "overflow"):
+                if key in pool:
+                    lines.append(f"# TYPE db_pool_{key} gauge\n")
+                    lines.append(f"db_pool_{key} {pool[key]}\n")
+            databases = pool.get("databases") or {}
+            lines.append("# TYPE db_pool_databases gauge\n")
+            lines.append(f"db_pool_databases {len(databases)}\n")
+            for key in ("checked_out", "idle"):
+                lines.append(f"# TYPE db_pool_database_{key} gauge\n")
+                for name, status in databases.items():
+                    lines.append(
+                        f'db_pool_database_{key}{{database="{name}"}} {status[key]}\n'
+                    )
+            for key in ("connects", "checkouts", "invalidations", "timeouts"):
+                if key in pool:
+                    lines.append(f"# TYPE db_pool_{key}_total counter\n")
+                    lines.append(f"db_pool_{key}_total {pool[key]}\n")
+            return Response(
+                "".join(lines), mimetype="text/plain; version=0.0.4; charset=utf-8"
+            )
+
+        @self.app.route("/debug/slow-queries")
+        def slow_queries():
+            """
+            Endpoint para visualizar as consultas lentas registradas.
+
+            Retorna as últimas execuções acima de SLOW_QUERY_MS (ou com erro),
+            com texto normalizado, parâmetros, duração, registros e rota, e o
+            agrupamento por texto normalizado ordenado pelo tempo total.
+            Parâmetros da query string:
+                limit: quantidade de execuções recentes (padrão 100)
+
+            Returns:
+                JSON com statements e recent ou mensagem de erro em caso de falha
+            """
+            try:
+                limit = int(request.args.get("limit") or 100)
+            except ValueError:
+                return {"error": "❌ limit deve ser um número inteiro."}
+            return {
+                "data": {
+                    "threshold_ms": slow_query_log.threshold_ms,
+                    "sample_rate": slow_query_log.sample_rate,
+                    "statements": slow_query_log.aggregate(),
+                    "recent": slow_query_log.recent(max(limit, 1)),
+                }
+            }
+
+        @self.app.route("/debug/slow-queries/clear", methods=["POST"])
+        def slow_queries_clear():
+            """
+            Endpoint para limpar o registro de consultas lentas.
+
+            Returns:
+                JSON com data = {}
+            """
+            slow_query_log.clear()
+            return {"data": {}}
@@ -0,0 +1,212 @@
+from lib.JsonCustomEncoder import RowSerializer
+from lib.SQLServerConnection import SQLServerConnection
+from flask import Response, request, stream_with_context  # type: ignore
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+# Limites do console (segundos e registros), configuráveis no .env
+QUERY_TIMEOUT = float(os.getenv("QUERY_TIMEOUT", "30"))
+QUERY_MAX_TIMEOUT = float(os.getenv("QUERY_MAX_TIMEOUT", "600"))
+QUERY_MAX_ROWS = int(os.getenv("QUERY_MAX_ROWS", "100000"))
+# Usuário do banco (ex.: só com db_datareader) que executa os lotes do console;
+# sem ele o console também grava
+QUERY_READONLY_USER = os.getenv("QUERY_READONLY_USER")
+DEFAULT_QUERY_ROWS = 10000
+DEFAULT_QUERY_CHUNK = 1000
+# type_code do cursor pymssql -> tipo usado pelo RowSerializer
+# (1 texto, 2 binário, 3 número, 4 data/hora, 5 decimal)
+DESCRIPTION_TYPES = {2: "varbinary", 4: "datetime", 5: "decimal"}
+
+"""
+    Controlador para gerenciar rotas do console SQL.
+
+    Esta classe é responsável por registrar e manipular as rotas da aplicação Flask
+    que executam consultas livres e permitem cancelá-las.
+    """
+
+
+class QueryController:
+
+    def __init__(self, app, db=None):
+        """
+        Inicializa o controlador com a aplicação Flask e estabelece conexão com o banco.
+
+        Args:
+            app: Instância da aplicação Flask
+            db: Conexão compartilhada (SQLServerConnection); criada se omitida
+        """
+        self.app = app
+        self.db = db or SQLServerConnection()
+
+    def register_routes(self):
+        """
+        Registra todas as rotas do console SQL na aplicação Flask.
+
+        Esta função define os endpoints da API que permitem:
+        1. Executar uma consulta livre com os resultados em stream
+        2. Cancelar uma consulta em execução
+        """
+
+        @self.app.route("/<data_base>/query", methods=["POST"])
+        def query(data_base):
+            """
+            Endpoint para executar uma consulta livre.
+
+            O lote roda em uma transação desfeita no final, mas um COMMIT no
+            próprio lote grava as alterações; o console só é somente leitura
+            com QUERY_READONLY_USER, que executa o lote como esse usuário.
+            A resposta é NDJSON: a primeira linha traz o query_id (também no cabeçalho
+            X-Query-Id), cada resultado começa com uma linha {"columns": ...}
+            seguida de um registro por linha, e a última linha traz o resumo
+            ({"done": ...}) ou o erro ({"error": ...}).
+            O corpo deve conter:
+                sql: lote a executar
+                params: parâmetros :nome do lote (opcional)
+                timeout: tempo máximo em segundos (padrão QUERY_TIMEOUT);
+                    ao estourar, a sessão é encerrada no servidor
+                max_rows: máximo de registros somando todos os resultados
+                    (padrão 10000, limitado a QUERY_MAX_ROWS)
+                chunk_size: registros lidos do servidor por vez
+
+            Returns:
+                NDJSON com os resultados ou mensagem de erro em caso de falha
+            """
+            body = request.json or {}
+            sql = (body.get("sql") or "").strip()
+            if not sql:
+                return {"error": "❌ Informe o sql a executar."}
+            try:
+                timeout = float(body.get("timeout") or QUERY_TIMEOUT)
+                max_rows = int(body.get("max_rows") or DEFAULT_QUERY_ROWS)
+                chunk_size = int(body.get("chunk_size") or DEFAULT_QUERY_CHUNK)
+            except ValueError:
+                return {"error": "❌ timeout, max_rows e chunk_size devem ser números."}
+            timeout = min(max(timeout, 1), QUERY_MAX_TIMEOUT)
+            max_rows = min(max(max_rows, 1), QUERY_MAX_ROWS)
+            chunk_size = min(max(chunk_size, 1), max_rows)
+
+            query_id = uuid.uuid4().hex
+            generate = self.run(
+                query_id,
+                data_base,
+                sql,
+                body.get("params"),
+                timeout,
+                max_rows,
+                chunk_size,
+            )
+            return Response(
+                stream_with_context(generate),
+                mimetype="application/x-ndjson",
+                headers={"X-Query-Id": query_id},
+            )
+
+        @self.app.route("/<data_base>/query/cancel/<query_id>", methods=["POST"])
+        def query_cancel(data_base, query_id):
+            """
+            Endpoint para cancelar uma consulta em execução.
+
+            A sessão é encontrada pelo CONTEXT_INFO, então o cancelamento
+            funciona mesmo quando a consulta roda em outro worker.
+
+            Args:
+                query_id (str): Id retornado pelo endpoint de consulta
+
+            Returns:
+                JSON com a quantidade de sessões encerradas ou mensagem de erro
+            """
+            if not re.fullmatch(r"[0-9a-f]{32}", query_id):
+                return {"error": "❌ query_id inválido."}
+
+            success, cancelled = self.db.cancel_session(query_id)
+            if not success:
+                print(cancelled)
+                return {"error": cancelled}
+            if cancelled == 0:
+                return {"error": "❌ Consulta não encontrada ou já finalizada."}
+
+            return {"data": {"cancelled": cancelled}}
+
+    def run(self, query_id, data_base, query, params, timeout, max_rows, chunk_size):
+        """
+        Gera as linhas NDJSON da consulta, encerrando a sessão se o tempo
+        limite passar (inclusive enquanto o cliente ainda está lendo).
+        """
+        expired = threading.Event()
+
+        def expire():
+            expired.set()
+            self.db.cancel_session(query_id)
+
+        timer = threading.Timer(timeout, expire)
+        timer.daemon = True
+
+        yield json.dumps({"query_id": query_id}) + "\n"
+        started = time.perf_counter()
+        total = 0
+        results = 0
+        truncated = False
+        serializer = None
+        sets = self.db.use(data_base).stream_sets(
+            query, params, chunk_size, tag=query_id, user=QUERY_READONLY_USER
+        )
+        timer.start()
+        try:
+            for kind, value in sets:
+                if kind == "columns":
+                    names = self.uniqueNames([name for name, _ in value])
+                    types = {
+                        name: DESCRIPTION_TYPES.get(code)
+                        for name, (_, code) in zip(names, value)
+                    }
+                    serializer = RowSerializer(names, types)
+                    results += 1
+                    yield json.dumps(
+                        {"columns": names, "result": results}, ensure_ascii=False
+                    ) + "\n"
+                    continue
+                rows = value[: max_rows - total]
+                total += len(rows)
+                yield "".join(serializer.row(row) + "\n" for row in rows)
+                if total >= max_rows:
+                    truncated = True
+                    break
+        except Exception as e:
+            if expired.is_set():
+                error = f"❌ Tempo limite de {timeout:g}s excedido."
+            else:
+                error = f"Erro: {e}"
+            print(f"❌ Erro no console: {e}")
+            yield json.dumps({"error": error}, ensure_ascii=False) + "\n"
+            return
+        finally:
+            timer.cancel()
+            sets.close()
+
+        done = {
+            "rows": total,
+            "results": results,
+            "truncated": truncated,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        yield json.dumps({"done": done}) + "\n"
+
+    def uniqueNames(self, names):
+        """
+        Nomes das colunas sem repetição (ex.: Id e Id_2 em um JOIN).
+        """
+        seen = {}
+        unique = []
+        for i, name in enumerate(names):
+            name = name or f"column{i + 1}"
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}_{seen[name]}"
+            else:
+                seen[name] = 1
+            unique.append(name)
+        return unique
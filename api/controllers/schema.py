@@ -0,0 +1,210 @@
+from lib.CatalogVersion import CatalogVersion
+from lib.ResponseCache import response_cache
+from lib.SQLServerConnection import SQLServerConnection
+
+"""
+    Controlador para gerenciar rotas relacionadas ao schema do banco de dados.
+
+    Esta classe é responsável por registrar e manipular as rotas da aplicação Flask
+    que fornecem a estrutura completa das tabelas do banco de dados.
+    """
+
+SCHEMA_QUERY = """
+    SELECT t.object_id, s.name AS schema_name, t.name
+    FROM sys.tables t
+    INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+    WHERE t.is_ms_shipped = 0
+    ORDER BY s.name, t.name;
+
+    SELECT c.object_id, c.column_id, c.name, ty.name AS type, c.max_length,
+        c.precision, c.scale, c.is_nullable, c.is_identity, c.is_computed,
+        dc.definition AS default_value
+    FROM sys.columns c
+    INNER JOIN sys.tables t ON t.object_id = c.object_id
+    INNER JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+    LEFT JOIN sys.default_constraints dc ON dc.object_id = c.default_object_id
+    WHERE t.is_ms_shipped = 0
+    ORDER BY c.object_id, c.column_id;
+
+    SELECT i.object_id, i.index_id, i.name, i.type_desc, i.is_primary_key,
+        i.is_unique, i.is_unique_constraint, i.filter_definition,
+        c.name AS column_name, ic.key_ordinal, ic.is_included_column,
+        ic.is_descending_key
+    FROM sys.indexes i
+    INNER JOIN sys.tables t ON t.object_id = i.object_id
+    INNER JOIN sys.index_columns ic
+        ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+    INNER JOIN sys.columns c
+        ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+    WHERE t.is_ms_shipped = 0 AND i.index_id > 0 AND i.is_hypothetical = 0
+    ORDER BY i.object_id, i.index_id, ic.is_included_column, ic.key_ordinal, ic.index_column_id;
+
+    SELECT fk.parent_object_id AS object_id, fk.name, pc.name AS column_name,
+        rs.name AS referenced_schema, rt.name AS referenced_table,
+        rc.name AS referenced_column, fk.delete_referential_action_desc AS on_delete,
+        fk.update_referential_action_desc AS on_update
+    FROM sys.foreign_keys fk
+    INNER JOIN sys.foreign_key_columns fkc ON fkc.constraint_object_id = fk.object_id
+    INNER JOIN sys.columns pc
+        ON pc.object_id = fkc.parent_object_id AND pc.column_id = fkc.parent_column_id
+    INNER JOIN sys.tables rt ON rt.object_id = fkc.referenced_object_id
+    INNER JOIN sys.schemas rs ON rs.schema_id = rt.schema_id
+    INNER JOIN sys.columns rc
+        ON rc.object_id = fkc.referenced_object_id
+        AND rc.column_id = fkc.referenced_column_id
+    ORDER BY fk.parent_object_id, fk.name, fkc.constraint_column_id;
+    """
+
+# Tipos cujo tamanho aparece entre parênteses (max_length em bytes)
+SIZED_TYPES = ("char", "varchar", "binary", "varbinary")
+UNICODE_TYPES = ("nchar", "nvarchar")
+SCALED_TYPES = ("decimal", "numeric")
+
+
+class SchemaController:
+
+    def __init__(self, app, db=None):
+        """
+        Inicializa o controlador com a aplicação Flask e estabelece conexão com o banco.
+
+        Args:
+            app: Instância da aplicação Flask
+            db: Conexão compartilhada (SQLServerConnection); criada se omitida
+        """
+        self.app = app
+        self.db = db or SQLServerConnection()
+        self.versions = CatalogVersion(self.db)
+
+    def register_routes(self):
+        """
+        Registra todas as rotas relacionadas ao schema na aplicação Flask.
+
+        Esta função define os endpoints da API que permitem:
+        1. Buscar a estrutura de todas as tabelas do banco de dados
+        """
+
+        @self.app.route("/<data_base>/schema")
+        @response_cache.cached(self.versions.schema)
+        def schema(data_base):
+            """
+            Endpoint para buscar a estrutura de todas as tabelas do banco de dados.
+
+            Retorna colunas, tipos, nulos, valores padrão, identity, chave primária,
+            unique, chaves estrangeiras e índices de cada tabela, a partir de
+            poucas consultas nas views sys.*. A resposta traz um ETag derivado do
+            modify_date do catálogo; com If-None-Match igual, retorna 304 sem
+            consultar a estrutura.
+
+            Returns:
+                JSON com as tabelas do banco ou mensagem de erro em caso de falha
+            """
+            success, sets = self.db.use(data_base).fetch_sets(SCHEMA_QUERY)
+            if not success:
+                print(sets)
+                return {"error": "❌ Erro ao buscar schema."}
+
+            data = self.buildSchema(*[self.records(item) for item in sets])
+            return {"data": data}
+
+    def records(self, result):
+        columns, rows = result
+        return [dict(zip(columns, row)) for row in rows]
+
+    def buildSchema(self, tables, columns, indexes, foreign_keys):
+        """
+        Agrupa os resultados das views de catálogo por tabela.
+        """
+        data = {}
+        for table in tables:
+            data[table["object_id"]] = {
+                "schema": table["schema_name"],
+                "name": table["name"],
+                "columns": [],
+                "primary_key": [],
+                "unique": [],
+                "indexes": [],
+                "foreign_keys": [],
+            }
+
+        for column in columns:
+            table = data.get(column["object_id"])
+            if table is None:
+                continue
+            table["columns"].append(
+                {
+                    "name": column["name"],
+                    "type": column["type"],
+                    "size": self.columnSize(column),
+                    "is_null": bool(column["is_nullable"]),
+                    "is_identity": bool(column["is_identity"]),
+                    "is_computed": bool(column["is_computed"]),
+                    "default_value": column["default_value"],
+                }
+            )
+
+        index_map = {}
+        for row in indexes:
+            table = data.get(row["object_id"])
+            if table is None:
+                continue
+            key = (row["object_id"], row["index_id"])
+            index = index_map.get(key)
+            if index is None:
+                index = {
+                    "name": row["name"],
+                    "type": row["type_desc"],
+                    "is_primary": bool(row["is_primary_key"]),
+                    "is_unique": bool(row["is_unique"]),
+                    "is_unique_constraint": bool(row["is_unique_constraint"]),
+                    "filter": row["filter_definition"],
+                    "columns": [],
+                    "descending": [],
+                    "include": [],
+                }
+                index_map[key] = index
+                table["indexes"].append(index)
+            if row["is_included_column"]:
+                index["include"].append(row["column_name"])
+            elif row["key_ordinal"]:
+                index["columns"].append(row["column_name"])
+                if row["is_descending_key"]:
+                    index["descending"].append(row["column_name"])
+
+        for (object_id, _), index in index_map.items():
+            if index["is_primary"]:
+                data[object_id]["primary_key"] = index["columns"]
+            elif index["is_unique_constraint"]:
+                data[object_id]["unique"].append(index["columns"])
+
+        fk_map = {}
+        for row in foreign_keys:
+            table = data.get(row["object_id"])
+            if table is None:
+                continue
+            key = (row["object_id"], row["name"])
+            fk = fk_map.get(key)
+            if fk is None:
+                fk = {
+                    "name": row["name"],
+                    "columns": [],
+                    "referenced_schema": row["referenced_schema"],
+                    "referenced_table": row["referenced_table"],
+                    "referenced_columns": [],
+                    "on_delete": row["on_delete"],
+                    "on_update": row["on_update"],
+                }
+                fk_map[key] = fk
+                table["foreign_keys"].append(fk)
+            fk["columns"].append(row["column_name"])
+            fk["referenced_columns"].append(row["referenced_column"])
+
+        return list(data.values())
+
+    def columnSize(self, column):
+        if column["type"] in SIZED_TYPES:
+            return "max" if column["max_length"] == -1 else column["max_length"]
+        if column["type"] in UNICODE_TYPES:
+            return "max" if column["max_length"] == -1 else column["max_length"] // 2
+        if column["type"] in SCALED_TYPES:
+            return f"{column['precision']},{column['scale']}"
+        return ""
@@ -1,3 +1,6 @@
+from lib.CatalogVersion import CatalogVersion
+from lib.MetadataCache import metadata_cache
+from lib.ResponseCache import response_cache
 from lib.SQLServerConnection import SQLServerConnection
 from flask import request  # type: ignore
 
@@ -11,15 +14,17 @@ from flask import request  # type: ignore
 
 class TablesController:
 
-    def __init__(self, app):
+    def __init__(self, app, db=None):
         """
         Inicializa o controlador com a aplicação Flask e estabelece conexão com o banco.
 
         Args:
             app: Instância da aplicação Flask
+            db: Conexão compartilhada (SQLServerConnection); criada se omitida
         """
         self.app = app
-        self.db = SQLServerConnection()
+        self.db = db or SQLServerConnection()
+        self.versions = CatalogVersion(self.db)
 
     def register_routes(self):
         """
@@ -27,12 +32,14 @@ class TablesController:
 
         Esta função define os endpoints da API que permitem:
         1. Listar todas as tabelas
-        2. Criar uma tabela
-        3. Excluir uma tabela
-        4. Busca a estrutura de uma tabela específica
+        2. Listar todas as tabelas com quantidade de registros e tamanho
+        3. Criar uma tabela
+        4. Excluir uma tabela
+        5. Busca a estrutura de uma tabela específica
         """
 
         @self.app.route("/<data_base>/tables")
+        @response_cache.cached(self.versions.schema)
         def tables(data_base):
             """
             Endpoint para listar todas as tabelas do banco de dados.
@@ -41,21 +48,76 @@ class TablesController:
                 JSON com lista de tabelas ou mensagem de erro em caso de falha
             """
 
-            query = f"USE {data_base}; SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE'"
-            success, tables = self.db.get_data(query)
+            success, tables = self.getTables(data_base)
 
             if not success:
                 error = "❌ Erro ao buscar tabelas."
                 print(error)
                 return {"error": error}
 
-            if tables.size == 0:
+            if len(tables) == 0:
                 print("❌ Nenhuma tabela encontrada no banco.")
                 return {"data": []}
 
-            data = tables.to_dict(orient="records")
+            data = tables
             return {"data": data}
 
+        @self.app.route("/<data_base>/tables/stats")
+        def tables_stats(data_base):
+            """
+            Endpoint para listar todas as tabelas com estatísticas de uso.
+
+            Uma única consulta nas views de catálogo retorna, para cada tabela,
+            schema, quantidade de registros, espaço reservado/usado (KB),
+            quantidade de índices e a última alteração feita por usuários
+            (desde o último restart do SQL Server).
+
+            Returns:
+                JSON com lista de tabelas ou mensagem de erro em caso de falha
+            """
+
+            query = """
+                WITH sizes AS (
+                    SELECT object_id,
+                        SUM(CASE WHEN index_id IN (0, 1) THEN row_count ELSE 0 END) AS row_count,
+                        SUM(reserved_page_count) * 8 AS reserved_kb,
+                        SUM(used_page_count) * 8 AS used_kb
+                    FROM sys.dm_db_partition_stats
+                    GROUP BY object_id
+                ), indexes AS (
+                    SELECT object_id, COUNT(*) AS index_count
+                    FROM sys.indexes
+                    WHERE index_id > 0 AND is_hypothetical = 0
+                    GROUP BY object_id
+                ), usage AS (
+                    SELECT object_id, MAX(last_user_update) AS last_user_update
+                    FROM sys.dm_db_index_usage_stats
+                    WHERE database_id = DB_ID()
+                    GROUP BY object_id
+                )
+                SELECT s.name AS schema_name, t.name AS TABLE_NAME,
+                    ISNULL(sz.row_count, 0) AS row_count,
+                    ISNULL(sz.reserved_kb, 0) AS reserved_kb,
+                    ISNULL(sz.used_kb, 0) AS used_kb,
+                    ISNULL(i.index_count, 0) AS index_count,
+                    CONVERT(varchar(23), u.last_user_update, 121) AS last_user_update
+                FROM sys.tables t
+                INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+                LEFT JOIN sizes sz ON sz.object_id = t.object_id
+                LEFT JOIN indexes i ON i.object_id = t.object_id
+                LEFT JOIN usage u ON u.object_id = t.object_id
+                WHERE t.is_ms_shipped = 0
+                ORDER BY s.name, t.name
+                """
+            success, tables = self.db.use(data_base).fetch_rows(query)
+
+            if not success:
+                error = "❌ Erro ao buscar tabelas."
+                print(error)
+                return {"error": error}
+
+            return {"data": tables}
+
         @self.app.route("/<data_base>/tables/create/<table_name>", methods=["POST"])
         def tables_create(data_base, table_name):
             """
@@ -92,9 +154,10 @@ class TablesController:
                 fields.append(f"PRIMARY KEY ({', '.join(primary)})")
 
             aux = ", ".join(fields)
-            query = f"USE {data_base}; CREATE TABLE {table_name} ({aux})"
+            query = f"CREATE TABLE {table_name} ({aux})"
 
-            success, error = self.db.execute_query(query)
+            success, error = self.db.use(data_base).execute_query(query)
+            metadata_cache.invalidate(data_base, table_name)
             if not success:
                 print(error)
                 return {"error": error}
@@ -113,8 +176,9 @@ class TablesController:
                 JSON com data = {} ou mensagem de erro em caso de falha
             """
 
-            query = f"USE {data_base}; DROP TABLE {table_name}"
-            success, error = self.db.execute_query(query)
+            query = f"DROP TABLE {table_name}"
+            success, error = self.db.use(data_base).execute_query(query)
+            metadata_cache.invalidate(data_base, table_name)
             if not success:
                 print(error)
                 return {"error": error}
@@ -122,6 +186,7 @@ class TablesController:
             return {"data": {}}
 
         @self.app.route("/<data_base>/tables/struct/<table_name>")
+        @response_cache.cached(self.versions.table)
         def struct_table(data_base, table_name):
             """
             Endpoint para visualizar a estrutura de uma tabela específica.
@@ -134,7 +199,6 @@ class TablesController:
             """
 
             query = f"""
-                USE {data_base}; 
                 SELECT c.COLUMN_NAME as name, c.DATA_TYPE as type, c.COLUMN_DEFAULT as default_value,
                 CASE WHEN c.CHARACTER_MAXIMUM_LENGTH IS NULL THEN '' ELSE c.CHARACTER_MAXIMUM_LENGTH END as size,
                 CASE WHEN c.NUMERIC_PRECISION IS NULL THEN '' ELSE c.NUMERIC_PRECISION END as precision,
@@ -169,11 +233,21 @@ class TablesController:
                 ORDER BY c.ORDINAL_POSITION
                 """
 
-            success, columns = self.db.get_data(query)
+            success, columns = self.db.use(data_base).fetch_rows(query)
             if not success:
                 error = f"❌ Erro ao buscar dados na tabela {table_name}."
                 print(error)
                 return {"error": error}
 
-            data = columns.to_dict(orient="records")
+            data = columns
             return {"data": data}
+
+    def getTables(self, data_base):
+        """
+        Busca as tabelas (TABLE_NAME) do banco de dados.
+
+        Returns:
+            (True, lista de registros) ou (False, mensagem de erro)
+        """
+        query = "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE'"
+        return self.db.use(data_base).fetch_rows(query)
@@ -0,0 +1,120 @@
+from lib.MetadataCache import MetadataCache
+import os
+
+# Versões lidas ficam guardadas por alguns segundos em cada processo, para
+# que as respostas em cache não paguem uma ida ao banco a cada requisição
+version_cache = MetadataCache(
+    ttl=float(os.getenv("VERSION_CACHE_TTL") or 2), max_entries=1024
+)
+
+
+class CatalogVersion:
+    """
+    Consultas baratas que indicam se um recurso mudou, usadas nos ETags.
+
+    Cada método retorna um texto que muda junto com o recurso, ou None se a
+    consulta falhar (nesse caso a resposta não deve ser cacheada).
+
+    O valor fica em version_cache por VERSION_CACHE_TTL segundos (padrão 2).
+    As escritas feitas pela API limpam esse cache ao terminar (ResponseCache),
+    então só alterações de outros processos ou de fora da API podem demorar
+    esse tempo para aparecer.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def value(self, query, params=None, data_base=None, kind=None, table_name=None):
+        def load():
+            db = self.db.use(data_base) if data_base else self.db
+            success, rows = db.fetch_rows(query, params)
+            if not success:
+                print(rows)
+                return False, None
+            return True, "|".join(str(value) for row in rows for value in row.values())
+
+        return version_cache.get(data_base, table_name, kind, load)[1]
+
+    def databases(self):
+        """Muda quando um banco de dados é criado ou excluído"""
+        return self.value(
+            """
+            SELECT CONVERT(varchar(27), MAX(create_date), 121) AS created,
+                COUNT(*) AS total, MAX(database_id) AS last_id
+            FROM sys.databases
+            """,
+            kind="databases",
+        )
+
+    def schema(self, data_base):
+        """Muda quando qualquer objeto do banco é criado, alterado ou excluído"""
+        return self.value(
+            """
+            SELECT CONVERT(varchar(27), MAX(modify_date), 121) AS modified,
+                COUNT(*) AS total
+            FROM sys.objects WHERE is_ms_shipped = 0
+            """,
+            data_base=data_base,
+            kind="schema",
+        )
+
+    def table(self, data_base, table_name):
+        """Muda quando a estrutura da tabela ou suas constraints mudam"""
+        return self.value(
+            """
+            SELECT CONVERT(varchar(27), MAX(modify_date), 121) AS modified,
+                COUNT(*) AS total
+            FROM sys.objects
+            WHERE object_id = OBJECT_ID(:table_name)
+                OR parent_object_id = OBJECT_ID(:table_name)
+            """,
+            {"table_name": table_name},
+            data_base,
+            "table",
+            table_name,
+        )
+
+    def table_data(self, data_base, table_name):
+        """
+        Muda quando os dados ou a estrutura da tabela mudam.
+
+        Combina o modify_date da tabela com a versão do Change Tracking, quando
+        habilitado na tabela: ela só avança no commit e nunca se repete. Sem
+        Change Tracking usa os contadores de escrita, que só crescem:
+        user_updates de sys.dm_db_index_usage_stats e modification_counter
+        de sys.dm_db_stats_properties (com a data da estatística, que zera o
+        contador ao ser atualizada), além do last_user_update.
+
+        Sem Change Tracking ainda sobra uma janela: os contadores mudam quando
+        o comando executa, não no commit. Uma leitura feita entre os dois vê o
+        valor novo com os dados antigos e os mantém em cache até a próxima
+        escrita na tabela. Os contadores de sys.dm_db_index_usage_stats também
+        zeram quando o banco reinicia ou fica offline.
+        """
+        return self.value(
+            """
+            SELECT CONVERT(varchar(27), o.modify_date, 121) AS modified,
+                CASE WHEN ct.object_id IS NULL THEN NULL
+                    ELSE CHANGE_TRACKING_CURRENT_VERSION() END AS tracking,
+                CASE WHEN ct.object_id IS NULL THEN (
+                    SELECT CONCAT(SUM(u.user_updates), '/',
+                        CONVERT(varchar(27), MAX(u.last_user_update), 121))
+                    FROM sys.dm_db_index_usage_stats u
+                    WHERE u.database_id = DB_ID() AND u.object_id = o.object_id
+                ) END AS updated,
+                CASE WHEN ct.object_id IS NULL THEN (
+                    SELECT CONCAT(SUM(sp.modification_counter), '/',
+                        CONVERT(varchar(27), MAX(sp.last_updated), 121))
+                    FROM sys.stats st
+                    CROSS APPLY sys.dm_db_stats_properties(st.object_id, st.stats_id) sp
+                    WHERE st.object_id = o.object_id
+                ) END AS modifications
+            FROM sys.objects o
+            LEFT JOIN sys.change_tracking_tables ct ON ct.object_id = o.object_id
+            WHERE o.object_id = OBJECT_ID(:table_name)
+            """,
+            {"table_name": table_name},
+            data_base,
+            "table_data",
+            table_name,
+        )
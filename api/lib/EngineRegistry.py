@@ -0,0 +1,95 @@
+from sqlalchemy import create_engine  # type: ignore
+from lib.PoolMetrics import pool_metrics
+from collections import OrderedDict
+from threading import Lock
+import os
+import time
+
+
+class EngineRegistry:
+    """
+    Uma engine (e um pool) por banco de dados, com o banco definido na conexão.
+
+    As engines são criadas na primeira chamada para o banco e ficam em ordem
+    de uso; passando de max_engines, ou ociosas há mais de idle_seconds, as
+    menos usadas são descartadas (só as que não têm conexão em uso).
+    """
+
+    def __init__(self, url, options, max_engines=None, idle_seconds=None):
+        """
+        Args:
+            url: URL do servidor (sem banco), como em engine.url
+            options: opções do pool repassadas a create_engine (pool_options())
+        """
+        self.url = url
+        self.options = options
+        self.max_engines = int(max_engines or os.getenv("DB_MAX_ENGINES", "8"))
+        self.idle_seconds = float(
+            idle_seconds
+            if idle_seconds is not None
+            else os.getenv("DB_ENGINE_IDLE_SECONDS", "600")
+        )
+        self.engines = OrderedDict()
+        self.last_used = {}
+        self.lock = Lock()
+
+    def get(self, data_base):
+        """
+        Retorna a engine do banco, criando se ainda não existir.
+        """
+        with self.lock:
+            engine = self.engines.get(data_base)
+            if engine is None:
+                engine = create_engine(self.url.set(database=data_base), **self.options)
+                pool_metrics.attach(engine)
+                self.engines[data_base] = engine
+            else:
+                self.engines.move_to_end(data_base)
+            self.last_used[data_base] = time.monotonic()
+            self.evict()
+            return engine
+
+    def evict(self):
+        """
+        Descarta as engines além do limite e as ociosas, da menos usada para a
+        mais usada. Chamado com o lock já adquirido.
+        """
+        now = time.monotonic()
+        for data_base in list(self.engines)[:-1]:
+            over = len(self.engines) > self.max_engines
+            idle = now - self.last_used[data_base] > self.idle_seconds
+            if not over and not idle:
+                break
+            engine = self.engines[data_base]
+            if engine.pool.checkedout():
+                continue
+            del self.engines[data_base]
+            del self.last_used[data_base]
+            engine.dispose()
+
+    def discard(self, data_base):
+        """
+        Fecha o pool do banco (ex.: depois de excluir o banco de dados).
+        """
+        with self.lock:
+            engine = self.engines.pop(data_base, None)
+            self.last_used.pop(data_base, None)
+        if engine is not None:
+            engine.dispose()
+
+    def status(self):
+        """
+        Estado do pool de cada banco, do mais usado para o menos usado.
+        """
+        with self.lock:
+            engines = list(self.engines.items())
+        now = time.monotonic()
+        return {
+            data_base: {
+                "checked_out": engine.pool.checkedout(),
+                "idle": engine.pool.checkedin(),
+                "overflow": max(engine.pool.overflow(), 0),
+                "idle_seconds": round(now - self.last_used.get(data_base, now), 1),
+            }
+            for data_base, engine in reversed(engines)
+        }
@@ -1,3 +1,120 @@
+from lib.RequestMetrics import request_metrics
+import json
+import math
+import time
+
+# Tipos do SQL Server agrupados pela forma como são escritos em JSON
+INTEGER_TYPES = ("tinyint", "smallint", "int", "bigint")
+DECIMAL_TYPES = ("decimal", "numeric", "money", "smallmoney")
+FLOAT_TYPES = ("float", "real")
+BINARY_TYPES = ("binary", "varbinary", "image", "timestamp", "rowversion")
+# Maior inteiro que o JavaScript (Number) representa sem perder precisão
+MAX_SAFE_INTEGER = 2**53 - 1
+TEMPORAL_TYPES = (
+    "date",
+    "time",
+    "datetime",
+    "datetime2",
+    "smalldatetime",
+    "datetimeoffset",
+)
+
+
+def encode_default(value):
+    if isinstance(value, int) and abs(value) > MAX_SAFE_INTEGER:
+        return encode_bigint(value)
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def encode_integer(value):
+    return str(int(value))
+
+
+def encode_bigint(value):
+    # bigint vai como texto: acima de 2^53 o Number do JavaScript arredonda
+    return '"' + str(int(value)) + '"'
+
+
+def encode_decimal(value):
+    # Decimal vai como número JSON sem passar por float (sem perder precisão)
+    if not value.is_finite():
+        return "null"
+    return str(value)
+
+
+def encode_float(value):
+    value = float(value)
+    if math.isnan(value) or math.isinf(value):
+        return "null"
+    return repr(value)
+
+
+def encode_bit(value):
+    return "true" if value else "false"
+
+
+def encode_binary(value):
+    return '"0x' + bytes(value).hex().upper() + '"'
+
+
+def encode_str(value):
+    # Datas no mesmo formato de str() ("AAAA-MM-DD HH:MM:SS"), como o front espera
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def converter_for(data_type):
+    """
+    Escolhe, uma única vez por coluna, a função que escreve o valor em JSON.
+    """
+    data_type = (data_type or "").lower()
+    if data_type == "bigint":
+        return encode_bigint
+    if data_type in INTEGER_TYPES:
+        return encode_integer
+    if data_type in DECIMAL_TYPES:
+        return encode_decimal
+    if data_type in FLOAT_TYPES:
+        return encode_float
+    if data_type == "bit":
+        return encode_bit
+    if data_type in BINARY_TYPES:
+        return encode_binary
+    if data_type in TEMPORAL_TYPES or data_type == "uniqueidentifier":
+        return encode_str
+    return encode_default
+
+
+class RowSerializer:
+    """
+    Serializa linhas (tuplas) de um resultado direto para bytes JSON.
+
+    As chaves e os conversores são preparados uma vez no construtor; cada
+    célula passa só pela função da sua coluna, e NULL vira null.
+    """
+
+    def __init__(self, names, types):
+        self.prefixes = [
+            ("{" if i == 0 else ",") + json.dumps(name, ensure_ascii=False) + ":"
+            for i, name in enumerate(names)
+        ]
+        self.converters = [converter_for(types.get(name)) for name in names]
+        self.columns = list(zip(self.prefixes, self.converters))
+
+    def row(self, values):
+        parts = []
+        for (prefix, convert), value in zip(self.columns, values):
+            parts.append(prefix)
+            parts.append("null" if value is None else convert(value))
+        parts.append("}" if parts else "{}")
+        return "".join(parts)
+
+    def rows(self, rows):
+        started = time.perf_counter()
+        data = ("[" + ",".join(self.row(values) for values in rows) + "]").encode()
+        request_metrics.record_serialize(time.perf_counter() - started)
+        return data
+
+
 class JsonCustomEncoder:
 
     def toStr(data):
@@ -5,3 +122,32 @@ class JsonCustomEncoder:
             for key in d:
                 data[i][key] = str(d[key])
         return data
+
+    def serializer(names, columns):
+        """
+        Cria o RowSerializer para as colunas retornadas pela consulta.
+
+        Args:
+            names: nomes das colunas na ordem das tuplas
+            columns: metadados (COLUMN_NAME, DATA_TYPE) da tabela
+        """
+        types = {column["COLUMN_NAME"]: column["DATA_TYPE"] for column in columns}
+        return RowSerializer(names, types)
+
+    def encode(payload, raw):
+        """
+        Monta o documento JSON em bytes juntando partes já serializadas.
+
+        Args:
+            payload: dicionário com os valores comuns (serializados com json)
+            raw: dicionário chave -> bytes JSON prontos (ex.: RowSerializer.rows)
+        """
+        started = time.perf_counter()
+        parts = [
+            json.dumps(key).encode() + b":" + encode_default(value).encode()
+            for key, value in payload.items()
+        ]
+        parts += [json.dumps(key).encode() + b":" + value for key, value in raw.items()]
+        data = b"{" + b",".join(parts) + b"}"
+        request_metrics.record_serialize(time.perf_counter() - started)
+        return data
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from threading import Lock
+import os
+import time
+
+
+class MetadataCache:
+    """
+    Cache em memória dos metadados das tabelas (colunas, chave primária...).
+
+    As entradas são indexadas por (banco, tabela, tipo), expiram após ttl
+    segundos e as menos usadas são descartadas quando o limite é atingido.
+    Os endpoints de DDL devem chamar invalidate() após alterar a estrutura.
+
+    Cada processo tem o seu cache: um DDL feito por outro processo (ou fora da
+    API) só é visto quando a entrada expira ou quando uma consulta da tabela
+    falha, já que os controladores descartam as entradas nesse caso.
+    """
+
+    def __init__(self, ttl=None, max_entries=None):
+        self.ttl = float(
+            ttl if ttl is not None else os.getenv("METADATA_CACHE_TTL") or 300
+        )
+        self.max_entries = int(max_entries or os.getenv("METADATA_CACHE_SIZE") or 512)
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def key(self, data_base, table_name, kind):
+        return (str(data_base).lower(), str(table_name).lower(), kind)
+
+    def get(self, data_base, table_name, kind, loader):
+        """
+        Retorna o valor em cache ou chama loader() para carregá-lo.
+
+        Args:
+            loader: função sem argumentos que retorna (success, valor);
+                só valores com success=True são guardados
+
+        Returns:
+            (success, valor)
+        """
+        key = self.key(data_base, table_name, kind)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > now:
+                self.entries.move_to_end(key)
+                return True, entry[1]
+
+        success, value = loader()
+        if not success:
+            return success, value
+
+        with self.lock:
+            self.entries[key] = (now + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return success, value
+
+    def invalidate(self, data_base, table_name=None):
+        """
+        Remove as entradas de uma tabela ou, sem table_name, de todo o banco.
+        """
+        data_base = str(data_base).lower()
+        table_name = str(table_name).lower() if table_name is not None else None
+        with self.lock:
+            for key in list(self.entries):
+                if key[0] == data_base and table_name in (None, key[1]):
+                    del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+metadata_cache = MetadataCache()
@@ -0,0 +1,94 @@
+from sqlalchemy import event  # type: ignore
+from threading import Lock
+
+
+class PoolMetrics:
+    """
+    Contadores do pool de conexões do SQLAlchemy.
+
+    Os eventos do pool alimentam as contagens de conexões abertas, checkouts e
+    invalidações; o tempo de espera por uma conexão é medido por
+    SQLServerConnection e registrado em record_wait().
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def attach(self, engine):
+        event.listen(engine, "connect", self.on_connect)
+        event.listen(engine, "checkout", self.on_checkout)
+        event.listen(engine, "checkin", self.on_checkin)
+        event.listen(engine, "invalidate", self.on_invalidate)
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self.lock:
+            self.connects += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self.lock:
+            self.checkouts += 1
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        with self.lock:
+            self.checkins += 1
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self.lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds):
+        with self.lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self):
+        with self.lock:
+            self.timeouts += 1
+
+    def snapshot(self, engine):
+        """
+        Retorna o estado atual do pool e os contadores acumulados.
+        """
+        pool = engine.pool
+        data = {"pool": type(pool).__name__, "status": pool.status()}
+        if hasattr(pool, "checkedout"):
+            data.update(
+                {
+                    "size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                    "idle": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                    "max_overflow": pool._max_overflow,
+                    "timeout": pool.timeout(),
+                }
+            )
+        with self.lock:
+            data.update(
+                {
+                    "connects": self.connects,
+                    "checkouts": self.checkouts,
+                    "checkins": self.checkins,
+                    "invalidations": self.invalidations,
+                    "timeouts": self.timeouts,
+                    "wait_count": self.waits,
+                    "wait_avg_ms": (
+                        round(self.wait_total / self.waits * 1000, 3)
+                        if self.waits
+                        else 0.0
+                    ),
+                    "wait_max_ms": round(self.wait_max * 1000, 3),
+                }
+            )
+        return data
+
+
+pool_metrics = PoolMetrics()
@@ -0,0 +1,112 @@
+import xml.etree.ElementTree as ET
+
+SHOWPLAN_NS = "{http://schemas.microsoft.com/sqlserver/2004/07/showplan}"
+
+
+def number(value, convert=int):
+    if value in (None, ""):
+        return None
+    return convert(float(value))
+
+
+def statement_summary(statement):
+    """
+    Resume um StmtSimple do plano real: tempos, leituras por tabela e avisos.
+    """
+    summary = {
+        "text": (statement.get("StatementText") or "").strip(),
+        "estimated_cost": number(statement.get("StatementSubTreeCost"), float),
+        "cpu_time_ms": None,
+        "elapsed_time_ms": None,
+        "actual_rows": None,
+        "logical_reads": {},
+        "warnings": [],
+        "missing_indexes": [],
+    }
+
+    times = statement.find(f".//{SHOWPLAN_NS}QueryTimeStats")
+    if times is not None:
+        summary["cpu_time_ms"] = number(times.get("CpuTime"))
+        summary["elapsed_time_ms"] = number(times.get("ElapsedTime"))
+
+    root = statement.find(f".//{SHOWPLAN_NS}RelOp")
+    if root is not None:
+        summary["actual_rows"] = sum(
+            number(counter.get("ActualRows")) or 0
+            for counter in root.findall(
+                f"{SHOWPLAN_NS}RunTimeInformation/{SHOWPLAN_NS}RunTimeCountersPerThread"
+            )
+        )
+
+    for relop in statement.iter(f"{SHOWPLAN_NS}RelOp"):
+        reads = sum(
+            number(counter.get("ActualLogicalReads")) or 0
+            for counter in relop.findall(
+                f"{SHOWPLAN_NS}RunTimeInformation/{SHOWPLAN_NS}RunTimeCountersPerThread"
+            )
+        )
+        if not reads:
+            continue
+        # O Object fica direto no elemento do operador (IndexScan, IndexSeek...)
+        target = relop.find(f"*/{SHOWPLAN_NS}Object")
+        table = "?"
+        if target is not None:
+            table = f"{target.get('Schema', '')}.{target.get('Table', '')}".strip(".")
+        summary["logical_reads"][table] = summary["logical_reads"].get(table, 0) + reads
+
+    for warnings in statement.iter(f"{SHOWPLAN_NS}Warnings"):
+        for warning in warnings:
+            item = {"type": warning.tag.replace(SHOWPLAN_NS, "")}
+            item.update(warning.attrib)
+            summary["warnings"].append(item)
+
+    for group in statement.iter(f"{SHOWPLAN_NS}MissingIndexGroup"):
+        for index in group.iter(f"{SHOWPLAN_NS}MissingIndex"):
+            columns = {}
+            for column_group in index.findall(f"{SHOWPLAN_NS}ColumnGroup"):
+                columns[column_group.get("Usage", "").lower()] = [
+                    column.get("Name")
+                    for column in column_group.findall(f"{SHOWPLAN_NS}Column")
+                ]
+            summary["missing_indexes"].append(
+                {
+                    "table": f"{index.get('Schema', '')}.{index.get('Table', '')}",
+                    "impact": number(group.get("Impact"), float),
+                    **columns,
+                }
+            )
+
+    return summary
+
+
+class QueryPlan:
+    """
+    Lê os planos reais (XML do SET STATISTICS XML ON) e resume o custo de
+    cada comando: CPU, tempo decorrido, leituras lógicas por tabela, avisos
+    (ex.: conversões implícitas) e índices ausentes sugeridos pelo otimizador.
+    """
+
+    def summarize(plans):
+        statements = []
+        for plan in plans:
+            try:
+                root = ET.fromstring(plan)
+            except ET.ParseError as e:
+                statements.append({"error": f"plano inválido: {e}"})
+                continue
+            statements += [
+                statement_summary(statement)
+                for statement in root.iter(f"{SHOWPLAN_NS}StmtSimple")
+                if statement.find(f"{SHOWPLAN_NS}QueryPlan") is not None
+            ]
+
+        logical_reads = {}
+        for statement in statements:
+            for table, reads in statement.get("logical_reads", {}).items():
+                logical_reads[table] = logical_reads.get(table, 0) + reads
+        return {
+            "cpu_time_ms": sum(s.get("cpu_time_ms") or 0 for s in statements),
+            "elapsed_time_ms": sum(s.get("elapsed_time_ms") or 0 for s in statements),
+            "logical_reads": logical_reads,
+            "statements": statements,
+        }
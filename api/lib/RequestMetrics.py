@@ -0,0 +1,188 @@
+from flask import g, has_request_context, request  # type: ignore
+from flask.json.provider import DefaultJSONProvider  # type: ignore
+from threading import Lock
+import time
+
+# Limites (segundos) dos buckets do histograma de latência por rota
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Rótulo usado para chamadas ao banco fora de uma requisição (ex.: threads)
+BACKGROUND_ROUTE = "background"
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """
+    JSON do Flask que soma o tempo de serialização das respostas.
+    """
+
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            request_metrics.record_serialize(time.perf_counter() - started)
+
+
+class RequestMetrics:
+    """
+    Métricas por requisição e acumuladas por rota.
+
+    Durante a requisição, SQLServerConnection registra cada ida ao banco
+    (tempo e registros) e os serializadores registram o tempo gasto montando
+    o JSON. Ao final, o resumo vai no cabeçalho Server-Timing e entra nos
+    contadores por rota, exportados em formato Prometheus por render().
+
+    Em respostas em stream o cabeçalho sai antes do gerador rodar, então só
+    cobre o trabalho feito até ali; os contadores da rota são somados quando
+    a resposta é fechada e incluem o tempo gasto no banco durante o stream.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.routes = {}
+
+    def init_app(self, app):
+        app.json = TimedJSONProvider(app)
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+
+    def current(self):
+        if not has_request_context():
+            return None
+        return g.get("request_metrics")
+
+    def before_request(self):
+        g.request_metrics = {
+            "started": time.perf_counter(),
+            "round_trips": 0,
+            "sql_time": 0.0,
+            "rows": 0,
+            "serialize_time": 0.0,
+        }
+
+    def record_query(self, seconds, rows):
+        stats = self.current()
+        if stats is None:
+            self.add(BACKGROUND_ROUTE, "", round_trips=1, sql_time=seconds, rows=rows)
+            return
+        stats["round_trips"] += 1
+        stats["sql_time"] += seconds
+        stats["rows"] += rows
+
+    def record_serialize(self, seconds):
+        stats = self.current()
+        if stats is not None:
+            stats["serialize_time"] += seconds
+
+    def after_request(self, response):
+        stats = self.current()
+        if stats is None:
+            return response
+        elapsed = time.perf_counter() - stats["started"]
+        response.headers["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={stats["sql_time"] * 1000:.1f};desc="{stats["round_trips"]} round trips, {stats["rows"]} rows"',
+                f'serialize;dur={stats["serialize_time"] * 1000:.1f}',
+                f"total;dur={elapsed * 1000:.1f}",
+            ]
+        )
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        method = request.method
+        if response.is_streamed:
+            # O gerador só roda depois deste ponto e continua registrando em
+            # stats; os contadores da rota entram quando a resposta é fechada
+            response.call_on_close(lambda: self.flush(route, method, stats, 0))
+        else:
+            size = response.calculate_content_length() or 0
+            self.flush(route, method, stats, size)
+        return response
+
+    def flush(self, route, method, stats, size):
+        """
+        Soma as métricas de uma requisição nos contadores da rota.
+        """
+        self.add(
+            route,
+            method,
+            requests=1,
+            latency=time.perf_counter() - stats["started"],
+            round_trips=stats["round_trips"],
+            sql_time=stats["sql_time"],
+            rows=stats["rows"],
+            serialize_time=stats["serialize_time"],
+            bytes=size,
+        )
+
+    def add(self, route, method, latency=None, **values):
+        with self.lock:
+            entry = self.routes.get((route, method))
+            if entry is None:
+                entry = {
+                    "requests": 0,
+                    "round_trips": 0,
+                    "sql_time": 0.0,
+                    "rows": 0,
+                    "serialize_time": 0.0,
+                    "bytes": 0,
+                    "latency_sum": 0.0,
+                    "buckets": [0] * len(LATENCY_BUCKETS),
+                }
+                self.routes[(route, method)] = entry
+            for key, value in values.items():
+                entry[key] += value
+            if latency is not None:
+                entry["latency_sum"] += latency
+                for i, limit in enumerate(LATENCY_BUCKETS):
+                    if latency <= limit:
+                        entry["buckets"][i] += 1
+
+    def render(self):
+        """
+        Exporta os contadores no formato texto do Prometheus.
+        """
+        counters = (
+            ("db_round_trips_total", "round_trips", "Idas ao banco"),
+            ("db_time_seconds_total", "sql_time", "Tempo gasto no banco"),
+            ("db_rows_total", "rows", "Registros lidos ou alterados no banco"),
+            (
+                "serialization_seconds_total",
+                "serialize_time",
+                "Tempo gasto serializando respostas",
+            ),
+            ("http_response_bytes_total", "bytes", "Bytes enviados (sem stream)"),
+        )
+        with self.lock:
+            routes = {key: dict(entry) for key, entry in self.routes.items()}
+
+        lines = [
+            "# HELP http_request_duration_seconds Latência das requisições por rota",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (route, method), entry in sorted(routes.items()):
+            if route == BACKGROUND_ROUTE:
+                continue
+            labels = f'route="{route}",method="{method}"'
+            for limit, count in zip(LATENCY_BUCKETS, entry["buckets"]):
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{limit}"}} {count}'
+                )
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {entry["requests"]}'
+            )
+            lines.append(
+                f"http_request_duration_seconds_sum{{{labels}}} {entry['latency_sum']}"
+            )
+            lines.append(
+                f"http_request_duration_seconds_count{{{labels}}} {entry['requests']}"
+            )
+
+        for name, key, description in counters:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            for (route, method), entry in sorted(routes.items()):
+                lines.append(
+                    f'{name}{{route="{route}",method="{method}"}} {entry[key]}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,136 @@
+from lib.CatalogVersion import version_cache
+from collections import OrderedDict
+from flask import Response, make_response, request  # type: ignore
+from functools import wraps
+from threading import Lock
+import hashlib
+import os
+
+
+class ResponseCache:
+    """
+    Cache em memória de respostas GET com ETag / If-None-Match.
+
+    A versão do recurso (CatalogVersion) é consultada antes da consulta
+    principal: se o cliente já tem o ETag recebe 304, se a resposta está no
+    cache ela é reenviada, e só nos demais casos a consulta principal roda.
+    A versão fica em cache por alguns segundos (version_cache), que é limpo
+    ao fim de cada requisição de escrita (init_app).
+    As entradas menos usadas são descartadas quando o total passa de max_bytes.
+    Respostas com Cache-Control: no-store (ex.: explain) não são guardadas.
+    """
+
+    def __init__(self, max_bytes=None, max_entry_bytes=None):
+        self.max_bytes = int(
+            max_bytes or os.getenv("RESPONSE_CACHE_BYTES") or 64 * 1024 * 1024
+        )
+        self.max_entry_bytes = int(
+            max_entry_bytes
+            or os.getenv("RESPONSE_CACHE_ENTRY_BYTES")
+            or 4 * 1024 * 1024
+        )
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = Lock()
+
+    def init_app(self, app):
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            # A escrita pode ter mudado qualquer versão guardada; em stream
+            # (ex.: console) ela só termina quando a resposta é fechada
+            version_cache.clear()
+            if response.is_streamed:
+                response.call_on_close(version_cache.clear)
+        return response
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, etag, body, mimetype):
+        if len(body) > self.max_entry_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self.entries[key] = (etag, body, mimetype)
+            self.size += len(body)
+            while self.size > self.max_bytes and self.entries:
+                _, (_, removed, _) = self.entries.popitem(last=False)
+                self.size -= len(removed)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def conditional(self, version, build):
+        """
+        Responde a requisição atual usando ETag e o cache.
+
+        Args:
+            version: texto retornado por CatalogVersion (None desativa o cache)
+            build: função sem argumentos que monta a resposta completa
+
+        Returns:
+            Resposta 304, resposta do cache ou o retorno de build()
+        """
+        if version is None:
+            return build()
+
+        key = request.full_path
+        etag = hashlib.sha1(f"{key}|{version}".encode()).hexdigest()
+        headers = {"Cache-Control": "no-cache"}
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304, headers=headers)
+            response.set_etag(etag)
+            return response
+
+        entry = self.get(key)
+        if entry is not None and entry[0] == etag:
+            response = Response(entry[1], mimetype=entry[2], headers=headers)
+            response.set_etag(etag)
+            return response
+
+        result = build()
+        if isinstance(result, dict) and "error" in result:
+            return result
+        response = make_response(result)
+        if (
+            response.status_code != 200
+            or response.is_streamed
+            or response.cache_control.no_store
+        ):
+            return response
+
+        self.put(key, etag, response.get_data(), response.mimetype)
+        response.set_etag(etag)
+        response.headers.update(headers)
+        return response
+
+    def cached(self, version):
+        """
+        Decorador de rota que aplica conditional().
+
+        Args:
+            version: função que recebe os argumentos da rota e retorna a versão
+        """
+
+        def decorator(route):
+            @wraps(route)
+            def wrapper(**kwargs):
+                return self.conditional(version(**kwargs), lambda: route(**kwargs))
+
+            return wrapper
+
+        return decorator
+
+
+response_cache = ResponseCache()
@@ -1,11 +1,68 @@
 from sqlalchemy import create_engine, text  # type: ignore
-import pandas as pd  # type: ignore
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError  # type: ignore
+from lib.EngineRegistry import EngineRegistry
+from lib.PoolMetrics import pool_metrics
+from lib.RequestMetrics import request_metrics
+from lib.SlowQueryLog import slow_query_log
+from contextlib import contextmanager
 from urllib.parse import quote_plus
 import os
+import re
+import time
+
+
+def pool_options():
+    """
+    Lê as configurações do pool de conexões das variáveis de ambiente (.env).
+    """
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_POOL_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower()
+        in ("1", "true", "yes"),
+    }
+
+
+def prepared(query, types):
+    """
+    Envolve a consulta em sp_executesql com parâmetros tipados.
+
+    O pymssql substitui os parâmetros no texto do comando antes de enviar,
+    então cada valor diferente vira um texto novo e um plano novo no cache do
+    SQL Server. Com sp_executesql o texto interno fica fixo (só mudam os
+    valores de @nome) e o plano é reaproveitado; os tipos declarados evitam
+    conversões implícitas nas colunas e permitem seek nos índices.
+
+    Args:
+        query: consulta com parâmetros :nome
+        types: {nome: tipo SQL} de cada parâmetro usado na consulta
+    """
+    if not types:
+        return query
+    body = re.sub(r"(?<![:\w]):(\w+)", r"@\1", query).replace("'", "''")
+    declarations = ", ".join(
+        f"@{name} {data_type}" for name, data_type in types.items()
+    )
+    values = ", ".join(f"@{name} = :{name}" for name in types)
+    return f"EXEC sp_executesql N'{body}', N'{declarations}', {values}"
 
 
 class SQLServerConnection:
-    def __init__(self):
+    def __init__(self, engine=None, engines=None):
+        """
+        Cria a conexão com o SQL Server.
+
+        Args:
+            engine: engine já existente para compartilhar o mesmo pool; quando
+                omitido uma nova engine é criada a partir do .env
+            engines: registro das engines por banco usado por use()
+        """
+        if engine is not None:
+            self.engine = engine
+            self.engines = engines or EngineRegistry(engine.url, pool_options())
+            return
         server = os.getenv("DB_SERVER")
         port = os.getenv("DB_PORT")
         username = os.getenv("DB_USERNAME")
@@ -28,7 +85,9 @@ class SQLServerConnection:
                 f"mssql+pymssql://{username}:{encoded_password}@{server}:{port}"
             )
 
-            self.engine = create_engine(connection_string)
+            self.engine = create_engine(connection_string, **pool_options())
+            pool_metrics.attach(self.engine)
+            self.engines = EngineRegistry(self.engine.url, pool_options())
 
             # Testar a conexão
             with self.engine.connect() as conn:
@@ -40,41 +99,443 @@ class SQLServerConnection:
             print(f"❌ Erro na conexão: {e}")
             raise
 
-    def get_dataframe(self, query, params=None):
+    def use(self, data_base):
+        """
+        Conexão com o banco data_base definido na própria conexão do pool.
+
+        Substitui o prefixo USE nos comandos: cada banco tem seu pool (criado
+        na primeira chamada), então as sessões já estão no banco certo e o
+        texto do comando é o mesmo para todos os bancos.
+        """
+        return SQLServerConnection(self.engines.get(data_base), self.engines)
+
+    def forget(self, data_base):
+        """Fecha o pool do banco, usado depois de excluí-lo"""
+        self.engines.discard(data_base)
+
+    @contextmanager
+    def connection(self, begin=False):
+        """
+        Pega uma conexão do pool, medindo o tempo de espera.
+
+        Args:
+            begin: abre uma transação que é confirmada ao sair do bloco
+        """
+        started = time.perf_counter()
+        try:
+            conn = self.engine.connect()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_wait(time.perf_counter() - started)
         try:
-            if params:
-                return pd.read_sql(text(query), self.engine, params=params)
+            if begin:
+                with conn.begin():
+                    yield conn
             else:
-                return pd.read_sql(text(query), self.engine)
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def track(self, query, params=None):
+        """
+        Mede uma ida ao banco para as métricas da requisição e o registro de
+        consultas lentas.
+
+        Quem chama preenche call["rows"]; geradores somam em call["paused"] o
+        tempo em que ficaram parados esperando o consumidor.
+        """
+        call = {"rows": 0, "paused": 0.0, "error": None}
+        started = time.perf_counter()
+        try:
+            yield call
+        except Exception as e:
+            call["error"] = str(e)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started - call["paused"]
+            request_metrics.record_query(elapsed, call["rows"])
+            slow_query_log.record(query, params, elapsed, call["rows"], call["error"])
+
+    def pool_status(self):
+        """Retorna o estado do pool de conexões e as métricas acumuladas"""
+        data = pool_metrics.snapshot(self.engine)
+        data["databases"] = self.engines.status()
+        return data
+
+    def fetch_rows(self, query, params=None, as_dict=True):
+        """
+        Executa a consulta e retorna os registros direto do cursor, sem pandas.
+
+        É o caminho usado pelos controladores; get_data/get_dataframe ficam
+        para quem precisa de um DataFrame (análises).
+
+        Args:
+            as_dict: True retorna lista de dicionários; False retorna a tupla
+                (colunas, linhas) com cada linha como tupla
+
+        Returns:
+            (True, registros) ou (False, mensagem de erro)
+        """
+        try:
+            with self.track(query, params) as call, self.connection() as conn:
+                result = conn.execute(text(query), params or {})
+                if not result.returns_rows:
+                    return True, [] if as_dict else ([], [])
+                columns = list(result.keys())
+                rows = result.fetchall()
+                call["rows"] = len(rows)
+                if as_dict:
+                    return True, [dict(zip(columns, row)) for row in rows]
+                return True, (columns, [tuple(row) for row in rows])
+        except Exception as e:
+            return False, f"❌ Erro na consulta: {e}"
+
+    def fetch_sets(self, query, params=None):
+        """
+        Executa um lote com vários SELECTs em uma única ida ao banco.
+
+        O SQLAlchemy só lê o primeiro resultado, então o comando é compilado
+        para o formato do driver e executado direto no cursor DBAPI.
+
+        Returns:
+            (True, [(colunas, linhas), ...]) com um item por SELECT do lote,
+            ou (False, mensagem de erro)
+        """
+        try:
+            with self.track(query, params) as call, self.connection() as conn:
+                cursor = conn.connection.dbapi_connection.cursor()
+                try:
+                    self.execute_raw(conn, cursor, query, params)
+                    sets = self.read_sets(cursor)
+                    call["rows"] = sum(len(rows) for _, rows in sets)
+                    return True, sets
+                finally:
+                    cursor.close()
+        except Exception as e:
+            return False, f"❌ Erro na consulta: {e}"
+
+    def explain(self, query, params=None):
+        """
+        Executa o lote com SET STATISTICS XML ON e separa os planos reais.
+
+        É o mesmo comando da consulta normal, então o plano retornado é o
+        que a consulta usa de fato. A opção é desligada no final mesmo em
+        caso de erro, para não voltar ao pool com a sessão alterada.
+
+        Os registros dos resultados são lidos em blocos e descartados, só a
+        quantidade é mantida, então a memória não cresce com a tabela.
+
+        Returns:
+            (True, (resultados, planos)) com cada resultado como (colunas,
+            quantidade de registros) e os planos como texto XML, ou
+            (False, mensagem de erro)
+        """
+        try:
+            with self.track(query, params) as call, self.connection() as conn:
+                cursor = conn.connection.dbapi_connection.cursor()
+                try:
+                    cursor.execute("SET STATISTICS XML ON")
+                    self.execute_raw(conn, cursor, query, params)
+                    sets = self.count_sets(cursor)
+                    call["rows"] = sum(
+                        count for _, count in sets if isinstance(count, int)
+                    )
+                finally:
+                    try:
+                        cursor.execute("SET STATISTICS XML OFF")
+                        cursor.close()
+                    except Exception:
+                        # Não devolve ao pool uma sessão com a opção ligada
+                        conn.invalidate()
+            results = []
+            plans = []
+            for columns, rows in sets:
+                if isinstance(rows, list):
+                    plans += [row[0] for row in rows]
+                else:
+                    results.append((columns, rows))
+            return True, (results, plans)
+        except Exception as e:
+            return False, f"❌ Erro na consulta: {e}"
+
+    def execute_raw(self, conn, cursor, query, params):
+        """
+        Compila o texto com parâmetros :nome para o formato do driver e executa
+        no cursor DBAPI.
+        """
+        compiled = text(query).compile(dialect=conn.dialect)
+        values = compiled.construct_params(params or {})
+        if compiled.positiontup is not None:
+            values = tuple(values[name] for name in compiled.positiontup)
+        cursor.execute(compiled.string, values)
+
+    def read_sets(self, cursor):
+        sets = []
+        while True:
+            if cursor.description:
+                columns = [column[0] for column in cursor.description]
+                sets.append((columns, [tuple(row) for row in cursor.fetchall()]))
+            if not cursor.nextset():
+                break
+        return sets
+
+    def count_sets(self, cursor, chunk_size=1000):
+        """
+        Como read_sets, mas só conta os registros de cada resultado; os planos
+        do Showplan (uma coluna) são lidos inteiros.
+        """
+        sets = []
+        while True:
+            if cursor.description:
+                columns = [column[0] for column in cursor.description]
+                if len(columns) == 1 and "Showplan" in columns[0]:
+                    sets.append((columns, [tuple(row) for row in cursor.fetchall()]))
+                else:
+                    count = 0
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        count += len(rows)
+                    sets.append((columns, count))
+            if not cursor.nextset():
+                break
+        return sets
+
+    def get_dataframe(self, query, params=None):
+        import pandas as pd  # type: ignore
+
+        try:
+            with self.track(query, params) as call, self.connection() as conn:
+                if params:
+                    data = pd.read_sql(text(query), conn, params=params)
+                else:
+                    data = pd.read_sql(text(query), conn)
+                call["rows"] = len(data)
+                return data
         except Exception as e:
             print(f"❌ Erro: {e}")
             return pd.DataFrame()
 
     def get_data(self, query, params=None):
+        import pandas as pd  # type: ignore
+
         try:
-            if params:
-                return True, pd.read_sql(text(query), self.engine, params=params)
-            else:
-                return True, pd.read_sql(text(query), self.engine)
+            with self.track(query, params) as call, self.connection() as conn:
+                if params:
+                    data = pd.read_sql(text(query), conn, params=params)
+                else:
+                    data = pd.read_sql(text(query), conn)
+                call["rows"] = len(data)
+                return True, data
         except Exception as e:
             return False, f"❌ Erro na consulta: {e}"
 
-    def execute_query(self, query, params=None):
-        """Executa query sem retorno (INSERT, UPDATE, DELETE)"""
+    def stream_data(self, query, params=None, chunk_size=1000, as_dict=True):
+        """
+        Executa a consulta e entrega os registros em blocos de tamanho fixo.
+
+        Usa cursor no servidor (stream_results/yield_per), então a memória não
+        cresce com o tamanho do resultado e o primeiro bloco chega antes do fim
+        da consulta. A conexão fica presa enquanto o gerador não for consumido.
+
+        Args:
+            as_dict: False entrega cada registro como tupla, na ordem do SELECT
+
+        Yields:
+            Lista com no máximo chunk_size registros
+        """
+        with self.track(query, params) as call, self.connection() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=chunk_size
+            ).execute(text(query), params or {})
+            columns = list(result.keys())
+            for partition in result.partitions():
+                call["rows"] += len(partition)
+                paused = time.perf_counter()
+                if as_dict:
+                    yield [dict(zip(columns, row)) for row in partition]
+                else:
+                    yield [tuple(row) for row in partition]
+                call["paused"] += time.perf_counter() - paused
+
+    def stream_sets(self, query, params=None, chunk_size=1000, tag=None, user=None):
+        """
+        Executa um lote e entrega cada resultado em blocos.
+
+        O lote roda em uma transação desfeita no final, mas isso não impede
+        escrita: um COMMIT dentro do lote confirma o que veio antes e os
+        comandos seguintes rodam em autocommit. Para garantir somente leitura,
+        informe user: a sessão passa a rodar como esse usuário do banco (ex.:
+        só com db_datareader) com EXECUTE AS ... WITH NO REVERT e a conexão é
+        descartada no final, sem voltar ao pool.
+
+        Quando tag é informado, ele é gravado no CONTEXT_INFO da sessão para
+        que cancel_session() encontre e encerre a consulta a partir de outra
+        requisição (ou outro processo).
+
+        Args:
+            tag: identificador hexadecimal (até 128 bytes) da consulta
+            user: usuário do banco com que o lote é executado
+
+        Yields:
+            ("columns", [(nome, type_code), ...]) no início de cada resultado
+            e ("rows", [tupla, ...]) com no máximo chunk_size registros
+        """
+        with self.track(query, params) as call, self.connection() as conn:
+            cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                if tag:
+                    cursor.execute(f"SET CONTEXT_INFO 0x{tag}")
+                if user:
+                    cursor.execute(
+                        "EXECUTE AS USER = %s WITH NO REVERT", (user,)
+                    )
+                if params:
+                    self.execute_raw(conn, cursor, query, params)
+                else:
+                    # Sem parâmetros o texto vai como está (":" e "%" literais)
+                    cursor.execute(query)
+                while True:
+                    if cursor.description:
+                        paused = time.perf_counter()
+                        yield "columns", [
+                            (column[0], column[1]) for column in cursor.description
+                        ]
+                        call["paused"] += time.perf_counter() - paused
+                        while True:
+                            rows = cursor.fetchmany(chunk_size)
+                            if not rows:
+                                break
+                            call["rows"] += len(rows)
+                            paused = time.perf_counter()
+                            yield "rows", [tuple(row) for row in rows]
+                            call["paused"] += time.perf_counter() - paused
+                    if not cursor.nextset():
+                        break
+            finally:
+                try:
+                    if user:
+                        # A sessão não volta para o usuário original: descarta
+                        conn.invalidate()
+                    else:
+                        conn.connection.dbapi_connection.rollback()
+                        if tag:
+                            cursor.execute("SET CONTEXT_INFO 0x")
+                        if conn.engine.url.database:
+                            # O lote pode ter trocado de banco com USE
+                            cursor.execute(f"USE [{conn.engine.url.database}]")
+                        cursor.close()
+                except Exception:
+                    # Sessão cancelada ou com resultados pendentes: descarta
+                    conn.invalidate()
+
+    def cancel_session(self, tag):
+        """
+        Encerra (KILL) a sessão que está executando a consulta marcada com tag.
+
+        Returns:
+            (True, quantidade de sessões encerradas) ou (False, mensagem de erro)
+        """
+        success, sessions = self.fetch_rows(f"""
+            SELECT session_id FROM sys.dm_exec_sessions
+            WHERE session_id <> @@SPID
+                AND CAST(context_info AS binary({len(tag) // 2})) = 0x{tag}
+            """)
+        if not success:
+            return success, sessions
+        for session in sessions:
+            success, error = self.execute_query(
+                f"KILL {int(session['session_id'])}", autocommit=True
+            )
+            if not success:
+                return success, error
+        return True, len(sessions)
+
+    def execute_query(self, query, params=None, autocommit=False):
+        """
+        Executa query sem retorno (INSERT, UPDATE, DELETE)
+
+        Args:
+            autocommit: executa fora de transação, para comandos que não
+                aceitam transação (ex.: ALTER DATABASE)
+        """
         try:
-            with self.engine.begin() as conn:
+            if autocommit:
+                with self.track(query, params), self.connection() as conn:
+                    conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+                    conn.execute(text(query), params or {})
+                return True, "✅ Query executada com sucesso!"
+            with self.track(query, params) as call, self.connection(begin=True) as conn:
                 if params:
-                    conn.execute(text(query), params)
+                    result = conn.execute(text(query), params)
                 else:
-                    conn.execute(text(query))
+                    result = conn.execute(text(query))
+                call["rows"] = max(result.rowcount, 0)
             return True, "✅ Query executada com sucesso!"
         except Exception as e:
             return False, f"❌ Erro na execução: {e} Query: {query}"
 
+    def execute_batches(self, batches):
+        """
+        Executa lotes de comandos, cada lote em uma transação própria.
+
+        Um erro desfaz apenas o lote em que ocorreu; os demais seguem.
+
+        Args:
+            batches: iterável (pode ser gerador) de listas de (query, params);
+                params como lista de dicionários vira um executemany
+
+        Returns:
+            Lista com (True, linhas afetadas) ou (False, mensagem) por lote
+        """
+        results = []
+        for batch in batches:
+            try:
+                rowcount = 0
+                with self.connection(begin=True) as conn:
+                    for query, params in batch:
+                        with self.track(query, params) as call:
+                            result = conn.execute(text(query), params or {})
+                            call["rows"] = max(result.rowcount, 0)
+                        rowcount += call["rows"]
+                results.append((True, rowcount))
+            except Exception as e:
+                results.append((False, f"❌ Erro na execução: {e}"))
+        return results
+
+    def execute_transaction(self, statements):
+        """
+        Executa os comandos em ordem, em uma única conexão e transação.
+
+        Ao contrário de execute_batches, um erro desfaz todos os comandos.
+
+        Args:
+            statements: iterável de (query, params); params como lista de
+                dicionários vira um executemany
+
+        Returns:
+            (True, [linhas afetadas por comando]) ou
+            (False, (posição do comando que falhou, mensagem))
+        """
+        rowcounts = []
+        try:
+            with self.connection(begin=True) as conn:
+                for query, params in statements:
+                    with self.track(query, params) as call:
+                        result = conn.execute(text(query), params or {})
+                        call["rows"] = max(result.rowcount, 0)
+                    rowcounts.append(call["rows"])
+            return True, rowcounts
+        except Exception as e:
+            return False, (len(rowcounts), f"❌ Erro na execução: {e}")
+
     def test_connection(self):
         """Testa a conexão com o banco"""
         try:
-            with self.engine.connect() as conn:
+            with self.connection() as conn:
                 result = conn.execute(text("SELECT @@VERSION as version"))
                 version = result.scalar()
                 return True, f"✅ Conexão OK! SQL Server Version: {version}"
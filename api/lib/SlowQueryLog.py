@@ -0,0 +1,151 @@
+from collections import deque
+from flask import has_request_context, request  # type: ignore
+from threading import Lock
+import os
+import random
+import re
+import time
+
+# Literais removidos do texto normalizado (texto, binário e números)
+LITERALS = re.compile(
+    r"N?'(?:[^']|'')*'|\b0x[0-9a-fA-F]+\b|(?<![\w@#.])\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b"
+)
+# Chamada de sp_executesql: o texto do comando (N'...'), as declarações e os
+# valores; o comando interno é o que identifica a consulta
+SP_EXECUTESQL = re.compile(
+    r"\bEXEC(?:UTE)?\s+(?:sys\.)?sp_executesql\s+N'((?:[^']|'')*)'"
+    r"(?:\s*,\s*N'(?:[^']|'')*')?(?:\s*,[^;]*)?",
+    re.IGNORECASE,
+)
+VALUE_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+SPACES = re.compile(r"\s+")
+# Tamanho máximo guardado de cada parâmetro e do texto do comando
+MAX_PARAM_LENGTH = 200
+MAX_STATEMENT_LENGTH = 4000
+
+
+def normalize(query):
+    """
+    Texto do comando sem literais, para agrupar execuções iguais.
+
+    Strings, números e binários viram ?, listas (?, ?, ...) viram (...) e os
+    espaços são colapsados. Em chamadas de sp_executesql o texto do comando
+    interno é mantido (e normalizado), sem as declarações e os valores.
+    """
+    text = SP_EXECUTESQL.sub(
+        lambda match: "EXEC sp_executesql " + match.group(1).replace("''", "'"),
+        query or "",
+    )
+    text = LITERALS.sub("?", text)
+    text = VALUE_LISTS.sub("(...)", text)
+    return SPACES.sub(" ", text).strip()[:MAX_STATEMENT_LENGTH]
+
+
+def summarize_params(params):
+    if not params:
+        return None
+    if isinstance(params, list):
+        return {"executemany": len(params)}
+    return {
+        key: (
+            value
+            if isinstance(value, (int, float, bool)) or value is None
+            else str(value)[:MAX_PARAM_LENGTH]
+        )
+        for key, value in params.items()
+    }
+
+
+class SlowQueryLog:
+    """
+    Registro em memória das consultas lentas, em um buffer circular.
+
+    Toda chamada de SQLServerConnection passa por record(); as que levam pelo
+    menos threshold_ms (ou falham) são guardadas com probabilidade sample_rate.
+    Só as últimas max_entries ficam no buffer.
+    """
+
+    def __init__(self, threshold_ms=None, sample_rate=None, max_entries=None):
+        self.threshold_ms = float(
+            threshold_ms
+            if threshold_ms is not None
+            else os.getenv("SLOW_QUERY_MS", "500")
+        )
+        self.sample_rate = float(
+            sample_rate
+            if sample_rate is not None
+            else os.getenv("SLOW_QUERY_SAMPLE_RATE", "1")
+        )
+        self.entries = deque(
+            maxlen=int(max_entries or os.getenv("SLOW_QUERY_BUFFER", "500"))
+        )
+        self.lock = Lock()
+
+    def record(self, query, params, seconds, rows, error=None):
+        duration_ms = seconds * 1000
+        if error is None and duration_ms < self.threshold_ms:
+            return
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+
+        route = "background"
+        if has_request_context():
+            rule = request.url_rule.rule if request.url_rule else request.path
+            route = f"{request.method} {rule}"
+        entry = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "statement": normalize(query),
+            "params": summarize_params(params),
+            "duration_ms": round(duration_ms, 3),
+            "rows": rows,
+            "route": route,
+            "error": error,
+        }
+        with self.lock:
+            self.entries.append(entry)
+
+    def recent(self, limit=None):
+        with self.lock:
+            entries = list(self.entries)
+        entries.reverse()
+        return entries[:limit] if limit else entries
+
+    def aggregate(self):
+        """
+        Agrupa o buffer por texto normalizado, do maior tempo total ao menor.
+        """
+        groups = {}
+        for entry in self.recent():
+            group = groups.get(entry["statement"])
+            if group is None:
+                group = {
+                    "statement": entry["statement"],
+                    "count": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "routes": [],
+                    "last": entry["time"],
+                }
+                groups[entry["statement"]] = group
+            group["count"] += 1
+            group["errors"] += 1 if entry["error"] else 0
+            group["total_ms"] += entry["duration_ms"]
+            group["max_ms"] = max(group["max_ms"], entry["duration_ms"])
+            group["rows"] += entry["rows"] or 0
+            if entry["route"] not in group["routes"]:
+                group["routes"].append(entry["route"])
+
+        result = sorted(groups.values(), key=lambda g: g["total_ms"], reverse=True)
+        for group in result:
+            group["total_ms"] = round(group["total_ms"], 3)
+            group["avg_ms"] = round(group["total_ms"] / group["count"], 3)
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,108 @@
+from lib.JsonCustomEncoder import BINARY_TYPES, FLOAT_TYPES, INTEGER_TYPES
+import csv
+import datetime
+
+
+def parquet_type(pa, data_type):
+    """
+    Tipo Arrow equivalente ao tipo do SQL Server (texto quando não há equivalente exato).
+    """
+    data_type = (data_type or "").lower()
+    if data_type in INTEGER_TYPES:
+        return pa.int64()
+    if data_type == "bit":
+        return pa.bool_()
+    if data_type in FLOAT_TYPES:
+        return pa.float64()
+    if data_type == "date":
+        return pa.date32()
+    if data_type in ("datetime", "datetime2", "smalldatetime"):
+        return pa.timestamp("us")
+    if data_type == "time":
+        return pa.time64("us")
+    if data_type in BINARY_TYPES:
+        return pa.binary()
+    # decimal/money vão como texto para não perder precisão nem escala
+    return pa.string()
+
+
+class TableExporter:
+    """
+    Grava o resultado de uma consulta em arquivo CSV ou Parquet, bloco a bloco.
+
+    Os registros vêm de SQLServerConnection.stream_data, então a memória usada
+    fica limitada ao tamanho do bloco.
+    """
+
+    def __init__(self, db, chunk_size=10000):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def export(self, data_format, query, columns, path):
+        """
+        Returns:
+            Quantidade de registros gravados
+        """
+        if data_format == "parquet":
+            return self.exportParquet(query, columns, path)
+        return self.exportCsv(query, columns, path)
+
+    def exportCsv(self, query, columns, path):
+        total = 0
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow([column["COLUMN_NAME"] for column in columns])
+            binary = [
+                i
+                for i, column in enumerate(columns)
+                if (column["DATA_TYPE"] or "").lower() in BINARY_TYPES
+            ]
+            for rows in self.db.stream_data(
+                query, None, self.chunk_size, as_dict=False
+            ):
+                if binary:
+                    rows = [self.hexRow(row, binary) for row in rows]
+                writer.writerows(rows)
+                total += len(rows)
+        return total
+
+    def hexRow(self, row, binary):
+        row = list(row)
+        for i in binary:
+            if row[i] is not None:
+                row[i] = "0x" + bytes(row[i]).hex().upper()
+        return row
+
+    def exportParquet(self, query, columns, path):
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        schema = pa.schema(
+            [
+                (column["COLUMN_NAME"], parquet_type(pa, column["DATA_TYPE"]))
+                for column in columns
+            ]
+        )
+        convert = [str if field.type == pa.string() else None for field in schema]
+        total = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for rows in self.db.stream_data(
+                query, None, self.chunk_size, as_dict=False
+            ):
+                arrays = []
+                for i, field in enumerate(schema):
+                    values = [row[i] for row in rows]
+                    if convert[i]:
+                        values = [v if v is None else convert[i](v) for v in values]
+                    elif field.type == pa.time64("us"):
+                        values = [self.toTime(v) for v in values]
+                    arrays.append(pa.array(values, type=field.type))
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                total += len(rows)
+        return total
+
+    def toTime(self, value):
+        # Alguns drivers devolvem time como texto
+        if value is None or isinstance(value, datetime.time):
+            return value
+        return datetime.time.fromisoformat(str(value)[:15])
@@ -0,0 +1,93 @@
+from decimal import Decimal, InvalidOperation
+from lib.JsonCustomEncoder import (
+    BINARY_TYPES,
+    DECIMAL_TYPES,
+    FLOAT_TYPES,
+    INTEGER_TYPES,
+)
+
+
+def parse_integer(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"valor inteiro inválido: {value}")
+        return int(value)
+    return int(value)
+
+
+def parse_decimal(value):
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"valor decimal inválido: {value}")
+
+
+def parse_float(value):
+    return float(value)
+
+
+def parse_bit(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "t", "yes", "y", "sim", "s"):
+        return True
+    if text in ("0", "false", "f", "no", "n", "nao", "não"):
+        return False
+    raise ValueError(f"valor bit inválido: {value}")
+
+
+def parse_binary(value):
+    text = str(value)
+    if text[:2].lower() == "0x":
+        text = text[2:]
+    return bytes.fromhex(text)
+
+
+def parse_text(value):
+    # Texto, datas e demais tipos seguem como texto e o SQL Server converte
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"valor inválido: {value}")
+    return str(value)
+
+
+class ValueParser:
+    """
+    Converte valores recebidos (CSV, JSON, query string) para o tipo da coluna.
+
+    Os conversores são escolhidos uma vez por coluna a partir do DATA_TYPE;
+    texto vazio e None viram NULL. Valores inválidos geram ValueError.
+    """
+
+    def parser(data_type):
+        data_type = (data_type or "").lower()
+        if data_type in INTEGER_TYPES:
+            convert = parse_integer
+        elif data_type in DECIMAL_TYPES:
+            convert = parse_decimal
+        elif data_type in FLOAT_TYPES:
+            convert = parse_float
+        elif data_type == "bit":
+            convert = parse_bit
+        elif data_type in BINARY_TYPES:
+            convert = parse_binary
+        else:
+            convert = parse_text
+
+        def parse(value):
+            if value is None or value == "":
+                return None
+            return convert(value)
+
+        return parse
+
+    def parsers(columns):
+        """
+        Retorna {COLUMN_NAME: conversor} para os metadados da tabela.
+        """
+        return {
+            column["COLUMN_NAME"]: ValueParser.parser(column["DATA_TYPE"])
+            for column in columns
+        }
@@ -1,20 +1,41 @@
 from flask import Flask  # type: ignore
 from flask_cors import CORS  # type: ignore
 from dotenv import load_dotenv  # type: ignore
+from lib.RequestMetrics import request_metrics
+from lib.ResponseCache import response_cache
 from routes import Routes
 
-app = Flask(__name__)  # Cria uma instância do Flask
-CORS(app, resources={r"/*": {"origins": "*", "allow_headers": "*", "expose_headers": "*"}})
+load_dotenv()
 
 
-@app.route("/")  # Define uma rota para o caminho raiz
-def home():
-    return {"message": "API funcionando!"}  # Retorna uma mensagem
+def create_app(db=None):
+    """
+    Cria a aplicação Flask com todas as rotas registradas.
 
+    O flask run encontra esta função sozinho; o modo de produção
+    (asgi.py / serve.py) cria uma aplicação por processo.
 
-Routes(app)
+    Args:
+        db: conexão usada pelos controladores; criada a partir do .env se
+            omitida (os benchmarks passam uma conexão simulada)
+    """
+    app = Flask(__name__)  # Cria uma instância do Flask
+    CORS(
+        app,
+        resources={
+            r"/*": {"origins": "*", "allow_headers": "*", "expose_headers": "*"}
+        },
+    )
+
+    @app.route("/")  # Define uma rota para o caminho raiz
+    def home():
+        return {"message": "API funcionando!"}  # Retorna uma mensagem
+
+    request_metrics.init_app(app)
+    response_cache.init_app(app)
+    Routes(app, db)
+    return app
 
-load_dotenv()
 
 if __name__ == "__main__":
-    app.run(debug=True)  # Executa a API
+    create_app().run(debug=True)  # Executa a API
@@ -2,15 +2,36 @@ from controllers.tables import TablesController
 from controllers.data import DataController
 from controllers.columns import ColumnsController
 from controllers.databases import DataBasesController
+from controllers.metrics import MetricsController
+from controllers.export import ExportController
+from controllers.schema import SchemaController
+from controllers.changes import ChangesController
+from controllers.indexes import IndexesController
+from controllers.query import QueryController
+from lib.SQLServerConnection import SQLServerConnection
 
 class Routes:
 
-    def __init__(self, app):
-        tables = TablesController(app)
+    def __init__(self, app, db=None):
+        # Uma única conexão (engine e pool) compartilhada por todos os controladores
+        db = db or SQLServerConnection()
+        tables = TablesController(app, db)
         tables.register_routes()
-        data = DataController(app)
+        data = DataController(app, db)
         data.register_routes()
-        columns = ColumnsController(app)
+        columns = ColumnsController(app, db)
         columns.register_routes()
-        database = DataBasesController(app)
+        database = DataBasesController(app, db)
         database.register_routes()
+        metrics = MetricsController(app, db)
+        metrics.register_routes()
+        export = ExportController(app, db, tables, data)
+        export.register_routes()
+        schema = SchemaController(app, db)
+        schema.register_routes()
+        changes = ChangesController(app, db, data)
+        changes.register_routes()
+        indexes = IndexesController(app, db, data)
+        indexes.register_routes()
+        query = QueryController(app, db)
+        query.register_routes()
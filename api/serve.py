@@ -0,0 +1,39 @@
+from dotenv import load_dotenv  # type: ignore
+import os
+import uvicorn  # type: ignore
+
+"""
+    Ponto de entrada do modo de produção (ASGI com uvicorn).
+
+    Configuração pelo .env:
+        SERVER_HOST / SERVER_PORT: endereço de escuta (padrão 0.0.0.0:5000)
+        SERVER_WORKERS: quantidade de processos (padrão 1); cada processo tem
+            seu próprio pool de conexões e seu próprio cache de metadados (um
+            DDL feito em outro processo só é visto após METADATA_CACHE_TTL ou
+            após uma consulta falhar, o que descarta as entradas da tabela)
+        SERVER_SEND_QUEUE: blocos de resposta em espera por requisição
+            (padrão 10)
+        SERVER_THREADS: threads por processo (padrão pool_size + max_overflow)
+        SERVER_GRACEFUL_TIMEOUT: segundos para terminar as requisições em
+            andamento ao receber SIGTERM (padrão 30)
+        SERVER_LIMIT_CONCURRENCY: máximo de conexões HTTP por processo antes
+            de responder 503 (padrão sem limite)
+    """
+
+
+def main():
+    load_dotenv()
+    limit_concurrency = os.getenv("SERVER_LIMIT_CONCURRENCY")
+    uvicorn.run(
+        "asgi:app",
+        host=os.getenv("SERVER_HOST", "0.0.0.0"),
+        port=int(os.getenv("SERVER_PORT", "5000")),
+        workers=int(os.getenv("SERVER_WORKERS", "1")),
+        timeout_graceful_shutdown=int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30")),
+        limit_concurrency=int(limit_concurrency) if limit_concurrency else None,
+        lifespan="off",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from benchmarks.StandInConnection import StandInConnection, StandInTable
+from controllers.data import DataController
+from lib.CatalogVersion import version_cache
+from lib.MetadataCache import metadata_cache
+from lib.ResponseCache import response_cache
+from flask import Flask  # type: ignore
+import pytest
+
+DATA_BASE = "bench"
+TABLE_NAME = "bench_table"
+TABLE_ROWS = 50
+
+
+@pytest.fixture
+def table():
+    # Id int, Col1 varchar, Col2 int, Col3 decimal, Col4 datetime, Col5 bit,
+    # Col6 nvarchar, Col7 float
+    return StandInTable(TABLE_NAME, TABLE_ROWS, 8)
+
+
+@pytest.fixture
+def db(table):
+    metadata_cache.clear()
+    response_cache.clear()
+    version_cache.clear()
+    return StandInConnection([table], data_base=DATA_BASE)
+
+
+@pytest.fixture
+def driver(db):
+    return db.driver
+
+
+@pytest.fixture
+def controller(db):
+    app = Flask(__name__)
+    controller = DataController(app, db)
+    controller.register_routes()
+    return controller
+
+
+@pytest.fixture
+def client(controller):
+    return controller.app.test_client()
@@ -0,0 +1,124 @@
+from controllers.data import MAX_STATEMENT_PARAMS, MAX_VALUES_ROWS
+from tests.conftest import DATA_BASE, TABLE_NAME
+import pytest
+
+
+def test_merge_nao_altera_identity(controller):
+    [(query, params)] = controller.mergeStatements(
+        "t",
+        ["Id", "Code", "Name"],
+        [{"Id": 1, "Code": "a", "Name": "x"}],
+        "Code",
+        ["Id"],
+    )
+    assert "ON target.Code = source.Code" in query
+    assert "UPDATE SET target.Name = source.Name" in query
+    assert "target.Id" not in query
+    assert "target.Code =" not in query.split("UPDATE SET")[1]
+    assert "INSERT (Code, Name)" in query
+    assert "VALUES (source.Code, source.Name)" in query
+    assert params == {"p0_0": 1, "p0_1": "a", "p0_2": "x"}
+
+
+def test_merge_so_com_a_chave(controller):
+    [(query, _)] = controller.mergeStatements("t", ["Id"], [{"Id": 1}], "Id", ["Id"])
+    assert "WHEN MATCHED" not in query
+    assert "INSERT DEFAULT VALUES" in query
+
+
+def test_values_respeita_limites_do_sql_server(controller):
+    fields = [f"c{i}" for i in range(7)]
+    rows = [{field: i for field in fields} for i in range(1500)]
+    chunks = list(controller.valuesChunks(fields, rows))
+    assert all(len(params) <= MAX_STATEMENT_PARAMS for _, params in chunks)
+    assert sum(len(params) for _, params in chunks) == len(rows) * len(fields)
+
+    chunks = list(controller.valuesChunks(["c"], [{"c": i} for i in range(1500)]))
+    assert [len(params) for _, params in chunks] == [MAX_VALUES_ROWS, 500]
+
+
+def test_last_by_key_mantem_o_ultimo(controller):
+    records = [{"Id": 1, "a": 1}, {"Id": 2, "a": 2}, {"Id": "1", "a": 3}]
+    assert controller.lastByKey(records, "Id") == [
+        {"Id": 2, "a": 2},
+        {"Id": "1", "a": 3},
+    ]
+
+
+def test_group_by_shape(controller):
+    records = [{"a": 1}, {"a": 2, "b": 1}, {"a": 3}]
+    assert controller.groupByShape(records) == [
+        (["a"], [{"a": 1}, {"a": 3}]),
+        (["a", "b"], [{"a": 2, "b": 1}]),
+    ]
+
+
+def test_upsert_reduz_chaves_repetidas(client, driver):
+    records = [{"Id": 1, "Col1": "a"}, {"Id": 2, "Col1": "b"}, {"Id": 1, "Col1": "c"}]
+    data = client.post(
+        f"/{DATA_BASE}/data/bulk/{TABLE_NAME}",
+        json={"records": records, "upsert": True},
+    ).get_json()["data"]
+    assert data["batches"][0]["rows"] == 3
+    assert data["batches"][0]["success"]
+    [(query, params)] = [
+        (query, params) for query, params in driver.executed if "MERGE" in query
+    ]
+    assert "target.Id =" not in query.split("UPDATE SET")[1]
+    fields = query.split("AS source (")[1].split(")")[0].split(", ")
+    rows = [
+        {field: params[f"p{i}_{j}"] for j, field in enumerate(fields)} for i in range(2)
+    ]
+    assert rows == [{"Id": 2, "Col1": "b"}, {"Id": 1, "Col1": "c"}]
+    assert len(params) == 2 * len(fields)
+
+
+def operation(op, **values):
+    return {"op": op, "table": TABLE_NAME, **values}
+
+
+def test_batch_agrupa_comandos_iguais(client, driver):
+    operations = [
+        operation("insert", values={"Col1": "a", "Col2": 1}),
+        operation("insert", values={"Col2": 2, "Col1": "b"}),
+        operation("insert", values={"Col1": "c"}),
+        operation("update", id=1, values={"Col1": "d"}),
+        operation("update", id=2, values={"Col1": "e"}),
+        operation("delete", id=3),
+    ]
+    data = client.post(
+        f"/{DATA_BASE}/batch", json={"operations": operations}
+    ).get_json()["data"]
+    assert data["statements"] == 4
+    assert [item["statement"] for item in data["results"]] == [0, 0, 1, 2, 2, 3]
+    grouped = [query for query, params in driver.executed if isinstance(params, list)]
+    assert len(grouped) == 2
+    assert grouped[0].startswith("INSERT INTO bench_table (Col1, Col2) VALUES")
+
+
+@pytest.mark.parametrize(
+    "item, message",
+    [
+        (operation("merge"), "op deve ser insert"),
+        ({"op": "insert", "table": ["x"]}, "informe table"),
+        (operation("insert", values=["Col1"]), "values deve ser um objeto"),
+        (operation("insert", values={"Nada": 1}), "colunas inválidas: Nada"),
+        (operation("update", values={"Col1": "a"}), "informe id"),
+        (operation("delete", id={"Id": 1}), "id deve ser um número ou texto"),
+        (operation("delete", id=True), "id deve ser um número ou texto"),
+        (operation("update", id=1, values={"Id": 1}), "nenhuma coluna"),
+    ],
+)
+def test_batch_operacao_invalida(client, item, message):
+    operations = [operation("delete", id=1), item]
+    response = client.post(f"/{DATA_BASE}/batch", json={"operations": operations})
+    assert response.status_code == 200
+    error = response.get_json()["error"]
+    assert error.startswith("❌ Operação 1: ")
+    assert message in error
+
+
+@pytest.mark.parametrize("body", [None, [], {"operations": {}}, {"operations": []}])
+def test_batch_sem_operacoes(client, body):
+    response = client.post(f"/{DATA_BASE}/batch", json=body)
+    assert response.get_json() == {"error": "❌ Informe a lista operations."}
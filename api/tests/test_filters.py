@@ -0,0 +1,116 @@
+from decimal import Decimal
+from tests.conftest import DATA_BASE, TABLE_NAME
+import pytest
+
+
+def build(controller, table, filters):
+    where, params, types = [], {}, {}
+    success, error = controller.buildFilters(
+        filters, table.columns, where, params, types
+    )
+    return success, error, where, params, types
+
+
+def test_eq_converte_para_o_tipo_da_coluna(controller, table):
+    success, _, where, params, types = build(controller, table, {"Col2": "10"})
+    assert success
+    assert where == ["Col2 = :f0"]
+    assert params == {"f0": 10}
+    assert types == {"f0": "int"}
+
+
+def test_operador_de_comparacao(controller, table):
+    success, _, where, params, types = build(controller, table, {"Col3__ge": "1.5"})
+    assert success
+    assert where == ["Col3 >= :f0"]
+    assert params == {"f0": Decimal("1.5")}
+    assert types == {"f0": "decimal(38, 10)"}
+
+
+def test_in_gera_um_parametro_por_item(controller, table):
+    success, _, where, params, types = build(controller, table, {"Id__in": "1, 2,3"})
+    assert success
+    assert where == ["Id IN (:f0_0, :f0_1, :f0_2)"]
+    assert params == {"f0_0": 1, "f0_1": 2, "f0_2": 3}
+    assert set(types.values()) == {"int"}
+
+
+def test_like_escapa_curingas(controller, table):
+    success, _, where, params, _ = build(controller, table, {"Col1__like": "50%_a"})
+    assert success
+    assert where == ["Col1 LIKE :f0 ESCAPE '\\'"]
+    assert params == {"f0": "50\\%\\_a%"}
+
+
+def test_like_so_em_texto(controller, table):
+    success, error, *_ = build(controller, table, {"Col2__like": "1"})
+    assert not success
+    assert "like" in error
+
+
+@pytest.mark.parametrize(
+    "value, condition", [("1", "Col4 IS NULL"), ("0", "Col4 IS NOT NULL")]
+)
+def test_null(controller, table, value, condition):
+    success, _, where, params, _ = build(controller, table, {"Col4__null": value})
+    assert success
+    assert where == [condition]
+    assert params == {}
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [{"Col2": ""}, {"Col3__ge": " "}, {"Col4": ""}, {"Id__in": "1,"}],
+)
+def test_vazio_rejeitado_fora_de_texto(controller, table, filters):
+    success, error, *_ = build(controller, table, filters)
+    assert not success
+    assert "__null=1" in error
+
+
+def test_vazio_aceito_em_texto(controller, table):
+    success, _, where, params, _ = build(controller, table, {"Col1": ""})
+    assert success
+    assert where == ["Col1 = :f0"]
+    assert params == {"f0": ""}
+
+
+@pytest.mark.parametrize(
+    "filters, message",
+    [
+        ({"Nada": "1"}, "Coluna inválida: Nada"),
+        ({"Col2__entre": "1"}, "Operador inválido: entre"),
+        ({"Col2": "abc"}, "Valor inválido para Col2"),
+    ],
+)
+def test_filtros_invalidos(controller, table, filters, message):
+    success, error, *_ = build(controller, table, filters)
+    assert not success
+    assert message in error
+
+
+def test_search_converte_colunas_que_nao_sao_texto(controller, table):
+    where, params, types = [], {}, {}
+    success, _ = controller.buildSearch("a_b", table.columns, where, params, types)
+    assert success
+    assert len(where) == 1
+    assert "Col1 LIKE :search" in where[0]
+    assert "CONVERT(nvarchar(4000), Col2) LIKE :search" in where[0]
+    assert "CONVERT(nvarchar(4000), Col4, 120) LIKE :search" in where[0]
+    assert params == {"search": "%a\\_b%"}
+    assert types == {"search": "nvarchar(4000)"}
+
+
+def test_list_data_envia_filtros_tipados(client, driver):
+    response = client.get(f"/{DATA_BASE}/data/{TABLE_NAME}?Col2__gt=5&search=x")
+    assert "data" in response.get_json()
+    query, _ = driver.executed[-1]
+    assert query.startswith("EXEC sp_executesql")
+    assert "Col2 > @f0" in query
+    assert "@f0 int" in query
+    assert "@search nvarchar(4000)" in query
+
+
+def test_list_data_filtro_invalido(client):
+    response = client.get(f"/{DATA_BASE}/data/{TABLE_NAME}?Col2=abc")
+    assert response.get_json() == {"error": "❌ Valor inválido para Col2: abc."}
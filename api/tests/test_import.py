@@ -0,0 +1,59 @@
+from tests.conftest import DATA_BASE, TABLE_NAME
+import io
+
+
+def send(client, body, **args):
+    return client.post(
+        f"/{DATA_BASE}/data/import/{TABLE_NAME}",
+        data=body.encode(),
+        content_type="text/csv",
+        query_string=args,
+    ).get_json()
+
+
+def test_read_ndjson(controller):
+    stream = io.StringIO('{"Col1": "a"}\n\n{"Col1": \n[1, 2]\n{"Col2": 1}\n')
+    lines = list(controller.readNdjson(stream))
+    assert [line for line, _ in lines] == [1, 3, 4, 5]
+    assert lines[0][1] == {"Col1": "a"}
+    assert isinstance(lines[1][1], ValueError)
+    assert str(lines[2][1]) == "a linha não é um objeto JSON"
+    assert lines[3][1] == {"Col2": 1}
+
+
+def test_csv_rejeita_linhas_invalidas(client, driver):
+    body = "Col1,Col2\na,1\nb,x\nc,3\n"
+    data = send(client, body, batch_size=1)["data"]
+    assert data["written"] == 2
+    assert data["rejected_count"] == 1
+    assert [item["line"] for item in data["rejected"]] == [3]
+    assert data["failed_batches"] == []
+    inserts = [query for query, _ in driver.executed if query.startswith("INSERT")]
+    assert len(inserts) == 2
+
+
+def test_csv_com_delimitador(client):
+    data = send(client, "Col1;Col2\na;1\n", delimiter=";")["data"]
+    assert data["written"] == 1
+    assert data["rejected_count"] == 0
+
+
+def test_csv_cabecalho_invalido(client, driver):
+    data = send(client, "Col1,Nada\na,1\n")
+    assert data == {"error": "❌ Colunas inválidas: Nada."}
+    assert not any(query.startswith("INSERT") for query, _ in driver.executed)
+
+
+def test_ndjson_rejeita_linhas_invalidas(client):
+    body = '{"Col1": "a", "Col2": 1}\n{"Col2": "x"}\n[1]\n{"Nada": 1}\n{oops\n'
+    data = send(client, body, format="ndjson")["data"]
+    assert data["written"] == 1
+    assert data["rejected_count"] == 4
+    assert [item["line"] for item in data["rejected"]] == [2, 3, 4, 5]
+    assert "coluna inválida: Nada" in data["rejected"][2]["error"]
+
+
+def test_formato_invalido(client):
+    assert send(client, "", format="xml") == {
+        "error": "❌ format deve ser csv ou ndjson."
+    }
@@ -0,0 +1,127 @@
+from controllers.data import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from decimal import Decimal
+from tests.conftest import DATA_BASE, TABLE_NAME, TABLE_ROWS
+import datetime
+import pytest
+import uuid
+
+
+def cols(table):
+    return [
+        {"name": column["COLUMN_NAME"], "type": column["DATA_TYPE"]}
+        for column in table.columns
+    ]
+
+
+def page(controller, table, page, primary_key="Id"):
+    where, params = [], {}
+    success, sql = controller.buildPage(page, cols(table), primary_key, where, params)
+    return success, sql, where, params
+
+
+def test_desempate_pela_chave(controller, table):
+    success, sql, _, params = page(controller, table, {"sort": "-Col2,Col1"})
+    assert success
+    assert sql.startswith(" ORDER BY Col2 DESC, Col1 ASC, Id ASC OFFSET")
+    assert params == {"limit": DEFAULT_PAGE_LIMIT, "offset": 0}
+
+
+def test_ordenacao_pela_chave_nao_repete(controller, table):
+    success, sql, *_ = page(controller, table, {"sort": "-Id"})
+    assert success
+    assert sql.startswith(" ORDER BY Id DESC OFFSET")
+
+
+def test_sem_chave_ordena_por_select_null(controller, table):
+    success, sql, *_ = page(controller, table, {"limit": "5"}, primary_key=None)
+    assert success
+    assert "ORDER BY (SELECT NULL)" in sql
+
+
+@pytest.mark.parametrize(
+    "value, message",
+    [
+        ({"sort": "Nada"}, "Coluna de ordenação inválida"),
+        ({"limit": "abc"}, "números inteiros"),
+        ({"limit": "0"}, "maior que zero"),
+        ({"offset": "-1"}, "offset não negativo"),
+        ({"cursor": "", "sort": "Col2"}, "só ordena por Id"),
+        ({"cursor": "!!"}, "Cursor inválido"),
+    ],
+)
+def test_paginas_invalidas(controller, table, value, message):
+    success, error, *_ = page(controller, table, value)
+    assert not success
+    assert message in error
+
+
+def test_limite_maximo(controller, table):
+    success, _, _, params = page(controller, table, {"limit": "100000"})
+    assert success
+    assert params["limit"] == MAX_PAGE_LIMIT
+
+
+@pytest.mark.parametrize("sort, operator", [("Id", ">"), ("-Id", "<")])
+def test_cursor_busca_pela_chave(controller, table, sort, operator):
+    cursor = controller.encodeCursor(10)
+    success, sql, where, params = page(
+        controller, table, {"cursor": cursor, "sort": sort}
+    )
+    assert success
+    assert where == [f"Id {operator} :cursor"]
+    assert params == {"limit": DEFAULT_PAGE_LIMIT, "cursor": 10}
+    assert "OFFSET 0 ROWS" in sql
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        10,
+        "abc",
+        "ção",
+        b"\x00\xff\x10",
+        bytearray(b"\x01\x02"),
+        datetime.datetime(2024, 5, 1, 12, 30, 15, 123000),
+        datetime.date(2024, 5, 1),
+        datetime.time(23, 59, 1),
+    ],
+)
+def test_cursor_ida_e_volta(controller, value):
+    token = controller.encodeCursor(value)
+    decoded = controller.decodeCursor(token)
+    assert decoded == value
+    assert type(decoded) is (bytes if isinstance(value, bytearray) else type(value))
+
+
+@pytest.mark.parametrize(
+    "value", [Decimal("12.50"), uuid.UUID("12345678-1234-5678-1234-567812345678")]
+)
+def test_cursor_texto_para_decimal_e_uuid(controller, value):
+    # O SQL Server converte o texto para o tipo declarado do parâmetro
+    assert controller.decodeCursor(controller.encodeCursor(value)) == str(value)
+
+
+def test_cursor_invalido(controller):
+    with pytest.raises(ValueError):
+        controller.decodeCursor("não é um cursor")
+
+
+def test_list_data_pagina_por_padrao(client):
+    data = client.get(f"/{DATA_BASE}/data/{TABLE_NAME}").get_json()
+    assert data["limit"] == DEFAULT_PAGE_LIMIT
+    assert data["offset"] == 0
+    assert data["total"] == TABLE_ROWS
+    assert len(data["data"]) == DEFAULT_PAGE_LIMIT
+
+
+def test_list_data_all_sem_paginacao(client):
+    data = client.get(f"/{DATA_BASE}/data/{TABLE_NAME}?all=1").get_json()
+    assert "limit" not in data
+    assert len(data["data"]) == TABLE_ROWS
+
+
+def test_list_data_cursor(client):
+    url = f"/{DATA_BASE}/data/{TABLE_NAME}?limit=10&cursor="
+    data = client.get(url).get_json()
+    assert [row["Id"] for row in data["data"]] == list(range(1, 11))
+    assert data["next_cursor"]
@@ -1,5 +1,5 @@
 /* eslint-disable react-hooks/exhaustive-deps */
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useNavigate, useParams } from "react-router-dom";
 import './Data.css'
 import Modal from "../../../components/Modal/Modal";
@@ -23,7 +23,6 @@ function Data() {
     const [limit, setLimit] = useState(10)
     const [search, setSearch] = useState('')
     const [total, setTotal] = useState(0)
-    const [totalSearch, setTotalSearch] = useState(0)
     const [deleteId, setDeleteId] = useState(0)
     const [modalDeleteTable, setModalDeleteTable] = useState(false)
     const [modalClearTable, setModalClearTable] = useState(false)
@@ -32,16 +31,34 @@ function Data() {
 
     const apiUrl = import.meta.env.VITE_API_URL;
     const data_base = localStorage.getItem('data_base')
+    const request = useRef<AbortController | null>(null)
 
     async function fetchData() {
-        const response = await fetch(`${apiUrl}/${data_base}/data/${tableName}`)
-        const json = await response.json()
-        setColumns(json.columns)
-        setData(json.data)
-        setTotal(json.total)
-        setSearch('')
-        setPage(1)
-        renderData()
+        // Cancela a busca anterior para uma resposta atrasada não sobrescrever esta
+        request.current?.abort()
+        const controller = new AbortController()
+        request.current = controller
+
+        const params = new URLSearchParams({
+            limit: String(limit),
+            offset: String((page - 1) * limit),
+        })
+        if (search.trim() !== '') params.set('search', search.trim())
+        try {
+            const response = await fetch(`${apiUrl}/${data_base}/data/${tableName}?${params}`, {
+                signal: controller.signal,
+            })
+            const json = await response.json()
+            if (json.error) {
+                setModalError(json.error)
+                return
+            }
+            setColumns(json.columns)
+            setData(json.data)
+            setTotal(json.total)
+        } catch (e) {
+            if (!controller.signal.aborted) throw e
+        }
     }
 
     function newData() {
@@ -100,6 +117,8 @@ function Data() {
         const json = await response.json();
         if (json.error) {
             setModalError(json.error)
+        } else if (page !== 1) {
+            setPage(1)
         } else {
             fetchData()
         }
@@ -111,50 +130,39 @@ function Data() {
         setLimit(value)
     }
 
+    function changeSearch(value: string) {
+        setPage(1)
+        setSearch(value)
+    }
+
     function renderData() {
-        const search_data = data.filter((d) => {
-            if (search.trim() === '') return true
-            let finded = false
-            Object.keys(d).map((i) => {
-                const value: string = d[i]
-                if (value.toLowerCase().indexOf(search.trim().toLowerCase()) !== -1) {
-                    finded = true
-                }
-            })
-            if (finded) return true
-            else return false
-        })
-        const dt = search_data.filter((_d, i) => {
-            if (i >= ((page - 1) * limit) && i < (((page - 1) * limit) + limit)) return true
-            return false
-        })
-        setShowData(dt)
+        // Paginação e pesquisa são feitas na API; data já é a página pedida
+        setShowData(data)
         const pgs: string[] = []
-        for (let i = 0; i < search_data.length / limit; i++) {
-            if (search_data.length / limit > 12) {
+        for (let i = 0; i < total / limit; i++) {
+            if (total / limit > 12) {
                 if (i < 5) pgs.push((i + 1).toString())
                 if (i == 5) pgs.push('...')
-                if (i > (search_data.length / limit) - 5) pgs.push((i + 1).toString())
+                if (i > (total / limit) - 5) pgs.push((i + 1).toString())
             } else {
                 pgs.push((i + 1).toString())
             }
         }
-        setTotalSearch(search_data.length)
         setPages(pgs)
     }
 
     useEffect(() => {
-        fetchData()
+        setSearch('')
+        setPage(1)
     }, [tableName])
 
     useEffect(() => {
-        renderData()
-    }, [data, page, limit, total])
+        fetchData()
+    }, [tableName, page, limit, search])
 
     useEffect(() => {
-        setPage(1)
         renderData()
-    }, [search])
+    }, [data, total])
 
     return (
         <>
@@ -171,7 +179,7 @@ function Data() {
             <div className="header">
                 <div className="header-options">
                     <h4>Pesquisar:</h4>
-                    <input value={search} onChange={(e) => setSearch(e.target.value)} placeholder="Pesquisar" />
+                    <input value={search} onChange={(e) => changeSearch(e.target.value)} placeholder="Pesquisar" />
                 </div>
                 <div className="header-options">
                     <h4>Mostrar:</h4>
@@ -215,7 +223,7 @@ function Data() {
                                     } else {
                                         return (
                                             <td key={column.name} onClick={() => editData(item)} className="link">
-                                                {item[column.name]}
+                                                {String(item[column.name] ?? '')}
                                             </td>
                                         )
                                     }
@@ -241,10 +249,11 @@ function Data() {
                         </>
                     ))}
                 </div>
-                {search && search.trim() != '' && (
-                    <div>Total Pesquisa: {totalSearch}</div>
+                {search && search.trim() != '' ? (
+                    <div>Total Pesquisa: {total}</div>
+                ) : (
+                    <div>Total: {total}</div>
                 )}
-                <div>Total: {total}</div>
             </div>
             <Modal isOpen={modalDeleteTable} onClose={() => setModalDeleteTable(false)}>
                 <div className="modal-delete">
@@ -101,7 +101,7 @@ function FormData() {
                                     <input
                                         type={InputSqlServerTypes[item.type.toUpperCase()]}
                                         name={item.name}
-                                        value={formData[item.name] || ''}
+                                        value={String(formData[item.name] ?? '')}
                                         required={item.is_null == 'NO'}
                                         disabled={item.is_primary == 'YES' && item.is_identity == '1'}
                                         onChange={handleChange} />
@@ -110,7 +110,7 @@ function FormData() {
                                     <input
                                         type={InputSqlServerTypes[item.type.toUpperCase()]}
                                         name={item.name}
-                                        value={formData[item.name] || ''}
+                                        value={String(formData[item.name] ?? '')}
                                         required={item.is_null == 'NO'}
                                         disabled={item.is_primary == 'YES'}
                                         onChange={handleChange} />